@@ -0,0 +1,104 @@
+"""
+Benchmark: chromedriver resolution cost per browser created.
+
+Compares, for `--drivers` browser creations:
+
+  install   ChromeDriverManager().install() before every browser (the
+            scrapers' original behaviour)
+  registry  data.driver_registry: resolved on the first browser, reused after
+  offline   registry in offline mode, starting from the path recorded on disk
+            by a previous run (no webdriver-manager at all)
+
+By default webdriver-manager is replaced by a stand-in that sleeps
+`--latency` seconds per install() (its version probe and cache lookup), so
+the benchmark runs without Chrome or network access. Pass --real to call the
+actual webdriver-manager, and --launch to also start and quit Chrome for each
+browser so the resolution cost can be compared with the full creation cost.
+
+Usage:
+    python benchmarks/bench_driver_startup.py --drivers 10 --latency 0.8
+    python benchmarks/bench_driver_startup.py --drivers 5 --real --launch
+"""
+
+import os
+import sys
+import time
+import shutil
+import argparse
+import tempfile
+
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from data import driver_registry as registry_module  # noqa: E402
+from data.driver_registry import DriverRegistry  # noqa: E402
+
+
+class FakeDriverManager:
+    """Stand-in for ChromeDriverManager whose install() takes `latency` seconds"""
+
+    latency = 0.0
+    binary = None
+    installs = 0
+
+    def install(self):
+        FakeDriverManager.installs += 1
+        time.sleep(self.latency)
+        return self.binary
+
+
+def launch(driver_path):
+    from selenium import webdriver
+    from selenium.webdriver.chrome.service import Service
+    from data.browser_pool import default_chrome_options
+
+    driver = webdriver.Chrome(service=Service(driver_path), options=default_chrome_options())
+    driver.quit()
+
+
+def run(label, resolve, drivers, with_launch):
+    start = time.perf_counter()
+    resolve_seconds = 0.0
+    for _ in range(drivers):
+        resolve_start = time.perf_counter()
+        driver_path = resolve()
+        resolve_seconds += time.perf_counter() - resolve_start
+        if with_launch:
+            launch(driver_path)
+    total = time.perf_counter() - start
+    print(
+        f"{label:>9}: resolve {resolve_seconds / drivers * 1000:8.1f} ms/browser, "
+        f"total {total / drivers * 1000:8.1f} ms/browser"
+    )
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.split("\n")[1])
+    parser.add_argument("--drivers", type=int, default=10)
+    parser.add_argument("--latency", type=float, default=0.8)
+    parser.add_argument("--real", action="store_true", help="use the real webdriver-manager")
+    parser.add_argument("--launch", action="store_true", help="also start Chrome per browser")
+    args = parser.parse_args()
+
+    workdir = tempfile.mkdtemp(prefix="bench_driver_")
+    try:
+        manager = registry_module.ChromeDriverManager
+        if not args.real:
+            FakeDriverManager.latency = args.latency
+            FakeDriverManager.binary = os.path.join(workdir, "chromedriver")
+            open(FakeDriverManager.binary, "w").close()
+            manager = registry_module.ChromeDriverManager = FakeDriverManager
+
+        registry_path = os.path.join(workdir, "driver_registry.json")
+        run("install", lambda: manager().install(), args.drivers, args.launch)
+
+        registry = DriverRegistry(registry_path, offline=False, explicit_path=None)
+        run("registry", registry.resolve, args.drivers, args.launch)
+
+        offline = DriverRegistry(registry_path, offline=True, explicit_path=None)
+        run("offline", offline.resolve, args.drivers, args.launch)
+    finally:
+        shutil.rmtree(workdir, ignore_errors=True)
+
+
+if __name__ == "__main__":
+    main()
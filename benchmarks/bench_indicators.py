@@ -0,0 +1,132 @@
+"""
+Benchmark: vectorized indicator engine vs per-symbol `ta` objects.
+
+Generates random-walk OHLC histories (rows of different lengths, like indices
+with different listing histories), computes every indicator with data.indicators
+and with the `ta` package, checks that both agree within
+data.indicators.TA_TOLERANCE and prints the timings.
+
+Usage:
+    python benchmarks/bench_indicators.py --symbols 5 --days 125 --repeat 20
+"""
+
+import os
+import sys
+import time
+import argparse
+
+import numpy as np
+import pandas as pd
+import ta
+
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from data import indicators  # noqa: E402
+
+
+def make_histories(symbols, days, seed=7):
+    rng = np.random.default_rng(seed)
+    histories = {}
+    for i in range(symbols):
+        length = days - rng.integers(0, days // 5) if i else days
+        close = 1000 * np.exp(np.cumsum(rng.normal(0, 0.01, length)))
+        spread = np.abs(rng.normal(0, 0.005, length)) * close
+        histories[f"SYM{i}"] = pd.DataFrame(
+            {
+                "Open": close + rng.normal(0, 0.002, length) * close,
+                "High": close + spread,
+                "Low": close - spread,
+                "Close": close,
+            },
+            index=pd.bdate_range(end="2025-01-01", periods=length),
+        )
+    return histories
+
+
+def ta_series(history):
+    """Every indicator for one symbol using `ta`, keyed like compute_indicators"""
+    close, high, low = history["Close"], history["High"], history["Low"]
+    macd = ta.trend.MACD(close=close)
+    bands = ta.volatility.BollingerBands(close=close)
+    atr = ta.volatility.AverageTrueRange(high=high, low=low, close=close).average_true_range()
+    # ta reports 0 until the first full window, the engine reports NaN
+    atr.iloc[: indicators.ATR_WINDOW - 1] = np.nan
+    series = {
+        "close": close,
+        "rsi": ta.momentum.RSIIndicator(close=close).rsi(),
+        "macd_line": macd.macd(),
+        "macd_signal": macd.macd_signal(),
+        "macd_histogram": macd.macd_diff(),
+        "bb_middle": bands.bollinger_mavg(),
+        "bb_upper": bands.bollinger_hband(),
+        "bb_lower": bands.bollinger_lband(),
+        "support": close.rolling(indicators.SUPPORT_WINDOW).min(),
+        "resistance": close.rolling(indicators.SUPPORT_WINDOW).max(),
+        "atr": atr,
+    }
+    for window in indicators.SMA_WINDOWS:
+        series[f"sma_{window}"] = ta.trend.SMAIndicator(close=close, window=window).sma_indicator()
+    for window in indicators.EMA_WINDOWS:
+        series[f"ema_{window}"] = ta.trend.EMAIndicator(close=close, window=window).ema_indicator()
+    return {name: values.to_numpy(dtype=float) for name, values in series.items()}
+
+
+def engine_series(histories):
+    _, close = indicators.build_matrix(histories, "Close")
+    _, high = indicators.build_matrix(histories, "High")
+    _, low = indicators.build_matrix(histories, "Low")
+    return indicators.compute_indicators(close, high, low)
+
+
+def max_difference(histories, engine, reference):
+    """Largest absolute difference per indicator over the bars both define"""
+    worst = {}
+    for row, symbol in enumerate(histories):
+        for name, expected in reference[symbol].items():
+            actual = engine[name][row, -len(expected):]
+            if not np.array_equal(np.isnan(actual), np.isnan(expected)):
+                raise AssertionError(f"{name} for {symbol}: NaN positions differ from ta")
+            mask = ~np.isnan(expected)
+            diff = float(np.max(np.abs(actual[mask] - expected[mask]), initial=0.0))
+            worst[name] = max(worst.get(name, 0.0), diff)
+    return worst
+
+
+def best_time(fn, repeat):
+    timings = []
+    for _ in range(repeat):
+        start = time.perf_counter()
+        fn()
+        timings.append(time.perf_counter() - start)
+    return min(timings)
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.split("\n\n")[0])
+    parser.add_argument("--symbols", type=int, default=5)
+    parser.add_argument("--days", type=int, default=125)
+    parser.add_argument("--repeat", type=int, default=20)
+    args = parser.parse_args()
+
+    histories = make_histories(args.symbols, args.days)
+    reference = {symbol: ta_series(history) for symbol, history in histories.items()}
+    worst = max_difference(histories, engine_series(histories), reference)
+
+    print(f"symbols={args.symbols} days={args.days} tolerance={indicators.TA_TOLERANCE}")
+    print(f"{'indicator':<16}{'max |diff|':>14}")
+    for name, diff in sorted(worst.items()):
+        print(f"{name:<16}{diff:>14.2e}")
+    failed = [name for name, diff in worst.items() if diff > indicators.TA_TOLERANCE]
+    if failed:
+        raise SystemExit(f"Outside tolerance: {failed}")
+
+    ta_time = best_time(
+        lambda: [ta_series(history) for history in histories.values()], args.repeat
+    )
+    engine_time = best_time(lambda: engine_series(histories), args.repeat)
+    print(f"{'ta':<16}{ta_time * 1000:>11.2f} ms")
+    print(f"{'engine':<16}{engine_time * 1000:>11.2f} ms")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,192 @@
+"""
+Benchmark: one Gemini call per section insight vs one batched call.
+
+Builds the real insight prompts of the sections that can be imported here
+(market overview, sector, FII/DII, technical, indicators, news) from
+synthetic section data, then answers them three ways:
+
+  sequential  one call per section, one after another (the original stream)
+  concurrent  one call per section, all at once (the section graph)
+  batched     data.insight_batch: every prompt in one structured JSON call,
+              except the technical one, which keeps its own model and
+              generation config and runs alongside it
+
+By default Gemini is replaced by a stand-in whose call takes `--rtt` seconds
+plus `--per-token` seconds per output token, with tokens estimated as 4
+characters each, so the benchmark runs offline. Pass --real to call Gemini
+(needs GEMINI_API_KEY) and report its own token counts.
+
+Usage:
+    python benchmarks/bench_insight_batch.py --rtt 0.8 --per-token 0.004
+    python benchmarks/bench_insight_batch.py --real
+"""
+
+import os
+import re
+import sys
+import json
+import time
+import argparse
+from concurrent.futures import ThreadPoolExecutor
+
+os.environ.setdefault("GEMINI_API_KEY", "offline")
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+import google.generativeai as genai  # noqa: E402
+
+from data import insight_batch  # noqa: E402
+from data.insight_batch import build_batch_prompt, parse_batch_response  # noqa: E402
+
+ANSWER = "\n".join(
+    f"- Point {i}: the index closed higher as banking and IT stocks led broad buying."
+    for i in range(7)
+)
+
+
+def tokens(text):
+    return max(1, len(text) // 4)
+
+
+class FakeResponse:
+    def __init__(self, text, prompt):
+        self.text = text
+        self.usage_metadata = type(
+            "Usage",
+            (),
+            {"prompt_token_count": tokens(prompt), "candidates_token_count": tokens(text)},
+        )()
+
+
+class FakeModel:
+    """Stand-in for genai.GenerativeModel answering every request with ANSWER"""
+
+    rtt = 0.8
+    per_token = 0.004
+    prompts = []
+
+    def __init__(self, *args, **kwargs):
+        pass
+
+    def generate_content(self, prompt):
+        FakeModel.prompts.append(prompt)
+        keys = re.findall(r"^=== REQUEST: (\S+) ===$", prompt, flags=re.M)
+        text = json.dumps({key: ANSWER for key in keys}) if keys else ANSWER
+        time.sleep(self.rtt + tokens(text) * self.per_token)
+        return FakeResponse(text, prompt)
+
+
+def section_prompts():
+    """The prompt every importable section sends, recorded from a FakeModel"""
+    from data.macro import IndicatorData, generate_indicators_insights
+    from data.market_overview import generate_concise_insights
+    from data.sector_scraper import generate_sector_insights
+    from data.fii_scraper import generate_institutional_insights
+    from data.news_highlights import NewsHighlightsGenerator
+    import data.technical_snapshot as technical
+
+    market_data = {
+        symbol: {"Open": 100.0, "High": 110.0, "Low": 95.0, "Close": 105.0, "Change": 5.0, "Change%": 5.0}
+        for symbol in ["^NSEI", "^BSESN", "^NSEBANK", "^CNXIT", "^CNXPHARMA"]
+    }
+    sectors = [
+        {"sector_name": f"Sector {i}", "change_percentage": 1.5 - i, "advances": 20, "declines": 10}
+        for i in range(11)
+    ]
+    flows = {
+        "fii": {"buy_value": 12000.0, "sell_value": 13500.0, "net_value": -1500.0},
+        "dii": {"buy_value": 11000.0, "sell_value": 9000.0, "net_value": 2000.0},
+    }
+    snapshot = {
+        name: {"close": 22000.0, "support": 21800.0, "resistance": 22300.0, "rsi": 58.2,
+               "macd": {"line": 40.1, "signal": 35.5, "histogram": 4.6},
+               "sma_20": 21950.0, "sma_50": 21700.0, "ema_20": 21980.0,
+               "bollinger": {"upper": 22400.0, "lower": 21500.0}, "atr": 180.0}
+        for name in ["Nifty 50", "Sensex", "Nifty Bank", "Nifty IT", "Nifty Pharma"]
+    }
+    indicators = {
+        f"Indicator {i}": IndicatorData(value=f"{80 + i:.2f}", percent_change="0.4%", remarks="Daily")
+        for i in range(12)
+    }
+    articles = [
+        {"title": f"Markets rally as investors cheer earnings, story {i}", "source": "CNBC"}
+        for i in range(20)
+    ]
+
+    FakeModel.prompts = []
+    technical.gemini_client = FakeModel()
+    generate_concise_insights(market_data)
+    generate_sector_insights(sectors)
+    generate_institutional_insights(flows)
+    technical.generate_insights(snapshot)
+    generate_indicators_insights(indicators)
+    NewsHighlightsGenerator().analyze_news_with_gemini(articles)
+    keys = ["market_overview", "sector", "fii", "technical", "indicators", "news"]
+    return dict(zip(keys, FakeModel.prompts))
+
+
+def call(model, prompt):
+    response = model.generate_content(prompt)
+    usage = getattr(response, "usage_metadata", None)
+    return (
+        response.text,
+        getattr(usage, "prompt_token_count", 0) or tokens(prompt),
+        getattr(usage, "candidates_token_count", 0) or tokens(response.text),
+    )
+
+
+def report(label, calls, seconds, results):
+    prompt_tokens = sum(r[1] for r in results)
+    output_tokens = sum(r[2] for r in results)
+    print(
+        f"{label:>10}: {calls} calls, {seconds:6.2f} s, "
+        f"{prompt_tokens:6d} prompt + {output_tokens:5d} output tokens"
+    )
+    return prompt_tokens + output_tokens
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.split("\n")[1])
+    parser.add_argument("--rtt", type=float, default=0.8, help="fake round trip seconds")
+    parser.add_argument("--per-token", type=float, default=0.004, help="fake seconds per output token")
+    parser.add_argument("--real", action="store_true", help="call Gemini")
+    args = parser.parse_args()
+
+    real_model = genai.GenerativeModel
+    FakeModel.rtt, FakeModel.per_token = 0.0, 0.0
+    genai.GenerativeModel = FakeModel
+    prompts = section_prompts()
+    FakeModel.rtt, FakeModel.per_token = args.rtt, args.per_token
+    if args.real:
+        genai.configure(api_key=os.environ["GEMINI_API_KEY"])
+        genai.GenerativeModel = real_model
+
+    single = lambda: genai.GenerativeModel(insight_batch.INSIGHT_MODEL)  # noqa: E731
+    batch = lambda: genai.GenerativeModel(  # noqa: E731
+        insight_batch.INSIGHT_MODEL,
+        generation_config={"response_mime_type": "application/json"},
+    )
+
+    start = time.perf_counter()
+    results = [call(single(), prompt) for prompt in prompts.values()]
+    report("sequential", len(prompts), time.perf_counter() - start, results)
+
+    start = time.perf_counter()
+    with ThreadPoolExecutor(max_workers=len(prompts)) as executor:
+        results = list(executor.map(lambda p: call(single(), p), prompts.values()))
+    unbatched_tokens = report("concurrent", len(prompts), time.perf_counter() - start, results)
+
+    batched = {key: prompt for key, prompt in prompts.items() if key != "technical"}
+    start = time.perf_counter()
+    with ThreadPoolExecutor(max_workers=2) as executor:
+        technical = executor.submit(call, single(), prompts["technical"])
+        result = call(batch(), build_batch_prompt(batched))
+        results = [result, technical.result()]
+    batched_tokens = report("batched", 2, time.perf_counter() - start, results)
+
+    answers = parse_batch_response(result[0])
+    print(f"answered {len(set(answers) & set(batched))}/{len(batched)} sections from the batch")
+    print(f"token difference batched vs separate: {batched_tokens - unbatched_tokens:+d}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,164 @@
+"""
+Benchmark: batched vs sequential market overview fetch.
+
+Runs data.market_overview.fetch_market_data (batched) and
+fetch_market_data_sequential (original per-symbol loop) against a local
+stand-in for the Yahoo Finance endpoint that answers every request after a
+fixed latency, so the comparison does not depend on the network.
+
+"batched" starts every run with an empty resolved-symbol map and history
+store. "resolved" reuses the map learned by a previous run so failing
+primaries go straight to their working alternative. "stored" also reuses the
+history store, so only the missing tail of each history is downloaded.
+
+Usage:
+    python benchmarks/bench_market_overview.py --latency 0.3 --fail ^CRSLDX CRSLDX.NS
+"""
+
+import os
+import sys
+import time
+import shutil
+import argparse
+import tempfile
+import threading
+from concurrent.futures import ThreadPoolExecutor
+
+import numpy as np
+import pandas as pd
+
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from data import history_store, market_overview  # noqa: E402
+from data.history_store import HistoryStore  # noqa: E402
+from data.symbol_resolver import SymbolResolver  # noqa: E402
+
+PERIOD_ROWS = {"2d": 2, "5d": 5, "1wk": 5}
+COLUMNS = ["Open", "High", "Low", "Close", "Volume"]
+
+
+class FakeYahoo:
+    """Local stand-in for yfinance that sleeps `latency` seconds per HTTP request"""
+
+    def __init__(self, latency, failing_symbols):
+        self.latency = latency
+        self.failing_symbols = set(failing_symbols)
+        self.requests = 0
+        self._lock = threading.Lock()
+
+    def _history(self, symbol, period, start=None):
+        with self._lock:
+            self.requests += 1
+        time.sleep(self.latency)
+        if symbol in self.failing_symbols:
+            return pd.DataFrame(columns=COLUMNS)
+
+        if start is not None:
+            index = pd.bdate_range(start=start, end=pd.Timestamp.today().normalize())
+        else:
+            index = pd.bdate_range(
+                end=pd.Timestamp.today().normalize(), periods=PERIOD_ROWS.get(period, 5)
+            )
+        rows = len(index)
+        rng = np.random.default_rng(sum(map(ord, symbol)))
+        close = 1000 + np.cumsum(rng.normal(0, 5, rows))
+        return pd.DataFrame(
+            {
+                "Open": close - 2,
+                "High": close + 5,
+                "Low": close - 5,
+                "Close": close,
+                "Volume": np.full(rows, 1_000_000),
+            },
+            index=index,
+        )
+
+    def Ticker(self, symbol):
+        fake = self
+
+        class _Ticker:
+            def history(self, period="1mo", **kwargs):
+                return fake._history(symbol, period)
+
+        return _Ticker()
+
+    def download(self, tickers, period="1mo", start=None, threads=True, **kwargs):
+        # yfinance issues one request per ticker, concurrently when threads=True
+        workers = len(tickers) if threads else 1
+        with ThreadPoolExecutor(max_workers=workers) as executor:
+            frames = list(
+                executor.map(lambda s: self._history(s, period, start), tickers)
+            )
+        return pd.concat(dict(zip(tickers, frames)), axis=1)
+
+
+def run(fetch, fake):
+    fake.requests = 0
+    start = time.perf_counter()
+    result = fetch()
+    elapsed = time.perf_counter() - start
+    resolved = sum(1 for k, v in result.items() if k != "_meta" and "Close" in v)
+    return elapsed, fake.requests, resolved
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.split("\n\n")[0])
+    parser.add_argument("--latency", type=float, default=0.3, help="seconds per request")
+    parser.add_argument(
+        "--fail",
+        nargs="*",
+        default=["^CRSLDX", "CRSLDX.NS"],
+        help="symbols the stand-in returns no rows for",
+    )
+    parser.add_argument("--repeat", type=int, default=3)
+    args = parser.parse_args()
+
+    fake = FakeYahoo(args.latency, args.fail)
+    market_overview.yf = fake
+    history_store.yf = fake
+
+    print(f"latency={args.latency}s failing={args.fail}")
+    print(f"{'strategy':<12}{'wall (s)':>10}{'requests':>10}{'resolved':>10}")
+    with tempfile.TemporaryDirectory() as tmp_dir:
+
+        def fresh_path(name):
+            path = os.path.join(tmp_dir, name)
+            if os.path.isdir(path):
+                shutil.rmtree(path)
+            elif os.path.exists(path):
+                os.remove(path)
+            return path
+
+        def cold_fetch():
+            # Fresh resolver and store so every run pays the full fallback cascade
+            market_overview.symbol_resolver = SymbolResolver(fresh_path("cold.json"))
+            market_overview.history_store = HistoryStore(fresh_path("cold_history"), 0)
+            return market_overview.fetch_market_data()
+
+        warm_resolver = SymbolResolver(os.path.join(tmp_dir, "warm.json"))
+        warm_store = HistoryStore(os.path.join(tmp_dir, "warm_history"), 0)
+
+        def resolved_fetch():
+            market_overview.symbol_resolver = warm_resolver
+            market_overview.history_store = HistoryStore(fresh_path("cold_history"), 0)
+            return market_overview.fetch_market_data()
+
+        def stored_fetch():
+            market_overview.symbol_resolver = warm_resolver
+            market_overview.history_store = warm_store
+            return market_overview.fetch_market_data()
+
+        stored_fetch()  # Learn the map and fill the store once before timing
+
+        for name, fetch in [
+            ("sequential", market_overview.fetch_market_data_sequential),
+            ("batched", cold_fetch),
+            ("resolved", resolved_fetch),
+            ("stored", stored_fetch),
+        ]:
+            timings = [run(fetch, fake) for _ in range(args.repeat)]
+            best = min(timings, key=lambda t: t[0])
+            print(f"{name:<12}{best[0]:>10.2f}{best[1]:>10}{best[2]:>10}")
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,103 @@
+"""
+Benchmark: full-page BeautifulSoup parse vs table-only extraction.
+
+Builds a synthetic screener page shaped like the Trendlyne ones (large head
+with inline scripts and styles, navigation, sidebar widgets, one data table)
+and reads the table rows two ways:
+
+  full    BeautifulSoup(page_source, "html.parser") of the whole page, then
+          select the table (what the scrapers did)
+  table   data.table_extraction: lxml parse restricted to <table> elements
+          with SoupStrainer
+
+It checks both give the same rows and prints the parse times, plus the bytes
+that cross the WebDriver connection for page_source vs the rows returned by
+the extraction script.
+
+Usage:
+    python benchmarks/bench_table_extraction.py --rows 50 --filler 1500 --repeat 20
+"""
+
+import os
+import sys
+import json
+import time
+import random
+import argparse
+
+from bs4 import BeautifulSoup
+
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from data.table_extraction import table_soup, tables_from_soup  # noqa: E402
+
+SELECTOR = "table.table"
+
+
+def make_page(rows, filler, seed=7):
+    rng = random.Random(seed)
+    parts = ["<html><head>"]
+    for i in range(filler // 20):
+        parts.append(f"<script>window.cfg{i} = {json.dumps({'k': 'x' * 400})};</script>")
+        parts.append(f"<style>.w{i} {{ margin: {i}px; padding: {i}px; }}</style>")
+    parts.append("</head><body><nav>")
+    for i in range(filler):
+        parts.append(f'<div class="menu-item"><a href="/p/{i}" title="Item {i}">Item {i}</a></div>')
+    parts.append("</nav><main><div class=\"table-responsive\"><table class=\"table\">")
+    parts.append("<thead><tr><th>Stock</th><th>LTP</th><th>Change %</th><th>Volume</th></tr></thead><tbody>")
+    for i in range(rows):
+        price = rng.uniform(50, 5000)
+        change = rng.uniform(-50, 50)
+        parts.append(
+            f'<tr><td><a href="/s/{i}" data-title="Company {i} Limited">Company {i}</a></td>'
+            f"<td>{price:,.2f}</td><td>{change:.2f} ({change / price * 100:.2f}%)</td>"
+            f"<td>{rng.randint(1000, 10**7):,}</td></tr>"
+        )
+    parts.append("</tbody></table></div></main><aside>")
+    for i in range(filler):
+        parts.append(f'<div class="widget"><span class="label">Widget {i}</span><p>{"lorem " * 10}</p></div>')
+    parts.append("</aside><footer>" + "<p>footer</p>" * 50 + "</footer></body></html>")
+    return "".join(parts)
+
+
+def full_parse(html):
+    soup = BeautifulSoup(html, "html.parser")
+    table = soup.select_one(SELECTOR)
+    return [[td.text.strip() for td in tr.select("td")] for tr in table.select("tbody tr")]
+
+
+def table_parse(html):
+    return tables_from_soup(table_soup(html), [SELECTOR])[SELECTOR].rows
+
+
+def timed(fn, html, repeat):
+    start = time.perf_counter()
+    for _ in range(repeat):
+        result = fn(html)
+    return (time.perf_counter() - start) / repeat, result
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.split("\n")[1])
+    parser.add_argument("--rows", type=int, default=50)
+    parser.add_argument("--filler", type=int, default=1500, help="navigation/widget elements")
+    parser.add_argument("--repeat", type=int, default=20)
+    args = parser.parse_args()
+
+    html = make_page(args.rows, args.filler)
+    full_seconds, full_rows = timed(full_parse, html, args.repeat)
+    table_seconds, table_rows = timed(table_parse, html, args.repeat)
+    assert full_rows == table_rows, "table extraction returned different rows"
+
+    rows_bytes = len(json.dumps(table_rows))
+    print(f"page: {len(html) / 1024:.0f} KB, {args.rows} table rows")
+    print(f"{'full':>8}: {full_seconds * 1000:8.2f} ms/page")
+    print(f"{'table':>8}: {table_seconds * 1000:8.2f} ms/page  ({full_seconds / table_seconds:.1f}x)")
+    print(
+        f"transfer: page_source {len(html) / 1024:.0f} KB vs extracted rows "
+        f"{rows_bytes / 1024:.1f} KB"
+    )
+
+
+if __name__ == "__main__":
+    main()
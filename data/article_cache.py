@@ -0,0 +1,143 @@
+import os
+import json
+import time
+import logging
+import threading
+from collections import OrderedDict
+from typing import Dict, Optional
+from urllib.parse import parse_qsl, urlencode, urlparse, urlunparse
+
+from data.cache_dir import cache_path
+
+logger = logging.getLogger(__name__)
+
+# Most articles kept; the least recently used are dropped beyond this
+ARTICLE_CACHE_MAX_ENTRIES = int(os.getenv("ARTICLE_CACHE_MAX_ENTRIES", 500))
+
+# Articles are re-read after this many seconds (headlines persist for hours,
+# but stories do get updated)
+ARTICLE_CACHE_TTL = float(os.getenv("ARTICLE_CACHE_TTL", 24 * 3600))
+
+# Query parameters that only track where a click came from
+TRACKING_PARAMS = {"fbclid", "gclid", "ref", "src", "__source"}
+TRACKING_PREFIXES = ("utm_",)
+
+
+def canonical_url(url: str) -> str:
+    """
+    Cache key of an article: lower-case scheme and host, no fragment, no
+    tracking parameters and no trailing slash, so the same story linked from
+    different listings maps to one entry.
+    """
+    parts = urlparse(url.strip())
+    query = [
+        (key, value)
+        for key, value in parse_qsl(parts.query, keep_blank_values=True)
+        if key.lower() not in TRACKING_PARAMS
+        and not key.lower().startswith(TRACKING_PREFIXES)
+    ]
+    return urlunparse(
+        (
+            parts.scheme.lower() or "https",
+            parts.netloc.lower(),
+            parts.path.rstrip("/") or "/",
+            "",
+            urlencode(sorted(query)),
+            "",
+        )
+    )
+
+
+class ArticleCache:
+    """
+    Extracted text and summary of news articles keyed by canonical URL,
+    persisted across restarts. Entries expire after `ttl` seconds and the
+    least recently used are evicted beyond `max_entries`.
+    """
+
+    def __init__(
+        self,
+        path: Optional[str] = None,
+        max_entries: int = ARTICLE_CACHE_MAX_ENTRIES,
+        ttl: float = ARTICLE_CACHE_TTL,
+    ):
+        self.path = path or cache_path("article_cache.json")
+        self.max_entries = max_entries
+        self.ttl = ttl
+        self._lock = threading.Lock()
+        self._entries: "OrderedDict[str, Dict]" = self._load()
+        self._dirty = False
+        self._stats = {"hits": 0, "misses": 0, "expired": 0, "evicted": 0, "stored": 0}
+
+    def _load(self) -> "OrderedDict[str, Dict]":
+        if not os.path.exists(self.path):
+            return OrderedDict()
+        try:
+            with open(self.path, "r") as f:
+                entries = json.load(f)
+        except Exception as e:
+            logger.warning(f"Could not read article cache {self.path}: {str(e)}")
+            return OrderedDict()
+        now = time.time()
+        # Saved least recently used first
+        return OrderedDict(
+            (url, entry)
+            for url, entry in entries.items()
+            if now - entry.get("stored_at", 0) < self.ttl
+        )
+
+    def save(self) -> None:
+        """Write the entries to disk if anything changed since the last save"""
+        with self._lock:
+            if not self._dirty:
+                return
+            entries = dict(self._entries)
+            self._dirty = False
+        try:
+            tmp_path = f"{self.path}.tmp"
+            with open(tmp_path, "w") as f:
+                json.dump(entries, f)
+            os.replace(tmp_path, self.path)
+        except Exception as e:
+            logger.warning(f"Could not save article cache {self.path}: {str(e)}")
+
+    def get(self, url: str) -> Optional[Dict]:
+        """{"text", "summary", "stored_at"} of a cached article, or None"""
+        key = canonical_url(url)
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is not None and time.time() - entry["stored_at"] >= self.ttl:
+                del self._entries[key]
+                self._dirty = True
+                self._stats["expired"] += 1
+                entry = None
+            if entry is None:
+                self._stats["misses"] += 1
+                return None
+            self._entries.move_to_end(key)
+            self._stats["hits"] += 1
+            return entry
+
+    def put(self, url: str, text: str, summary: Optional[str]) -> None:
+        key = canonical_url(url)
+        with self._lock:
+            self._entries[key] = {"text": text, "summary": summary, "stored_at": time.time()}
+            self._entries.move_to_end(key)
+            self._stats["stored"] += 1
+            while len(self._entries) > self.max_entries:
+                self._entries.popitem(last=False)
+                self._stats["evicted"] += 1
+            self._dirty = True
+
+    def stats(self) -> Dict:
+        with self._lock:
+            lookups = self._stats["hits"] + self._stats["misses"]
+            return {
+                **self._stats,
+                "entries": len(self._entries),
+                "hit_rate": round(self._stats["hits"] / lookups, 3) if lookups else None,
+            }
+
+
+# Shared cache used by the news scrapers
+article_cache = ArticleCache()
@@ -0,0 +1,181 @@
+import os
+import re
+import time
+import asyncio
+import logging
+import threading
+from typing import Dict, List, Optional
+from urllib.parse import urlparse
+
+import aiohttp
+from bs4 import BeautifulSoup
+
+from data.browser_pool import USER_AGENT
+
+logger = logging.getLogger(__name__)
+
+# Article pages downloaded at once from the same site
+ARTICLE_FETCH_PER_HOST = int(os.getenv("ARTICLE_FETCH_PER_HOST", 4))
+ARTICLE_FETCH_TIMEOUT = float(os.getenv("ARTICLE_FETCH_TIMEOUT", 20))
+
+# Less text than this means the selector hit a teaser or an empty shell
+MIN_CONTENT_CHARS = 200
+MIN_PARAGRAPH_CHARS = 30
+
+# Tried after a site's own article_content selectors
+COMMON_CONTENT_SELECTORS = [
+    "article",
+    "main",
+    "div.article-body",
+    "div.content",
+    "div.article-content",
+    "div.story-body",
+    ".post-content",
+    "div[itemprop='articleBody']",
+]
+
+ARTICLE_HEADERS = {
+    "User-Agent": USER_AGENT,
+    "Accept": "text/html,application/xhtml+xml,application/xml;q=0.9,*/*;q=0.8",
+    "Accept-Language": "en-US,en;q=0.5",
+}
+
+
+def _element_text(element) -> str:
+    return re.sub(r"\s+", " ", element.get_text(" ", strip=True)).strip()
+
+
+def article_text(html: str, site_config: Dict[str, str]) -> Optional[str]:
+    """
+    Article body from a page's static HTML, trying the same selectors as
+    FinancialNewsScraper.extract_article_content: the site's article_content
+    selectors, the common ones, then the page's substantial paragraphs.
+    Returns None when none of them yields content, i.e. the page needs the
+    browser.
+    """
+    soup = BeautifulSoup(html, "lxml")
+    for element in soup(["script", "style", "noscript"]):
+        element.decompose()
+
+    selectors = site_config["article_content"].split(", ") + COMMON_CONTENT_SELECTORS
+    for selector in selectors:
+        element = soup.select_one(selector)
+        if element is None:
+            continue
+        content = _element_text(element)
+        if len(content) > MIN_CONTENT_CHARS:
+            return content
+
+    paragraphs = [_element_text(p) for p in soup.find_all("p")]
+    paragraphs = [text for text in paragraphs if len(text) > MIN_PARAGRAPH_CHARS]
+    if paragraphs and len(" ".join(paragraphs)) > MIN_CONTENT_CHARS:
+        return "\n".join(paragraphs)
+    return None
+
+
+class ArticleFetcher:
+    """
+    Downloads article pages concurrently over one shared aiohttp session, at
+    most `per_host` at a time per site.
+
+    The session lives on the fetcher's own event loop thread, so the sync
+    scrapers (which run in worker threads) and async callers share its
+    connection pool instead of opening one per scrape.
+    """
+
+    def __init__(
+        self,
+        per_host: int = ARTICLE_FETCH_PER_HOST,
+        timeout: float = ARTICLE_FETCH_TIMEOUT,
+    ):
+        self.per_host = per_host
+        self.timeout = timeout
+        self._lock = threading.Lock()
+        self._loop: Optional[asyncio.AbstractEventLoop] = None
+        self._session: Optional[aiohttp.ClientSession] = None
+        self._host_limits: Dict[str, asyncio.Semaphore] = {}
+        self._stats = {
+            "requests": 0,
+            "ok": 0,
+            "errors": 0,
+            "bytes": 0,
+            "parsed": 0,
+            "browser_fallbacks": 0,
+            "last_batch_seconds": None,
+        }
+
+    def _get_loop(self) -> asyncio.AbstractEventLoop:
+        with self._lock:
+            if self._loop is None:
+                self._loop = asyncio.new_event_loop()
+                threading.Thread(
+                    target=self._loop.run_forever, name="article-fetcher", daemon=True
+                ).start()
+            return self._loop
+
+    def _host_limit(self, url: str) -> asyncio.Semaphore:
+        # Only touched from the fetcher loop
+        host = urlparse(url).netloc
+        if host not in self._host_limits:
+            self._host_limits[host] = asyncio.Semaphore(self.per_host)
+        return self._host_limits[host]
+
+    def _count(self, **increments) -> None:
+        with self._lock:
+            for key, value in increments.items():
+                self._stats[key] += value
+
+    async def _fetch(self, url: str) -> Optional[str]:
+        if self._session is None or self._session.closed:
+            self._session = aiohttp.ClientSession(
+                headers=ARTICLE_HEADERS,
+                timeout=aiohttp.ClientTimeout(total=self.timeout),
+            )
+        async with self._host_limit(url):
+            self._count(requests=1)
+            try:
+                async with self._session.get(url, ssl=False) as response:
+                    if response.status != 200:
+                        logger.warning(f"Article fetch {url} returned {response.status}")
+                        self._count(errors=1)
+                        return None
+                    html = await response.text()
+            except Exception as e:
+                logger.warning(f"Article fetch {url} failed: {str(e)}")
+                self._count(errors=1)
+                return None
+        self._count(ok=1, bytes=len(html))
+        return html
+
+    async def _fetch_all(self, urls: List[str]) -> Dict[str, Optional[str]]:
+        start = time.monotonic()
+        pages = await asyncio.gather(*(self._fetch(url) for url in urls))
+        with self._lock:
+            self._stats["last_batch_seconds"] = round(time.monotonic() - start, 2)
+        return dict(zip(urls, pages))
+
+    def fetch_pages(self, urls: List[str]) -> Dict[str, Optional[str]]:
+        """HTML of every URL (None where the download failed)"""
+        if not urls:
+            return {}
+        future = asyncio.run_coroutine_threadsafe(self._fetch_all(urls), self._get_loop())
+        return future.result()
+
+    async def fetch_pages_async(self, urls: List[str]) -> Dict[str, Optional[str]]:
+        """Async version of fetch_pages"""
+        if not urls:
+            return {}
+        future = asyncio.run_coroutine_threadsafe(self._fetch_all(urls), self._get_loop())
+        return await asyncio.wrap_future(future)
+
+    def record_parse(self, parsed: bool) -> None:
+        """Count an article read from static HTML, or one left to the browser"""
+        self._count(**({"parsed": 1} if parsed else {"browser_fallbacks": 1}))
+
+    def stats(self) -> Dict:
+        with self._lock:
+            return {**self._stats, "per_host": self.per_host}
+
+
+# Shared fetcher used by the news scrapers
+article_fetcher = ArticleFetcher()
@@ -0,0 +1,327 @@
+import os
+import time
+import logging
+import threading
+from contextlib import contextmanager
+from typing import Dict, List, Optional
+
+from selenium import webdriver
+from selenium.common.exceptions import SessionNotCreatedException, WebDriverException
+from selenium.webdriver.chrome.options import Options
+from selenium.webdriver.chrome.service import Service
+
+from data.driver_registry import driver_registry
+from data.resource_blocking import (
+    PageTraffic,
+    apply_blocking_prefs,
+    enable_url_blocking,
+    record_page,
+)
+
+logger = logging.getLogger(__name__)
+
+# Pool limits, configurable from the environment
+BROWSER_POOL_SIZE = int(os.getenv("BROWSER_POOL_SIZE", 2))
+BROWSER_MAX_PAGES = int(os.getenv("BROWSER_MAX_PAGES", 50))
+BROWSER_MAX_RSS_MB = float(os.getenv("BROWSER_MAX_RSS_MB", 1024))
+BROWSER_LEASE_TIMEOUT = float(os.getenv("BROWSER_LEASE_TIMEOUT", 180))
+BROWSER_PAGE_LOAD_TIMEOUT = float(os.getenv("BROWSER_PAGE_LOAD_TIMEOUT", 45))
+
+USER_AGENT = (
+    "Mozilla/5.0 (Windows NT 10.0; Win64; x64) AppleWebKit/537.36 "
+    "(KHTML, like Gecko) Chrome/120.0.0.0 Safari/537.36"
+)
+
+# Chrome flags shared by every scraper
+CHROME_ARGUMENTS = [
+    # Headless, container friendly
+    "--headless=new",
+    "--no-sandbox",
+    "--disable-dev-shm-usage",
+    "--window-size=1920,1080",
+    # Rendering work the scrapers never need
+    "--disable-gpu",
+    "--disable-software-rasterizer",
+    "--disable-webgl",
+    "--mute-audio",
+    # Background activity and browser chrome
+    "--disable-notifications",
+    "--disable-extensions",
+    "--disable-infobars",
+    "--disable-popup-blocking",
+    "--disable-background-networking",
+    "--disable-breakpad",
+    "--disable-features=TranslateUI",
+    "--no-first-run",
+    "--no-default-browser-check",
+    "--metrics-recording-only",
+    # Look like a regular browser
+    "--disable-blink-features=AutomationControlled",
+    f"--user-agent={USER_AGENT}",
+]
+
+
+def default_chrome_options() -> Options:
+    chrome_options = Options()
+    for argument in CHROME_ARGUMENTS:
+        chrome_options.add_argument(argument)
+    # DevTools network events, read by data.network_capture and for the
+    # per-page traffic counters
+    chrome_options.set_capability("goog:loggingPrefs", {"performance": "ALL"})
+    apply_blocking_prefs(chrome_options)
+    return chrome_options
+
+
+def _process_rss_mb(pid: int) -> float:
+    """Resident memory of a process and all of its descendants, in MB (Linux only)"""
+    total_kb = 0
+    pending = [pid]
+    while pending:
+        current = pending.pop()
+        try:
+            with open(f"/proc/{current}/status", "r") as f:
+                for line in f:
+                    if line.startswith("VmRSS:"):
+                        total_kb += int(line.split()[1])
+                        break
+            with open(f"/proc/{current}/task/{current}/children", "r") as f:
+                pending.extend(int(child) for child in f.read().split())
+        except (OSError, ValueError):
+            continue
+    return total_kb / 1024
+
+
+class PooledDriver:
+    """A pooled WebDriver that counts the pages it loads and their network traffic"""
+
+    def __init__(self, driver: webdriver.Chrome):
+        self._driver = driver
+        self.pages = 0
+        self.created_at = time.time()
+        self.traffic: Optional[PageTraffic] = None
+
+    def get(self, url: str) -> None:
+        self.finish_page()
+        self.pages += 1
+        if url != "about:blank":
+            self.traffic = PageTraffic(url)
+        self._driver.get(url)
+
+    def get_log(self, log_type: str) -> List[Dict]:
+        # Every reader of the performance log goes through here, so the
+        # current page's traffic sees all of its network events
+        entries = self._driver.get_log(log_type)
+        if log_type == "performance" and self.traffic is not None:
+            self.traffic.observe(entries)
+        return entries
+
+    def finish_page(self) -> None:
+        """Record the traffic of the page loaded last, if any"""
+        if self.traffic is None:
+            return
+        try:
+            self.get_log("performance")
+        except Exception:
+            pass
+        record_page(self.traffic)
+        self.traffic = None
+
+    def __getattr__(self, name):
+        # Everything else goes straight to the underlying driver
+        return getattr(self._driver, name)
+
+    @property
+    def rss_mb(self) -> float:
+        try:
+            return _process_rss_mb(self._driver.service.process.pid)
+        except Exception:
+            return 0.0
+
+    def is_healthy(self) -> bool:
+        try:
+            self._driver.execute_script("return 1")
+            return True
+        except Exception:
+            return False
+
+    def quit(self) -> None:
+        try:
+            self._driver.quit()
+        except Exception as e:
+            logger.warning(f"Error quitting pooled browser: {str(e)}")
+
+
+class BrowserPool:
+    """
+    Bounded pool of headless Chrome instances shared by all scrapers.
+
+    Browsers are leased with `with browser_pool.lease() as driver:` and
+    returned afterwards. A browser is checked before every lease and replaced
+    when it stopped responding, when a lease failed with a WebDriver error,
+    after BROWSER_MAX_PAGES page loads or once its process tree uses more
+    than BROWSER_MAX_RSS_MB of memory.
+    """
+
+    def __init__(
+        self,
+        size: int = BROWSER_POOL_SIZE,
+        max_pages: int = BROWSER_MAX_PAGES,
+        max_rss_mb: float = BROWSER_MAX_RSS_MB,
+        lease_timeout: float = BROWSER_LEASE_TIMEOUT,
+    ):
+        self.size = max(1, size)
+        self.max_pages = max_pages
+        self.max_rss_mb = max_rss_mb
+        self.lease_timeout = lease_timeout
+        self._idle: List[PooledDriver] = []
+        self._open = 0
+        self._closed = False
+        self._condition = threading.Condition()
+        self._stats = {
+            "launched": 0,
+            "leases": 0,
+            "recycled": 0,
+            "unhealthy": 0,
+            "waits": 0,
+        }
+
+    def _create_driver(self) -> PooledDriver:
+        try:
+            driver = self._launch()
+        except SessionNotCreatedException:
+            # Usually Chrome was upgraded past the remembered chromedriver
+            if not driver_registry.invalidate():
+                raise
+            logger.warning("Chrome rejected the resolved chromedriver, resolving again")
+            driver = self._launch()
+        driver.set_page_load_timeout(BROWSER_PAGE_LOAD_TIMEOUT)
+        driver.set_script_timeout(BROWSER_PAGE_LOAD_TIMEOUT)
+        enable_url_blocking(driver)
+        with self._condition:
+            self._stats["launched"] += 1
+        logger.info("Launched pooled Chrome browser")
+        return PooledDriver(driver)
+
+    @staticmethod
+    def _launch() -> webdriver.Chrome:
+        service = Service(driver_registry.resolve())
+        return webdriver.Chrome(service=service, options=default_chrome_options())
+
+    def _acquire(self, timeout: float) -> Optional[PooledDriver]:
+        """Take an idle browser, or reserve a slot for a new one (returns None)"""
+        deadline = time.monotonic() + timeout
+        with self._condition:
+            while True:
+                if self._closed:
+                    raise RuntimeError("Browser pool is shut down")
+                if self._idle:
+                    return self._idle.pop()
+                if self._open < self.size:
+                    self._open += 1
+                    return None
+                remaining = deadline - time.monotonic()
+                if remaining <= 0:
+                    raise TimeoutError(
+                        f"No browser available within {timeout:.0f}s (pool size {self.size})"
+                    )
+                self._stats["waits"] += 1
+                self._condition.wait(remaining)
+
+    def _discard(self, driver: Optional[PooledDriver]) -> None:
+        if driver is not None:
+            driver.quit()
+        with self._condition:
+            self._open -= 1
+            self._condition.notify()
+
+    def _needs_recycling(self, driver: PooledDriver) -> bool:
+        if driver.pages >= self.max_pages:
+            logger.info(f"Recycling browser after {driver.pages} pages")
+            return True
+        rss_mb = driver.rss_mb
+        if rss_mb > self.max_rss_mb:
+            logger.info(f"Recycling browser using {rss_mb:.0f} MB")
+            return True
+        return False
+
+    def _release(self, driver: PooledDriver) -> None:
+        if self._needs_recycling(driver):
+            with self._condition:
+                self._stats["recycled"] += 1
+            self._discard(driver)
+            return
+        try:
+            # Leave nothing behind for the next lease
+            driver.delete_all_cookies()
+            driver.implicitly_wait(0)
+            driver.get("about:blank")
+            driver.pages -= 1  # Blank pages do not count towards recycling
+        except Exception:
+            self._discard(driver)
+            return
+        try:
+            driver.get_log("performance")  # Drop network events of this lease
+        except Exception:
+            pass
+        with self._condition:
+            if self._closed:
+                driver.quit()
+                self._open -= 1
+            else:
+                self._idle.append(driver)
+            self._condition.notify()
+
+    @contextmanager
+    def lease(self, timeout: Optional[float] = None):
+        """Borrow a browser for the duration of a `with` block"""
+        driver = self._acquire(self.lease_timeout if timeout is None else timeout)
+        try:
+            if driver is not None and not driver.is_healthy():
+                logger.warning("Pooled browser stopped responding, replacing it")
+                with self._condition:
+                    self._stats["unhealthy"] += 1
+                driver.quit()
+                driver = None
+            if driver is None:
+                driver = self._create_driver()
+        except Exception:
+            self._discard(None)
+            raise
+
+        with self._condition:
+            self._stats["leases"] += 1
+        try:
+            yield driver
+        except WebDriverException:
+            # The browser may be in an unknown state, do not hand it out again
+            self._discard(driver)
+            raise
+        except BaseException:
+            self._release(driver)
+            raise
+        else:
+            self._release(driver)
+
+    def shutdown(self) -> None:
+        """Quit every idle browser; leased browsers quit when they are returned"""
+        with self._condition:
+            self._closed = True
+            idle, self._idle = self._idle, []
+            self._open -= len(idle)
+            self._condition.notify_all()
+        for driver in idle:
+            driver.quit()
+        logger.info(f"Browser pool shut down, closed {len(idle)} idle browsers")
+
+    def stats(self) -> Dict[str, int]:
+        with self._condition:
+            return {
+                **self._stats,
+                "size": self.size,
+                "open": self._open,
+                "idle": len(self._idle),
+            }
+
+
+# Shared pool used by every Selenium scraper
+browser_pool = BrowserPool()
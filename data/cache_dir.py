@@ -0,0 +1,15 @@
+import os
+
+# Directory for on-disk caches that should survive restarts.
+# Override with the MARKET_CACHE_DIR environment variable.
+CACHE_DIR = os.getenv(
+    "MARKET_CACHE_DIR",
+    os.path.join(os.path.dirname(os.path.dirname(os.path.abspath(__file__))), ".market_cache"),
+)
+
+
+def cache_path(*parts: str) -> str:
+    """Return a path inside the cache directory, creating parent folders as needed"""
+    path = os.path.join(CACHE_DIR, *parts)
+    os.makedirs(os.path.dirname(path), exist_ok=True)
+    return path
@@ -0,0 +1,127 @@
+import os
+import json
+import time
+import shutil
+import logging
+import threading
+from typing import Dict, Optional, Tuple
+
+from webdriver_manager.chrome import ChromeDriverManager
+
+from data.cache_dir import cache_path
+
+logger = logging.getLogger(__name__)
+
+# Use this chromedriver binary as is, without any resolution
+CHROMEDRIVER_PATH = os.getenv("CHROMEDRIVER_PATH")
+
+# Never touch the network: use CHROMEDRIVER_PATH, the last resolved driver
+# or a chromedriver on PATH, and fail when there is none
+CHROMEDRIVER_OFFLINE = os.getenv(
+    "CHROMEDRIVER_OFFLINE", "false"
+).lower() in ("1", "true", "yes")
+
+# A resolved driver is reused across restarts for this long before
+# webdriver-manager is asked again (e.g. to pick up a Chrome upgrade)
+DRIVER_REGISTRY_TTL = float(os.getenv("DRIVER_REGISTRY_TTL", 7 * 24 * 3600))
+
+
+class DriverRegistry:
+    """
+    Resolves the chromedriver binary once per process and remembers it on
+    disk, so creating a browser no longer runs ChromeDriverManager().install()
+    (version probing, cache lookups and possibly downloads) every time.
+    """
+
+    def __init__(
+        self,
+        path: Optional[str] = None,
+        offline: bool = CHROMEDRIVER_OFFLINE,
+        explicit_path: Optional[str] = CHROMEDRIVER_PATH,
+        ttl: float = DRIVER_REGISTRY_TTL,
+    ):
+        self.path = path or cache_path("driver_registry.json")
+        self.offline = offline
+        self.explicit_path = explicit_path
+        self.ttl = ttl
+        self._lock = threading.Lock()
+        self._driver_path: Optional[str] = None
+        self._stats = {"source": None, "resolve_seconds": None, "lookups": 0}
+
+    def _load(self) -> Dict:
+        if not os.path.exists(self.path):
+            return {}
+        try:
+            with open(self.path, "r") as f:
+                return json.load(f)
+        except Exception as e:
+            logger.warning(f"Could not read driver registry {self.path}: {str(e)}")
+            return {}
+
+    def _save(self, driver_path: str) -> None:
+        try:
+            tmp_path = f"{self.path}.tmp"
+            with open(tmp_path, "w") as f:
+                json.dump({"path": driver_path, "resolved_at": time.time()}, f, indent=2)
+            os.replace(tmp_path, self.path)
+        except Exception as e:
+            logger.warning(f"Could not save driver registry {self.path}: {str(e)}")
+
+    def _resolve(self) -> Tuple[str, str]:
+        if self.explicit_path:
+            return self.explicit_path, "explicit"
+
+        entry = self._load()
+        recorded = entry.get("path")
+        if recorded and os.path.exists(recorded):
+            if self.offline or time.time() - entry.get("resolved_at", 0) < self.ttl:
+                return recorded, "registry"
+
+        if self.offline:
+            on_path = shutil.which("chromedriver")
+            if on_path:
+                return on_path, "path"
+            raise RuntimeError(
+                "No chromedriver available offline: set CHROMEDRIVER_PATH, put "
+                "chromedriver on PATH or resolve once with CHROMEDRIVER_OFFLINE=false"
+            )
+
+        driver_path = ChromeDriverManager().install()
+        self._save(driver_path)
+        return driver_path, "webdriver-manager"
+
+    def resolve(self) -> str:
+        """Path of the chromedriver binary, resolved on first use"""
+        with self._lock:
+            self._stats["lookups"] += 1
+            if self._driver_path is None:
+                start = time.monotonic()
+                self._driver_path, source = self._resolve()
+                elapsed = time.monotonic() - start
+                self._stats.update(source=source, resolve_seconds=round(elapsed, 3))
+                logger.info(
+                    f"Using chromedriver {self._driver_path} ({source}, {elapsed:.2f}s)"
+                )
+            return self._driver_path
+
+    def invalidate(self) -> bool:
+        """
+        Forget the resolved driver, e.g. after it failed to start an upgraded
+        Chrome. Returns False when the driver is pinned (CHROMEDRIVER_PATH or
+        offline mode) and resolving again would not change anything.
+        """
+        if self.explicit_path or self.offline:
+            return False
+        with self._lock:
+            self._driver_path = None
+            if os.path.exists(self.path):
+                os.remove(self.path)
+        return True
+
+    def stats(self) -> Dict:
+        with self._lock:
+            return {**self._stats, "path": self._driver_path, "offline": self.offline}
+
+
+# Shared registry used by the browser pool
+driver_registry = DriverRegistry()
@@ -0,0 +1,130 @@
+import os
+import time
+import asyncio
+import logging
+import threading
+import contextvars
+import functools
+from concurrent.futures import Future, ThreadPoolExecutor
+from typing import Any, Callable, Dict
+
+logger = logging.getLogger(__name__)
+
+# Threads per class of blocking work. Each can be overridden with
+# EXECUTOR_<NAME>_WORKERS, e.g. EXECUTOR_LLM_WORKERS=12
+DEFAULT_EXECUTOR_WORKERS = {
+    "browser": 4,  # Scrapes leasing a pooled Chrome (the pool bounds real pages)
+    "http": 16,  # Yahoo Finance and plain HTTP fetches
+    "llm": 8,  # Gemini calls (batched insight prompts wait here for their batch)
+    "pdf": 2,  # ReportLab rendering
+}
+
+
+def load_executor_workers() -> Dict[str, int]:
+    """Read per-executor sizes from the environment, falling back to the defaults"""
+    workers = {}
+    for name, default in DEFAULT_EXECUTOR_WORKERS.items():
+        env_key = f"EXECUTOR_{name.upper()}_WORKERS"
+        try:
+            workers[name] = max(1, int(os.getenv(env_key, default)))
+        except ValueError:
+            logger.warning(f"Invalid value for {env_key}, using default of {default}")
+            workers[name] = default
+    return workers
+
+
+class BoundedExecutor:
+    """
+    A named thread pool of fixed size that counts how many jobs are waiting
+    for a thread, how many are running and how long they waited, so one
+    class of work can be seen queueing without starving the others.
+    """
+
+    def __init__(self, name: str, max_workers: int):
+        self.name = name
+        self.max_workers = max_workers
+        self._pool = ThreadPoolExecutor(
+            max_workers=max_workers, thread_name_prefix=f"{name}-executor"
+        )
+        self._lock = threading.Lock()
+        self._stats = {
+            "queued": 0,
+            "running": 0,
+            "completed": 0,
+            "errors": 0,
+            "peak_queued": 0,
+            "total_wait_seconds": 0.0,
+            "max_wait_seconds": 0.0,
+        }
+
+    def _run(self, submitted: float, fn: Callable[[], Any]) -> Any:
+        wait = time.monotonic() - submitted
+        with self._lock:
+            self._stats["queued"] -= 1
+            self._stats["running"] += 1
+            self._stats["total_wait_seconds"] += wait
+            self._stats["max_wait_seconds"] = max(self._stats["max_wait_seconds"], wait)
+        try:
+            return fn()
+        except Exception:
+            with self._lock:
+                self._stats["errors"] += 1
+            raise
+        finally:
+            with self._lock:
+                self._stats["running"] -= 1
+                self._stats["completed"] += 1
+
+    def submit(self, fn: Callable[..., Any], *args, **kwargs) -> Future:
+        with self._lock:
+            self._stats["queued"] += 1
+            self._stats["peak_queued"] = max(
+                self._stats["peak_queued"], self._stats["queued"]
+            )
+        call = functools.partial(fn, *args, **kwargs)
+        return self._pool.submit(self._run, time.monotonic(), call)
+
+    async def run(self, fn: Callable[..., Any], *args, **kwargs) -> Any:
+        """
+        Await `fn(*args, **kwargs)` on this executor; like asyncio.to_thread
+        the caller's context variables are visible inside the call.
+        """
+        context = contextvars.copy_context()
+        return await asyncio.wrap_future(
+            self.submit(context.run, fn, *args, **kwargs)
+        )
+
+    def shutdown(self) -> None:
+        self._pool.shutdown(wait=False, cancel_futures=True)
+
+    def stats(self) -> Dict[str, Any]:
+        with self._lock:
+            stats = dict(self._stats)
+        started = stats["completed"] + stats["running"]
+        stats["avg_wait_seconds"] = (
+            round(stats["total_wait_seconds"] / started, 3) if started else None
+        )
+        stats["total_wait_seconds"] = round(stats["total_wait_seconds"], 3)
+        stats["max_wait_seconds"] = round(stats["max_wait_seconds"], 3)
+        return {"max_workers": self.max_workers, **stats}
+
+
+# Shared executors used by every *_async wrapper
+executors = {
+    name: BoundedExecutor(name, workers)
+    for name, workers in load_executor_workers().items()
+}
+
+
+async def run_in(executor: str, fn: Callable[..., Any], *args, **kwargs) -> Any:
+    """Await a blocking call on one of the named executors"""
+    return await executors[executor].run(fn, *args, **kwargs)
+
+
+def executor_stats() -> Dict[str, Dict[str, Any]]:
+    return {name: executor.stats() for name, executor in executors.items()}
+
+
+def shutdown_executors() -> None:
+    for executor in executors.values():
+        executor.shutdown()
@@ -1,13 +1,17 @@
 import os
-import logging
-from typing import Dict, Any
 import time
+import inspect
+import logging
+import threading
+from typing import Awaitable, Callable, Dict, Any, List, Optional, Union
 import asyncio
+from concurrent.futures import FIRST_COMPLETED, wait
 from dotenv import load_dotenv
 import google.generativeai as genai
-from selenium import webdriver
-from selenium.webdriver.chrome.options import Options
-from bs4 import BeautifulSoup
+
+from data.executors import executors, run_in
+from data.insight_batch import generate_insight_text
+from data.scrape_engine import scrape_engine
 
 # Load environment variables
 load_dotenv()
@@ -28,209 +32,300 @@ if gemini_api_key:
 else:
     logger.warning("GEMINI_API_KEY not found in environment variables")
 
-FII_DII_URLS = [
-    "https://www.moneycontrol.com/stocks/marketstats/fii_dii_activity/index.php",
-    "https://trendlyne.com/macro-data/fii-dii/latest/cash-pastmonth/",
-]
+# Sources averaged into the institutional figures, see data.scrape_engine.SITES
+INSTITUTIONAL_SITES = ["moneycontrol_fii", "trendlyne_fii"]
 
+# How the sources are scraped:
+#   sequential  one after the other
+#   parallel    concurrently, using whatever answered within the latency budget
+#   hedged      concurrently, returning the first source that parses; the
+#               average over every source is handed to a callback once the
+#               others finish
+INSTITUTIONAL_FETCH_MODE = os.getenv("INSTITUTIONAL_FETCH_MODE", "parallel").lower()
+INSTITUTIONAL_LATENCY_BUDGET = float(os.getenv("INSTITUTIONAL_LATENCY_BUDGET", 60))
 
-class FIIDataScraper:
-    def __init__(self):
-        self.chrome_options = self._setup_chrome_options()
-
-    def _setup_chrome_options(self) -> Options:
-        chrome_options = Options()
-        chrome_options.add_argument("--headless=new")
-        chrome_options.add_argument("--no-sandbox")
-        chrome_options.add_argument("--disable-dev-shm-usage")
-        chrome_options.add_argument("--window-size=1920,1080")
-        chrome_options.add_argument("--disable-notifications")
-        chrome_options.add_argument("--disable-extensions")
-        chrome_options.add_argument("--disable-infobars")
-        chrome_options.add_argument(
-            "--user-agent=Mozilla/5.0 (Windows NT 10.0; Win64; x64) AppleWebKit/537.36 (KHTML, like Gecko) Chrome/120.0.0.0 Safari/537.36"
-        )
-        return chrome_options
+# Receives the average over every source after a hedged scrape; may be a
+# coroutine function when called from the async path
+ReconciledCallback = Callable[[Dict[str, Any]], Union[None, Awaitable[None]]]
+
+# Reconciliations still running after a hedged async scrape returned
+_background_tasks = set()
+
+_latency_lock = threading.Lock()
+_source_latency: Dict[str, Dict[str, Any]] = {}
+
+
+def _scrape_source(site: str) -> Optional[Dict[str, Any]]:
+    """Institutional data of one source, recording how long it took"""
+    start = time.monotonic()
+    ok = False
+    try:
+        institutional_data = scrape_engine.rows(site)
+        ok = bool(institutional_data)
+        return institutional_data
+    finally:
+        elapsed = time.monotonic() - start
+        with _latency_lock:
+            latency = _source_latency.setdefault(
+                site, {"calls": 0, "failures": 0, "total_seconds": 0.0}
+            )
+            latency["calls"] += 1
+            latency["failures"] += 0 if ok else 1
+            latency["total_seconds"] += elapsed
+            latency["last_seconds"] = round(elapsed, 2)
+        logger.info(f"Institutional source {site} took {elapsed:.2f}s")
+
+
+def institutional_source_stats() -> Dict[str, Dict[str, Any]]:
+    """Per-source latency of the institutional scrapes"""
+    with _latency_lock:
+        return {
+            site: {
+                "calls": latency["calls"],
+                "failures": latency["failures"],
+                "last_seconds": latency["last_seconds"],
+                "mean_seconds": round(latency["total_seconds"] / latency["calls"], 2),
+            }
+            for site, latency in _source_latency.items()
+        }
 
-    def _create_driver(self):
-        return webdriver.Chrome(options=self.chrome_options)
 
-    def scrape_institutional_data(self) -> Dict[str, Any]:
+def _result_of(future, site: str) -> Optional[Dict[str, Any]]:
+    try:
+        return future.result()
+    except Exception as e:
+        logger.error(f"Error in institutional data scraping for {site}: {str(e)}")
+        return None
+
+
+class FIIDataScraper:
+    def scrape_institutional_data(
+        self,
+        mode: Optional[str] = None,
+        budget: Optional[float] = None,
+        on_reconciled: Optional[ReconciledCallback] = None,
+    ) -> Dict[str, Any]:
+        """
+        Institutional data from every source, per `mode`. Waits on the browser
+        executor, so it must not itself run there; use
+        scrape_institutional_data_async from the event loop.
+        """
+        mode = mode or INSTITUTIONAL_FETCH_MODE
+        budget = INSTITUTIONAL_LATENCY_BUDGET if budget is None else budget
+        if mode == "sequential":
+            return self._scrape_sequential()
+        # Sources still running when the budget runs out keep going on the
+        # browser executor and warm the scrape engine for the next caller
+        futures = {
+            executors["browser"].submit(_scrape_source, site): site
+            for site in INSTITUTIONAL_SITES
+        }
+        if mode == "hedged":
+            return self._scrape_hedged(futures, budget, on_reconciled)
+        return self._scrape_parallel(futures, budget)
+
+    def _scrape_sequential(self) -> Dict[str, Any]:
         all_institutional_data = []
         sources_successful = []
-        for url in FII_DII_URLS:
-            driver = self._create_driver()
+        for site in INSTITUTIONAL_SITES:
             try:
-                source_name = url.split("//")[1].split(".")[1].capitalize()
-                logger.info(f"Scraping institutional data from {source_name}")
-                driver.get(url)
-                driver.implicitly_wait(10)
-                time.sleep(5)
-                soup = BeautifulSoup(driver.page_source, "html.parser")
-                if "moneycontrol.com" in url:
-                    self._process_moneycontrol_institutional(
-                        soup, all_institutional_data, sources_successful
-                    )
-                elif "trendlyne.com" in url:
-                    self._process_trendlyne_institutional(
-                        soup, all_institutional_data, sources_successful
-                    )
+                logger.info(f"Scraping institutional data from {site}")
+                institutional_data = _scrape_source(site)
+                if institutional_data:
+                    all_institutional_data.append(institutional_data)
+                    sources_successful.append(institutional_data["source"])
             except Exception as e:
                 logger.error(
-                    f"Error in institutional data scraping for {url}: {str(e)}"
+                    f"Error in institutional data scraping for {site}: {str(e)}"
                 )
-            finally:
-                driver.quit()
-        if all_institutional_data:
-            combined_data = {
-                "fii": {"buy_value": 0, "sell_value": 0, "net_value": 0},
-                "dii": {"buy_value": 0, "sell_value": 0, "net_value": 0},
-                "source": ", ".join(sources_successful),
-            }
-            for data in all_institutional_data:
-                combined_data["fii"]["buy_value"] += data["fii"]["buy_value"]
-                combined_data["fii"]["sell_value"] += data["fii"]["sell_value"]
-                combined_data["fii"]["net_value"] += data["fii"]["net_value"]
-                combined_data["dii"]["buy_value"] += data["dii"]["buy_value"]
-                combined_data["dii"]["sell_value"] += data["dii"]["sell_value"]
-                combined_data["dii"]["net_value"] += data["dii"]["net_value"]
-            num_sources = len(all_institutional_data)
-            combined_data["fii"]["buy_value"] /= num_sources
-            combined_data["fii"]["sell_value"] /= num_sources
-            combined_data["fii"]["net_value"] /= num_sources
-            combined_data["dii"]["buy_value"] /= num_sources
-            combined_data["dii"]["sell_value"] /= num_sources
-            combined_data["dii"]["net_value"] /= num_sources
-            logger.info(f"Combined institutional data from {num_sources} sources")
-            return combined_data
-        else:
-            logger.warning("No institutional data could be scraped from any source")
-            return {
-                "fii": {"buy_value": 0, "sell_value": 0, "net_value": 0},
-                "dii": {"buy_value": 0, "sell_value": 0, "net_value": 0},
-                "source": "No data available",
-            }
+        return combine_institutional_data(all_institutional_data, sources_successful)
 
-    async def scrape_institutional_data_async(self) -> Dict[str, Any]:
-        """Async version of scrape_institutional_data"""
-        return await asyncio.to_thread(self.scrape_institutional_data)
-
-    def _process_moneycontrol_institutional(
-        self, soup, all_institutional_data, sources_successful
-    ):
-        selectors = [".mctable1", "table.mctable", "#fii-dii-table", ".data-table"]
-        for selector in selectors:
-            tables = soup.select(selector)
-            if tables and len(tables) >= 1:
-                table = tables[0]
-                rows = table.select("tr")
-                for row_idx in range(1, min(3, len(rows))):
-                    try:
-                        cols = rows[row_idx].select("td")
-                        if len(cols) >= 6:
-                            values = []
-                            for col in cols:
-                                text = col.text.strip().replace(",", "")
-                                try:
-                                    values.append(float(text))
-                                except:
-                                    pass
-                            if len(values) >= 6:
-                                institutional_data = {
-                                    "fii": {
-                                        "buy_value": values[0],
-                                        "sell_value": values[1],
-                                        "net_value": (
-                                            values[2]
-                                            if len(values) > 2
-                                            else values[0] - values[1]
-                                        ),
-                                    },
-                                    "dii": {
-                                        "buy_value": values[3],
-                                        "sell_value": values[4],
-                                        "net_value": (
-                                            values[5]
-                                            if len(values) > 5
-                                            else values[3] - values[4]
-                                        ),
-                                    },
-                                    "source": "MoneyControl",
-                                }
-                                all_institutional_data.append(institutional_data)
-                                sources_successful.append("MoneyControl")
-                                logger.info(
-                                    f"Successfully scraped institutional data from MoneyControl using selector {selector}"
-                                )
-                                return True
-                    except Exception as e:
-                        logger.error(
-                            f"Error extracting MoneyControl institutional data row: {str(e)}"
-                        )
-                        continue
-        return False
-
-    def _process_trendlyne_institutional(
-        self, soup, all_institutional_data, sources_successful
-    ):
-        selectors = [
-            ".table",
-            ".data-table",
-            "#fii-dii-data",
-            ".table-responsive table",
-        ]
-        for selector in selectors:
-            table = soup.select_one(selector)
-            if table:
-                rows = (
-                    table.select("tbody tr")
-                    if table.select_one("tbody")
-                    else table.select("tr")
+    def _scrape_parallel(self, futures, budget: float) -> Dict[str, Any]:
+        done, pending = wait(futures, timeout=budget)
+        for future in pending:
+            logger.warning(
+                f"Institutional source {futures[future]} exceeded the {budget:g}s budget"
+            )
+        results = [_result_of(future, futures[future]) for future in futures if future in done]
+        return _combine_results(results)
+
+    def _scrape_hedged(
+        self,
+        futures,
+        budget: float,
+        on_reconciled: Optional[ReconciledCallback] = None,
+    ) -> Dict[str, Any]:
+        """
+        Return as soon as one source parses. Once the others finish, a new
+        dict averaging every source is passed to `on_reconciled` (from a
+        background thread); the returned dict is never modified.
+        """
+        deadline = time.monotonic() + budget
+        pending = set(futures)
+        first = None
+        while pending and first is None:
+            done, pending = wait(
+                pending,
+                timeout=max(0.0, deadline - time.monotonic()),
+                return_when=FIRST_COMPLETED,
+            )
+            if not done:
+                break
+            for future in done:
+                data = _result_of(future, futures[future])
+                if data and first is None:
+                    first = data
+        if first is None:
+            return combine_institutional_data([], [])
+
+        combined = combine_institutional_data([first], [first["source"]])
+        if pending:
+            threading.Thread(
+                target=self._reconcile, args=(futures, on_reconciled), daemon=True
+            ).start()
+        return combined
+
+    def _reconcile(self, futures, on_reconciled: Optional[ReconciledCallback]) -> None:
+        reconciled = _reconciled(
+            [_result_of(future, futures[future]) for future in futures]
+        )
+        if reconciled is not None and on_reconciled is not None:
+            try:
+                on_reconciled(reconciled)
+            except Exception as e:
+                logger.error(f"Error handing over reconciled institutional data: {str(e)}")
+
+    async def scrape_institutional_data_async(
+        self,
+        on_reconciled: Optional[ReconciledCallback] = None,
+        mode: Optional[str] = None,
+        budget: Optional[float] = None,
+    ) -> Dict[str, Any]:
+        """
+        Async version of scrape_institutional_data. Every source runs as its
+        own job on the browser executor while the budget and hedging are
+        handled here, so no executor thread waits on another. In hedged mode
+        `on_reconciled` is called (and awaited if it returns an awaitable) on
+        the event loop.
+        """
+        mode = mode or INSTITUTIONAL_FETCH_MODE
+        budget = INSTITUTIONAL_LATENCY_BUDGET if budget is None else budget
+        if mode == "sequential":
+            results = []
+            for site in INSTITUTIONAL_SITES:
+                results.append(await _scrape_source_async(site))
+            return _combine_results(results)
+
+        # Sources still running when the budget runs out keep going and warm
+        # the scrape engine for the next caller
+        tasks = {
+            asyncio.ensure_future(_scrape_source_async(site)): site
+            for site in INSTITUTIONAL_SITES
+        }
+        if mode != "hedged":
+            done, pending = await asyncio.wait(tasks, timeout=budget)
+            for task in pending:
+                logger.warning(
+                    f"Institutional source {tasks[task]} exceeded the {budget:g}s budget"
                 )
-                if rows and len(rows) > 0:
-                    try:
-                        target_row = rows[1] if len(rows) > 1 else rows[0]
-                        cols = target_row.select("td")
-                        values = []
-                        for col in cols:
-                            text = col.text.strip().replace(",", "").replace("INR", "")
-                            try:
-                                values.append(float(text))
-                            except:
-                                pass
-                        if len(values) >= 6:
-                            institutional_data = {
-                                "fii": {
-                                    "buy_value": values[0],
-                                    "sell_value": values[1],
-                                    "net_value": (
-                                        values[2]
-                                        if len(values) > 2
-                                        else values[0] - values[1]
-                                    ),
-                                },
-                                "dii": {
-                                    "buy_value": values[3],
-                                    "sell_value": values[4],
-                                    "net_value": (
-                                        values[5]
-                                        if len(values) > 5
-                                        else values[3] - values[4]
-                                    ),
-                                },
-                                "source": "Trendlyne",
-                            }
-                            all_institutional_data.append(institutional_data)
-                            sources_successful.append("Trendlyne")
-                            logger.info(
-                                f"Successfully scraped institutional data from Trendlyne using selector {selector}"
-                            )
-                            return True
-                    except Exception as e:
-                        logger.error(
-                            f"Error extracting Trendlyne institutional data: {str(e)}"
-                        )
-        return False
+            return _combine_results([task.result() for task in tasks if task in done])
+
+        loop = asyncio.get_running_loop()
+        deadline = loop.time() + budget
+        pending = set(tasks)
+        first = None
+        while pending and first is None:
+            done, pending = await asyncio.wait(
+                pending,
+                timeout=max(0.0, deadline - loop.time()),
+                return_when=asyncio.FIRST_COMPLETED,
+            )
+            if not done:
+                break
+            first = next((task.result() for task in done if task.result()), None)
+        if first is None:
+            return combine_institutional_data([], [])
+
+        if pending:
+            reconcile = asyncio.ensure_future(
+                _reconcile_async(list(tasks), on_reconciled)
+            )
+            _background_tasks.add(reconcile)
+            reconcile.add_done_callback(_background_tasks.discard)
+        return combine_institutional_data([first], [first["source"]])
+
+
+async def _scrape_source_async(site: str) -> Optional[Dict[str, Any]]:
+    """_scrape_source on the browser executor, None when it fails"""
+    try:
+        return await run_in("browser", _scrape_source, site)
+    except Exception as e:
+        logger.error(f"Error in institutional data scraping for {site}: {str(e)}")
+        return None
+
+
+async def _reconcile_async(tasks: List[asyncio.Future], on_reconciled) -> None:
+    reconciled = _reconciled(await asyncio.gather(*tasks))
+    if reconciled is None or on_reconciled is None:
+        return
+    try:
+        result = on_reconciled(reconciled)
+        if inspect.isawaitable(result):
+            await result
+    except Exception as e:
+        logger.error(f"Error handing over reconciled institutional data: {str(e)}")
+
+
+def _combine_results(results: List[Optional[Dict[str, Any]]]) -> Dict[str, Any]:
+    results = [data for data in results if data]
+    return combine_institutional_data(results, [data["source"] for data in results])
+
+
+def _reconciled(results: List[Optional[Dict[str, Any]]]) -> Optional[Dict[str, Any]]:
+    """Average over every source that answered, None with fewer than two"""
+    results = [data for data in results if data]
+    if len(results) < 2:
+        return None
+    reconciled = _combine_results(results)
+    fii_nets = [data["fii"]["net_value"] for data in results]
+    logger.info(
+        f"Reconciled institutional data from {reconciled['source']} "
+        f"(FII net spread {max(fii_nets) - min(fii_nets):.2f} Cr)"
+    )
+    return reconciled
+
+
+def combine_institutional_data(all_institutional_data, sources_successful):
+    """Average the FII/DII figures of every source that returned data"""
+    if all_institutional_data:
+        combined_data = {
+            "fii": {"buy_value": 0, "sell_value": 0, "net_value": 0},
+            "dii": {"buy_value": 0, "sell_value": 0, "net_value": 0},
+            "source": ", ".join(sources_successful),
+        }
+        for data in all_institutional_data:
+            combined_data["fii"]["buy_value"] += data["fii"]["buy_value"]
+            combined_data["fii"]["sell_value"] += data["fii"]["sell_value"]
+            combined_data["fii"]["net_value"] += data["fii"]["net_value"]
+            combined_data["dii"]["buy_value"] += data["dii"]["buy_value"]
+            combined_data["dii"]["sell_value"] += data["dii"]["sell_value"]
+            combined_data["dii"]["net_value"] += data["dii"]["net_value"]
+        num_sources = len(all_institutional_data)
+        combined_data["fii"]["buy_value"] /= num_sources
+        combined_data["fii"]["sell_value"] /= num_sources
+        combined_data["fii"]["net_value"] /= num_sources
+        combined_data["dii"]["buy_value"] /= num_sources
+        combined_data["dii"]["sell_value"] /= num_sources
+        combined_data["dii"]["net_value"] /= num_sources
+        logger.info(f"Combined institutional data from {num_sources} sources")
+        return combined_data
+    else:
+        logger.warning("No institutional data could be scraped from any source")
+        return {
+            "fii": {"buy_value": 0, "sell_value": 0, "net_value": 0},
+            "dii": {"buy_value": 0, "sell_value": 0, "net_value": 0},
+            "source": "No data available",
+        }
 
 
 def generate_institutional_insights(institutional_data):
@@ -268,9 +363,7 @@ def generate_institutional_insights(institutional_data):
         - Do not include any asterisks or markdown formatting
         - Return the bullet points as a clean list with one point per line
         """
-        model = genai.GenerativeModel("gemini-2.0-flash")
-        response = model.generate_content(prompt)
-        insight_text = response.text.strip()
+        insight_text = generate_insight_text("fii", prompt).strip()
         lines = insight_text.split("\n")
         clean_lines = []
         for line in lines:
@@ -290,4 +383,4 @@ def generate_institutional_insights(institutional_data):
 
 async def generate_institutional_insights_async(institutional_data):
     """Async version of generate_institutional_insights"""
-    return await asyncio.to_thread(generate_institutional_insights, institutional_data)
+    return await run_in("llm", generate_institutional_insights, institutional_data)
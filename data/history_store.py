@@ -0,0 +1,296 @@
+import os
+import re
+import json
+import time
+import logging
+import tempfile
+import threading
+from datetime import timedelta
+from typing import Dict, List, Optional
+
+import numpy as np
+import pandas as pd
+import yfinance as yf
+
+from data.cache_dir import cache_path
+
+logger = logging.getLogger(__name__)
+
+# Columns stored for every bar, after the epoch-seconds timestamp
+COLUMNS = ["Open", "High", "Low", "Close", "Volume"]
+
+# Cached bars fetched less than this many seconds ago are served without a request
+HISTORY_MIN_REFRESH = float(os.getenv("HISTORY_MIN_REFRESH", 60))
+
+# Calendar length of the yfinance period units served as date windows.
+# "d" periods are counted in bars (trading days) like yfinance does.
+PERIOD_UNITS = {"wk": timedelta(weeks=1), "mo": timedelta(days=31), "y": timedelta(days=366)}
+
+
+def _parse_period(period: str):
+    """Split a yfinance period such as '5d' or '6mo' into (count, unit)"""
+    match = re.fullmatch(r"(\d+)(d|wk|mo|y)", period)
+    if not match:
+        raise ValueError(f"Unsupported history period: {period}")
+    return int(match.group(1)), match.group(2)
+
+
+def download_histories(symbols: List[str], **kwargs) -> Dict[str, pd.DataFrame]:
+    """
+    Download the history of several symbols with a single yf.download call.
+    Extra keyword arguments (period, start, interval) are passed to yfinance.
+    Returns a dictionary of symbol -> DataFrame for the symbols that returned rows.
+    """
+    if not symbols:
+        return {}
+
+    data = yf.download(
+        tickers=symbols,
+        group_by="ticker",
+        auto_adjust=True,
+        threads=True,
+        progress=False,
+        **kwargs,
+    )
+    if data is None or data.empty:
+        return {}
+
+    histories = {}
+    for symbol in symbols:
+        try:
+            if data.columns.nlevels > 1:
+                if symbol not in data.columns.get_level_values(0):
+                    continue
+                history = data[symbol]
+            else:
+                # Older yfinance versions return flat columns for a single ticker
+                history = data
+            history = history.dropna(how="all")
+            if not history.empty:
+                histories[symbol] = history
+        except Exception as e:
+            logger.warning(f"Could not read downloaded data for {symbol}: {str(e)}")
+    return histories
+
+
+def _align_tz(history: pd.DataFrame, tz) -> pd.DataFrame:
+    """Bring downloaded bars to the timezone of the stored ones so they can be merged"""
+    if tz is None:
+        return history
+    history = history.copy()
+    if history.index.tz is None:
+        history.index = history.index.tz_localize(tz)
+    else:
+        history.index = history.index.tz_convert(tz)
+    return history
+
+
+class HistoryStore:
+    """
+    On-disk OHLCV bars keyed by symbol and interval.
+
+    Bars live in one .npy file per symbol and interval (epoch seconds followed
+    by the OHLCV columns) that is opened memory-mapped, so reopening the store
+    after a restart costs nothing until bars are read. Requests are served from
+    the stored bars and only the missing tail is downloaded from Yahoo Finance.
+    """
+
+    def __init__(self, root: Optional[str] = None, min_refresh: float = HISTORY_MIN_REFRESH):
+        self.root = root or os.path.dirname(cache_path("history", "index.json"))
+        os.makedirs(self.root, exist_ok=True)
+        self.min_refresh = min_refresh
+        self._lock = threading.Lock()
+        # One lock per symbol and interval, held around each read-merge-write
+        self._key_locks: Dict[str, threading.Lock] = {}
+        self._index_path = os.path.join(self.root, "index.json")
+        self._index: Dict[str, Dict] = self._load_index()
+
+    def _load_index(self) -> Dict[str, Dict]:
+        if not os.path.exists(self._index_path):
+            return {}
+        try:
+            with open(self._index_path, "r") as f:
+                return json.load(f)
+        except Exception as e:
+            logger.warning(f"Could not read history index {self._index_path}: {str(e)}")
+            return {}
+
+    def _save_index(self) -> None:
+        tmp_path = f"{self._index_path}.tmp"
+        with open(tmp_path, "w") as f:
+            json.dump(self._index, f, indent=2)
+        os.replace(tmp_path, self._index_path)
+
+    @staticmethod
+    def _key(symbol: str, interval: str) -> str:
+        return f"{interval}/{symbol}"
+
+    def _key_lock(self, symbol: str, interval: str) -> threading.Lock:
+        with self._lock:
+            return self._key_locks.setdefault(self._key(symbol, interval), threading.Lock())
+
+    def _path(self, symbol: str, interval: str) -> str:
+        safe_symbol = re.sub(r"[^A-Za-z0-9._-]", "_", symbol)
+        return os.path.join(self.root, interval, f"{safe_symbol}.npy")
+
+    def read(self, symbol: str, interval: str = "1d") -> pd.DataFrame:
+        """Return every stored bar of a symbol, or an empty frame"""
+        with self._lock:
+            meta = self._index.get(self._key(symbol, interval))
+        path = self._path(symbol, interval)
+        if not meta or not os.path.exists(path):
+            return pd.DataFrame(columns=COLUMNS)
+
+        bars = np.load(path, mmap_mode="r")
+        index = pd.to_datetime(np.asarray(bars[:, 0]), unit="s", utc=True)
+        if meta.get("tz"):
+            index = index.tz_convert(meta["tz"])
+        return pd.DataFrame(np.array(bars[:, 1:]), index=index, columns=COLUMNS)
+
+    def _write(self, symbol: str, interval: str, history: pd.DataFrame, covered_from: float) -> None:
+        history = history[~history.index.duplicated(keep="last")].sort_index()
+        index = pd.DatetimeIndex(history.index)
+        tz = str(index.tz) if index.tz is not None else None
+        if tz is None:
+            index = index.tz_localize("UTC")
+        columns = [
+            history[column].to_numpy(dtype=float)
+            if column in history
+            else np.full(len(history), np.nan)
+            for column in COLUMNS
+        ]
+        bars = np.column_stack([index.as_unit("s").asi8] + columns).astype(float)
+
+        path = self._path(symbol, interval)
+        os.makedirs(os.path.dirname(path), exist_ok=True)
+        # Unique temporary file so concurrent writers never share one
+        fd, tmp_path = tempfile.mkstemp(dir=os.path.dirname(path), suffix=".tmp.npy")
+        try:
+            with os.fdopen(fd, "wb") as f:
+                np.save(f, bars)
+            os.replace(tmp_path, path)
+        except BaseException:
+            os.unlink(tmp_path)
+            raise
+
+        with self._lock:
+            self._index[self._key(symbol, interval)] = {
+                "tz": tz,
+                "covered_from": covered_from,
+                "fetched_at": time.time(),
+                "bars": len(bars),
+            }
+
+    def _touch(self, symbol: str, interval: str) -> None:
+        with self._lock:
+            meta = self._index.get(self._key(symbol, interval))
+            if meta:
+                meta["fetched_at"] = time.time()
+
+    def _covers(self, meta: Optional[Dict], period: str) -> bool:
+        """True when the stored bars reach back far enough for a period"""
+        if not meta:
+            return False
+        count, unit = _parse_period(period)
+        if unit == "d":
+            return meta["bars"] >= count
+        return meta["covered_from"] <= time.time() - (count * PERIOD_UNITS[unit]).total_seconds()
+
+    @staticmethod
+    def _window(history: pd.DataFrame, period: str) -> pd.DataFrame:
+        count, unit = _parse_period(period)
+        if unit == "d":
+            return history.tail(count)
+        start = history.index.max() - count * PERIOD_UNITS[unit] if len(history) else None
+        return history[history.index > start] if start is not None else history
+
+    def get_histories(
+        self, symbols: List[str], period: str, interval: str = "1d"
+    ) -> Dict[str, pd.DataFrame]:
+        """
+        Return bars covering `period` for several symbols. Symbols fetched
+        recently are served from disk, the others download either their
+        missing tail or, when the store does not reach back far enough, the
+        whole period, with one batched request per kind.
+        """
+        now = time.time()
+        full_fetch, tail_fetch = [], {}
+        for symbol in symbols:
+            with self._lock:
+                meta = self._index.get(self._key(symbol, interval))
+            if not self._covers(meta, period):
+                full_fetch.append(symbol)
+            elif now - meta["fetched_at"] >= self.min_refresh:
+                tail_fetch[symbol] = self.read(symbol, interval)
+
+        if full_fetch:
+            logger.info(f"Downloading {period} history for {len(full_fetch)} symbols")
+            count, unit = _parse_period(period)
+            downloaded = download_histories(full_fetch, period=period, interval=interval)
+            for symbol, history in downloaded.items():
+                with self._key_lock(symbol, interval):
+                    stored = self.read(symbol, interval)
+                    history = history[COLUMNS]
+                    if len(stored):
+                        history = _align_tz(history, stored.index.tz)
+                        merged = pd.concat([stored, history])
+                    else:
+                        merged = history
+                    # Date windows count as covered from their start even when the
+                    # symbol has no older bars, "d" periods are checked by bar count
+                    covered_from = pd.DatetimeIndex(merged.index).min().timestamp()
+                    if unit != "d":
+                        covered_from = min(
+                            covered_from, now - (count * PERIOD_UNITS[unit]).total_seconds()
+                        )
+                    with self._lock:
+                        meta = self._index.get(self._key(symbol, interval))
+                    if meta and len(stored):
+                        # Never claim less than an earlier, longer fetch did
+                        covered_from = min(covered_from, meta["covered_from"])
+                    self._write(symbol, interval, merged, covered_from)
+
+        if tail_fetch:
+            # Re-download the last stored bar as well, it may have been partial
+            start = min(history.index.max() for history in tail_fetch.values())
+            logger.info(
+                f"Downloading {interval} bars since {start.date()} for {len(tail_fetch)} symbols"
+            )
+            tails = download_histories(
+                list(tail_fetch), start=start.strftime("%Y-%m-%d"), interval=interval
+            )
+            for symbol in tail_fetch:
+                tail = tails.get(symbol)
+                if tail is None or tail.empty:
+                    self._touch(symbol, interval)
+                    continue
+                with self._key_lock(symbol, interval):
+                    # Re-read under the lock, a concurrent full fetch may have
+                    # stored more bars since
+                    stored = self.read(symbol, interval)
+                    with self._lock:
+                        covered_from = self._index[self._key(symbol, interval)]["covered_from"]
+                    tail = _align_tz(tail[COLUMNS], getattr(stored.index, "tz", None))
+                    merged = pd.concat([stored[stored.index < tail.index.min()], tail])
+                    self._write(symbol, interval, merged, covered_from)
+
+        if full_fetch or tail_fetch:
+            with self._lock:
+                self._save_index()
+
+        histories = {}
+        for symbol in symbols:
+            history = self.read(symbol, interval)
+            if len(history):
+                histories[symbol] = self._window(history, period)
+        return histories
+
+    def get_history(self, symbol: str, period: str, interval: str = "1d") -> pd.DataFrame:
+        """Single-symbol version of get_histories, empty when no bars are available"""
+        return self.get_histories([symbol], period, interval).get(
+            symbol, pd.DataFrame(columns=COLUMNS)
+        )
+
+
+# Shared store used by every yfinance consumer
+history_store = HistoryStore()
@@ -0,0 +1,213 @@
+import os
+import copy
+import json
+import logging
+import threading
+from typing import Dict, Optional
+
+import pandas as pd
+
+from data.cache_dir import cache_path
+from data.indicators import MACD_FAST, MACD_SIGNAL, MACD_SLOW, RSI_WINDOW, SUPPORT_WINDOW
+
+logger = logging.getLogger(__name__)
+
+# Smoothing factors, same definitions as the vectorized engine in data.indicators
+RSI_ALPHA = 1 / RSI_WINDOW
+FAST_ALPHA = 2 / (MACD_FAST + 1)
+SLOW_ALPHA = 2 / (MACD_SLOW + 1)
+SIGNAL_ALPHA = 2 / (MACD_SIGNAL + 1)
+
+
+def _ewm_step(previous: Optional[float], value: float, alpha: float) -> float:
+    return value if previous is None else (1 - alpha) * previous + alpha * value
+
+
+def _empty_state() -> Dict:
+    return {
+        "bars": 0,
+        "last_close": None,
+        "avg_up": None,
+        "avg_down": None,
+        "ema_fast": None,
+        "ema_slow": None,
+        "ema_signal": None,
+        "signal_bars": 0,
+        "recent_closes": [],
+    }
+
+
+def _advance(state: Dict, close: float) -> Dict:
+    """Return the state after one more bar closing at `close`, in O(1)"""
+    diff = close - state["last_close"] if state["last_close"] is not None else 0.0
+    new_state = {
+        "bars": state["bars"] + 1,
+        "last_close": close,
+        "avg_up": _ewm_step(state["avg_up"], max(diff, 0.0), RSI_ALPHA),
+        "avg_down": _ewm_step(state["avg_down"], max(-diff, 0.0), RSI_ALPHA),
+        "ema_fast": _ewm_step(state["ema_fast"], close, FAST_ALPHA),
+        "ema_slow": _ewm_step(state["ema_slow"], close, SLOW_ALPHA),
+        "ema_signal": state["ema_signal"],
+        "signal_bars": state["signal_bars"],
+        "recent_closes": (state["recent_closes"] + [close])[-SUPPORT_WINDOW:],
+    }
+    # The signal line only starts once the MACD line itself is defined
+    if new_state["bars"] >= MACD_SLOW:
+        macd_line = new_state["ema_fast"] - new_state["ema_slow"]
+        new_state["ema_signal"] = _ewm_step(state["ema_signal"], macd_line, SIGNAL_ALPHA)
+        new_state["signal_bars"] += 1
+    return new_state
+
+
+def _values(state: Dict) -> Dict[str, Optional[float]]:
+    """Latest indicator values for a state, None until enough bars were seen"""
+    values = {
+        "close": state["last_close"],
+        "rsi": None,
+        "macd_line": None,
+        "macd_signal": None,
+        "macd_histogram": None,
+        "support": None,
+        "resistance": None,
+    }
+    if state["bars"] >= RSI_WINDOW:
+        if state["avg_down"] == 0:
+            values["rsi"] = 100.0
+        else:
+            values["rsi"] = 100 - 100 / (1 + state["avg_up"] / state["avg_down"])
+    if state["bars"] >= MACD_SLOW:
+        values["macd_line"] = state["ema_fast"] - state["ema_slow"]
+    if state["signal_bars"] >= MACD_SIGNAL:
+        values["macd_signal"] = state["ema_signal"]
+        values["macd_histogram"] = values["macd_line"] - values["macd_signal"]
+    if len(state["recent_closes"]) >= SUPPORT_WINDOW:
+        values["support"] = min(state["recent_closes"])
+        values["resistance"] = max(state["recent_closes"])
+    return values
+
+
+class StreamingIndicators:
+    """
+    Incremental RSI/MACD/support state for one symbol.
+
+    The state is committed up to the last completed bar. The current bar
+    (today's, during market hours) is kept separately, so every intraday tick
+    re-evaluates it on top of the committed state without drifting, and a bar
+    with a newer date commits the previous one first.
+    """
+
+    def __init__(self, symbol: str, data: Optional[Dict] = None):
+        self.symbol = symbol
+        data = data or {}
+        self.committed = data.get("committed") or _empty_state()
+        self.bar_date: Optional[str] = data.get("bar_date")
+        self.bar_close: Optional[float] = data.get("bar_close")
+
+    @classmethod
+    def from_history(cls, symbol: str, history: pd.DataFrame) -> "StreamingIndicators":
+        """Seed the state from a daily history, the last row being the current bar"""
+        indicators = cls(symbol)
+        closes = history["Close"].dropna()
+        for date, close in closes.items():
+            indicators.update(pd.Timestamp(date).strftime("%Y-%m-%d"), float(close))
+        return indicators
+
+    def update(self, bar_date: str, close: float) -> Dict[str, Optional[float]]:
+        """Apply a new bar or a tick of the current bar and return the latest values"""
+        if self.bar_date is not None and bar_date < self.bar_date:
+            logger.debug(f"Ignoring out-of-order bar {bar_date} for {self.symbol}")
+        elif self.bar_date is not None and bar_date > self.bar_date:
+            # A new session started, the previous bar is now final
+            self.committed = _advance(self.committed, self.bar_close)
+            self.bar_date, self.bar_close = bar_date, close
+        else:
+            self.bar_date, self.bar_close = bar_date, close
+        return self.values()
+
+    def values(self) -> Dict[str, Optional[float]]:
+        if self.bar_close is None:
+            return _values(self.committed)
+        return _values(_advance(self.committed, self.bar_close))
+
+    def to_dict(self) -> Dict:
+        return {
+            "committed": self.committed,
+            "bar_date": self.bar_date,
+            "bar_close": self.bar_close,
+        }
+
+
+class IndicatorStateStore:
+    """
+    Streaming indicator states for every symbol, persisted as one JSON file
+    together with the baseline: the last full-history result the states were
+    seeded from, so incremental refreshes survive restarts.
+    """
+
+    def __init__(self, path: Optional[str] = None):
+        self.path = path or cache_path("indicator_state.json")
+        self._lock = threading.Lock()
+        self._states: Dict[str, StreamingIndicators] = {}
+        self._baseline: Optional[Dict] = None
+        self._load()
+
+    def _load(self) -> None:
+        if not os.path.exists(self.path):
+            return
+        try:
+            with open(self.path, "r") as f:
+                data = json.load(f)
+            # Files written before the baseline was stored hold only the states
+            states = data["states"] if "baseline" in data else data
+            self._states = {
+                symbol: StreamingIndicators(symbol, state)
+                for symbol, state in states.items()
+            }
+            self._baseline = data.get("baseline")
+        except Exception as e:
+            logger.warning(f"Could not read indicator state {self.path}: {str(e)}")
+
+    def save(self) -> None:
+        with self._lock:
+            data = {
+                "states": {
+                    symbol: state.to_dict() for symbol, state in self._states.items()
+                },
+                "baseline": self._baseline,
+            }
+        try:
+            tmp_path = f"{self.path}.tmp"
+            with open(tmp_path, "w") as f:
+                json.dump(data, f)
+            os.replace(tmp_path, self.path)
+        except Exception as e:
+            logger.warning(f"Could not save indicator state {self.path}: {str(e)}")
+
+    def baseline(self) -> Optional[Dict]:
+        """The result the states were last seeded from, or None"""
+        with self._lock:
+            return copy.deepcopy(self._baseline)
+
+    def set_baseline(self, result: Dict) -> None:
+        with self._lock:
+            self._baseline = copy.deepcopy(result)
+
+    def has(self, symbol: str) -> bool:
+        with self._lock:
+            return symbol in self._states
+
+    def seed(self, symbol: str, history: pd.DataFrame) -> None:
+        """Replace the state of a symbol with one rebuilt from its full history"""
+        state = StreamingIndicators.from_history(symbol, history)
+        with self._lock:
+            self._states[symbol] = state
+
+    def update(
+        self, symbol: str, bar_date: str, close: float
+    ) -> Optional[Dict[str, Optional[float]]]:
+        """Apply a tick to a seeded symbol, returns None for unknown symbols"""
+        with self._lock:
+            state = self._states.get(symbol)
+            if state is None:
+                return None
+            return state.update(bar_date, close)
@@ -0,0 +1,210 @@
+import logging
+from typing import Dict, List, Optional, Tuple
+
+import numpy as np
+import pandas as pd
+from numpy.lib.stride_tricks import sliding_window_view
+
+logger = logging.getLogger(__name__)
+
+# Default indicator parameters, same defaults as the `ta` package
+RSI_WINDOW = 14
+MACD_FAST = 12
+MACD_SLOW = 26
+MACD_SIGNAL = 9
+BOLLINGER_WINDOW = 20
+BOLLINGER_DEV = 2
+ATR_WINDOW = 14
+SUPPORT_WINDOW = 20
+SMA_WINDOWS = (20, 50)
+EMA_WINDOWS = (20, 50)
+
+# Largest absolute difference tolerated against `ta` (see benchmarks/bench_indicators.py)
+TA_TOLERANCE = 1e-8
+
+# Indicator engine
+#
+# Every function takes 2-D float arrays shaped (symbols, days). Rows are right
+# aligned on the latest bar: a symbol with a shorter history is padded with NaN
+# on the left, so the last column always holds the latest bar of every symbol.
+# Output arrays have the same shape and are NaN until enough bars are available.
+
+
+def build_matrix(
+    histories: Dict[str, pd.DataFrame], column: str = "Close"
+) -> Tuple[List[str], np.ndarray]:
+    """Stack one column of several price histories into a right-aligned matrix"""
+    symbols = list(histories)
+    length = max((len(histories[s]) for s in symbols), default=0)
+    matrix = np.full((len(symbols), length), np.nan)
+    for row, symbol in enumerate(symbols):
+        values = histories[symbol][column].to_numpy(dtype=float)
+        if len(values):
+            matrix[row, -len(values):] = values
+    return symbols, matrix
+
+
+def ewm(values: np.ndarray, alpha: float, min_periods: int) -> np.ndarray:
+    """
+    Exponentially weighted mean along the day axis, equivalent to
+    pandas ewm(alpha=alpha, adjust=False, min_periods=min_periods).mean()
+    """
+    result = np.full(values.shape, np.nan)
+    state = np.full(values.shape[0], np.nan)
+    count = np.zeros(values.shape[0], dtype=int)
+    for day in range(values.shape[1]):
+        column = values[:, day]
+        valid = ~np.isnan(column)
+        started = ~np.isnan(state)
+        # The first observation of each row seeds its average
+        state = np.where(
+            valid & started,
+            (1 - alpha) * state + alpha * column,
+            np.where(valid, column, state),
+        )
+        count += valid
+        result[:, day] = np.where(count >= min_periods, state, np.nan)
+    return result
+
+
+def ema(values: np.ndarray, window: int) -> np.ndarray:
+    return ewm(values, 2 / (window + 1), window)
+
+
+def _rolling(values: np.ndarray, window: int) -> np.ndarray:
+    """Sliding windows of the day axis, padded so window i ends on day i"""
+    padded = np.concatenate(
+        [np.full((values.shape[0], window - 1), np.nan), values], axis=1
+    )
+    return sliding_window_view(padded, window, axis=1)
+
+
+def sma(values: np.ndarray, window: int) -> np.ndarray:
+    # NaN propagates so incomplete windows stay NaN, like rolling(min_periods=window)
+    return _rolling(values, window).mean(axis=-1)
+
+
+def rsi(close: np.ndarray, window: int = RSI_WINDOW) -> np.ndarray:
+    """Wilder RSI, matching ta.momentum.RSIIndicator"""
+    diff = np.diff(close, axis=1, prepend=np.nan)
+    valid = ~np.isnan(close)
+    # The first bar of every row has no change; `ta` counts it as zero movement
+    up = np.where(valid, np.where(diff > 0, diff, 0.0), np.nan)
+    down = np.where(valid, np.where(diff < 0, -diff, 0.0), np.nan)
+    avg_up = ewm(up, 1 / window, window)
+    avg_down = ewm(down, 1 / window, window)
+    with np.errstate(divide="ignore", invalid="ignore"):
+        values = 100 - 100 / (1 + avg_up / avg_down)
+    return np.where(avg_down == 0, 100.0, values)
+
+
+def macd(
+    close: np.ndarray,
+    fast: int = MACD_FAST,
+    slow: int = MACD_SLOW,
+    signal: int = MACD_SIGNAL,
+) -> Tuple[np.ndarray, np.ndarray, np.ndarray]:
+    """MACD line, signal line and histogram, matching ta.trend.MACD"""
+    line = ema(close, fast) - ema(close, slow)
+    signal_line = ema(line, signal)
+    return line, signal_line, line - signal_line
+
+
+def bollinger(
+    close: np.ndarray, window: int = BOLLINGER_WINDOW, dev: float = BOLLINGER_DEV
+) -> Tuple[np.ndarray, np.ndarray, np.ndarray]:
+    """Bollinger middle, upper and lower bands (population std, like ta)"""
+    windows = _rolling(close, window)
+    middle = windows.mean(axis=-1)
+    std = windows.std(axis=-1, ddof=0)
+    return middle, middle + dev * std, middle - dev * std
+
+
+def true_range(high: np.ndarray, low: np.ndarray, close: np.ndarray) -> np.ndarray:
+    prev_close = np.concatenate(
+        [np.full((close.shape[0], 1), np.nan), close[:, :-1]], axis=1
+    )
+    # fmax ignores the missing previous close on the first bar, like ta
+    return np.fmax(
+        high - low, np.fmax(np.abs(high - prev_close), np.abs(low - prev_close))
+    )
+
+
+def atr(
+    high: np.ndarray, low: np.ndarray, close: np.ndarray, window: int = ATR_WINDOW
+) -> np.ndarray:
+    """
+    Average true range, matching ta.volatility.AverageTrueRange: the first
+    value is the mean of the first `window` true ranges, then Wilder smoothing.
+    ta reports 0 before that point, this engine reports NaN.
+    """
+    ranges = true_range(high, low, close)
+    result = np.full(ranges.shape, np.nan)
+    state = np.zeros(ranges.shape[0])
+    count = np.zeros(ranges.shape[0], dtype=int)
+    for day in range(ranges.shape[1]):
+        column = ranges[:, day]
+        valid = ~np.isnan(column)
+        count += valid
+        seeding = valid & (count <= window)
+        state = np.where(seeding, state + np.where(valid, column, 0.0), state)
+        state = np.where(seeding & (count == window), state / window, state)
+        smoothing = valid & (count > window)
+        state = np.where(smoothing, (state * (window - 1) + column) / window, state)
+        result[:, day] = np.where(count >= window, state, np.nan)
+    return result
+
+
+def support_resistance(
+    close: np.ndarray, window: int = SUPPORT_WINDOW
+) -> Tuple[np.ndarray, np.ndarray]:
+    """Rolling lowest and highest close over the last `window` bars"""
+    windows = _rolling(close, window)
+    return windows.min(axis=-1), windows.max(axis=-1)
+
+
+def compute_indicators(
+    close: np.ndarray,
+    high: Optional[np.ndarray] = None,
+    low: Optional[np.ndarray] = None,
+) -> Dict[str, np.ndarray]:
+    """Compute every indicator series for a (symbols, days) close matrix"""
+    indicators = {"close": close, "rsi": rsi(close)}
+    indicators["macd_line"], indicators["macd_signal"], indicators["macd_histogram"] = (
+        macd(close)
+    )
+    indicators["bb_middle"], indicators["bb_upper"], indicators["bb_lower"] = (
+        bollinger(close)
+    )
+    indicators["support"], indicators["resistance"] = support_resistance(close)
+    for window in SMA_WINDOWS:
+        indicators[f"sma_{window}"] = sma(close, window)
+    for window in EMA_WINDOWS:
+        indicators[f"ema_{window}"] = ema(close, window)
+    if high is not None and low is not None:
+        indicators["atr"] = atr(high, low, close)
+    return indicators
+
+
+def latest_values(indicators: Dict[str, np.ndarray]) -> Dict[str, np.ndarray]:
+    """The last column of every indicator series, one value per symbol"""
+    return {name: series[:, -1] for name, series in indicators.items()}
+
+
+def compute_latest_for_histories(
+    histories: Dict[str, pd.DataFrame],
+) -> Dict[str, Dict[str, float]]:
+    """
+    Compute all indicators for several OHLC histories in one pass and return
+    the latest value of each indicator per symbol
+    """
+    if not histories:
+        return {}
+    symbols, close = build_matrix(histories, "Close")
+    _, high = build_matrix(histories, "High")
+    _, low = build_matrix(histories, "Low")
+    latest = latest_values(compute_indicators(close, high, low))
+    return {
+        symbol: {name: float(values[row]) for name, values in latest.items()}
+        for row, symbol in enumerate(symbols)
+    }
@@ -0,0 +1,208 @@
+import os
+import re
+import json
+import time
+import logging
+import threading
+from concurrent.futures import Future
+from typing import Any, Callable, Dict, List, Optional
+
+import google.generativeai as genai
+
+logger = logging.getLogger(__name__)
+
+# Send the insight prompts of every section that asks within the same window
+# as one structured Gemini call instead of one call each
+INSIGHTS_BATCHED = os.getenv("INSIGHTS_BATCHED", "false").lower() in ("1", "true", "yes")
+
+# How long the first prompt of a batch waits for the others, and the most
+# prompts sent together (a full batch goes out at once)
+INSIGHT_BATCH_WINDOW = float(os.getenv("INSIGHT_BATCH_WINDOW", 3))
+INSIGHT_BATCH_MAX = int(os.getenv("INSIGHT_BATCH_MAX", 8))
+
+INSIGHT_MODEL = "gemini-2.0-flash"
+
+BATCH_INSTRUCTIONS = """You are answering several independent requests for one market report.
+Answer each request exactly as it asks, as if it were the only one.
+Return only a JSON object with one key per request, named as in its REQUEST line,
+whose value is the plain-text answer to that request (newlines between bullet points).
+"""
+
+
+def build_batch_prompt(prompts: Dict[str, str]) -> str:
+    """One prompt asking for every request's answer under its own JSON key"""
+    parts = [BATCH_INSTRUCTIONS]
+    for key, prompt in prompts.items():
+        parts.append(f"=== REQUEST: {key} ===\n{prompt.strip()}\n")
+    return "\n".join(parts)
+
+
+def parse_batch_response(text: str) -> Dict[str, str]:
+    """The per-request answers of a batched reply (code fences tolerated)"""
+    text = re.sub(r"^```(?:json)?\s*|\s*```$", "", text.strip())
+    answers = json.loads(text)
+    if not isinstance(answers, dict):
+        raise ValueError("Batched insights reply is not a JSON object")
+    return {
+        key: "\n".join(map(str, value)) if isinstance(value, list) else str(value)
+        for key, value in answers.items()
+    }
+
+
+def _usage(response) -> Dict[str, int]:
+    usage = getattr(response, "usage_metadata", None)
+    return {
+        "prompt_tokens": getattr(usage, "prompt_token_count", 0) or 0,
+        "output_tokens": getattr(usage, "candidates_token_count", 0) or 0,
+    }
+
+
+class _Request:
+    def __init__(self, key: str, prompt: str):
+        self.key = key
+        self.prompt = prompt
+        self.future: Future = Future()
+
+
+class InsightBatcher:
+    """
+    Collects insight prompts from the section loaders and answers them with
+    one Gemini call per batch. A batch is sent `window` seconds after its
+    first prompt arrives, or as soon as it holds `max_size` prompts. Prompts
+    whose answer is missing from the reply (or whose batch call failed) are
+    then sent on their own by their callers, so batching never loses an insight.
+    """
+
+    def __init__(
+        self,
+        window: float = INSIGHT_BATCH_WINDOW,
+        max_size: int = INSIGHT_BATCH_MAX,
+        model_factory: Optional[Callable[[bool], Any]] = None,
+    ):
+        self.window = window
+        self.max_size = max_size
+        # model_factory(json_output) -> model with generate_content()
+        self.model_factory = model_factory or (
+            lambda json_output: genai.GenerativeModel(
+                INSIGHT_MODEL,
+                generation_config=(
+                    {"response_mime_type": "application/json"} if json_output else None
+                ),
+            )
+        )
+        self._lock = threading.Lock()
+        self._pending: List[_Request] = []
+        self._timer: Optional[threading.Timer] = None
+        self._stats = {
+            "batches": 0,
+            "prompts": 0,
+            "calls_saved": 0,
+            "fallbacks": 0,
+            "prompt_tokens": 0,
+            "output_tokens": 0,
+            "last_batch_size": None,
+            "last_batch_seconds": None,
+        }
+
+    def ask(self, key: str, prompt: str) -> str:
+        """Answer to one prompt, sent with the others of its batch"""
+        with self._lock:
+            keys = {request.key for request in self._pending}
+            unique_key, n = key, 2
+            while unique_key in keys:
+                unique_key, n = f"{key}_{n}", n + 1
+            request = _Request(unique_key, prompt)
+            self._pending.append(request)
+            batch = None
+            if len(self._pending) >= self.max_size:
+                batch = self._take_batch()
+            elif self._timer is None:
+                self._timer = threading.Timer(self.window, self._flush_pending)
+                self._timer.daemon = True
+                self._timer.start()
+        if batch:
+            self._send(batch)
+        answer = request.future.result()
+        if answer is None:
+            # Not answered by the batch, ask on its own
+            answer = self._single(prompt)
+        return answer
+
+    def _take_batch(self) -> List[_Request]:
+        # Called with the lock held
+        batch, self._pending = self._pending, []
+        if self._timer is not None:
+            self._timer.cancel()
+            self._timer = None
+        return batch
+
+    def _flush_pending(self) -> None:
+        with self._lock:
+            batch = self._take_batch()
+        if batch:
+            self._send(batch)
+
+    def _send(self, batch: List[_Request]) -> None:
+        start = time.monotonic()
+        answers: Dict[str, str] = {}
+        usage = {"prompt_tokens": 0, "output_tokens": 0}
+        try:
+            if len(batch) == 1:
+                # Nothing to share the call with
+                answers = {batch[0].key: self._single(batch[0].prompt)}
+            else:
+                response = self.model_factory(True).generate_content(
+                    build_batch_prompt({r.key: r.prompt for r in batch})
+                )
+                usage = _usage(response)
+                answers = parse_batch_response(response.text)
+        except Exception as e:
+            logger.warning(f"Batched insight call for {len(batch)} prompts failed: {str(e)}")
+        elapsed = time.monotonic() - start
+
+        missing = [request for request in batch if not answers.get(request.key)]
+        with self._lock:
+            self._stats["batches"] += 1
+            self._stats["prompts"] += len(batch)
+            self._stats["calls_saved"] += max(0, len(batch) - 1 - len(missing))
+            self._stats["fallbacks"] += len(missing)
+            self._stats["prompt_tokens"] += usage["prompt_tokens"]
+            self._stats["output_tokens"] += usage["output_tokens"]
+            self._stats["last_batch_size"] = len(batch)
+            self._stats["last_batch_seconds"] = round(elapsed, 2)
+        logger.info(
+            f"Answered {len(batch) - len(missing)}/{len(batch)} insight prompts "
+            f"with one Gemini call in {elapsed:.1f}s"
+        )
+
+        for request in batch:
+            request.future.set_result(answers.get(request.key) or None)
+
+    def _single(self, prompt: str) -> str:
+        return self.model_factory(False).generate_content(prompt).text
+
+    def stats(self) -> Dict[str, Any]:
+        with self._lock:
+            return {
+                **self._stats,
+                "enabled": INSIGHTS_BATCHED,
+                "window_seconds": self.window,
+            }
+
+
+# Shared batcher behind every section's insight prompt
+insight_batcher = InsightBatcher()
+
+
+def generate_insight_text(key: str, prompt: str, model: Optional[Any] = None) -> str:
+    """
+    Gemini's answer to a section's insight prompt: batched with the other
+    sections' prompts when INSIGHTS_BATCHED is set, otherwise a call of its
+    own on gemini-2.0-flash. A caller passing its own `model` (with its own
+    generation config) is always answered by that model, never batched.
+    """
+    if model is not None:
+        return model.generate_content(prompt).text
+    if INSIGHTS_BATCHED:
+        return insight_batcher.ask(key, prompt)
+    return genai.GenerativeModel(INSIGHT_MODEL).generate_content(prompt).text
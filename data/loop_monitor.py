@@ -0,0 +1,89 @@
+import os
+import time
+import asyncio
+import logging
+from typing import Any, Dict, Optional
+
+logger = logging.getLogger(__name__)
+
+# How often the monitor wakes up, and how late a wake-up may be before it
+# counts as a stall (blocking code running on the event loop)
+LOOP_MONITOR_INTERVAL = float(os.getenv("LOOP_MONITOR_INTERVAL", 0.5))
+LOOP_LAG_THRESHOLD = float(os.getenv("LOOP_LAG_THRESHOLD", 0.25))
+
+
+class EventLoopMonitor:
+    """
+    Measures event loop lag: a task sleeps `interval` seconds at a time and
+    any wake-up later than `threshold` means something blocked the loop for
+    that long. Stalls are logged and counted.
+    """
+
+    def __init__(
+        self,
+        interval: float = LOOP_MONITOR_INTERVAL,
+        threshold: float = LOOP_LAG_THRESHOLD,
+    ):
+        self.interval = interval
+        self.threshold = threshold
+        self._task: Optional[asyncio.Task] = None
+        self._stats = {
+            "samples": 0,
+            "stalls": 0,
+            "max_lag_seconds": 0.0,
+            "total_stall_seconds": 0.0,
+            "last_stall_lag_seconds": None,
+            "last_stall_at": None,
+        }
+
+    @property
+    def running(self) -> bool:
+        return self._task is not None
+
+    def start(self) -> None:
+        """Start sampling on the running event loop"""
+        if self.running:
+            return
+        self._task = asyncio.ensure_future(self._sample_loop())
+        logger.info(
+            f"Monitoring event loop lag (stall threshold {self.threshold * 1000:.0f} ms)"
+        )
+
+    async def stop(self) -> None:
+        task, self._task = self._task, None
+        if task is not None:
+            task.cancel()
+            await asyncio.gather(task, return_exceptions=True)
+
+    def record(self, lag: float) -> None:
+        """Count one sample of `lag` seconds"""
+        self._stats["samples"] += 1
+        self._stats["max_lag_seconds"] = round(max(self._stats["max_lag_seconds"], lag), 3)
+        if lag > self.threshold:
+            self._stats["stalls"] += 1
+            self._stats["total_stall_seconds"] = round(
+                self._stats["total_stall_seconds"] + lag, 3
+            )
+            self._stats["last_stall_lag_seconds"] = round(lag, 3)
+            self._stats["last_stall_at"] = time.time()
+            logger.warning(
+                f"Event loop stalled for {lag * 1000:.0f} ms "
+                f"(threshold {self.threshold * 1000:.0f} ms)"
+            )
+
+    async def _sample_loop(self) -> None:
+        while True:
+            start = time.monotonic()
+            await asyncio.sleep(self.interval)
+            self.record(max(0.0, time.monotonic() - start - self.interval))
+
+    def stats(self) -> Dict[str, Any]:
+        return {
+            **self._stats,
+            "running": self.running,
+            "threshold_seconds": self.threshold,
+        }
+
+
+# Shared monitor, started from main.py
+loop_monitor = EventLoopMonitor()
@@ -2,7 +2,6 @@
 from fastapi import FastAPI, HTTPException
 from fastapi.middleware.cors import CORSMiddleware
 import requests
-import yfinance as yf
 from pydantic import BaseModel
 from typing import List, Dict, Any, Optional
 import pandas as pd
@@ -17,6 +16,10 @@ import json
 import asyncio
 import aiohttp
 
+from data.executors import run_in
+from data.history_store import history_store
+from data.insight_batch import generate_insight_text
+
 # Load environment variables
 load_dotenv()
 
@@ -68,6 +71,7 @@ class FinancialDashboard(BaseModel):
     last_updated: str
     indicators: Dict[str, IndicatorData]
     insights: Optional[str] = None
+    snapshot_age_seconds: Optional[float] = None
 
 
 # Helper functions
@@ -156,12 +160,13 @@ def get_stock_indices():
             "^N225": "Nikkei",
         }
 
+        # Use a longer period to ensure we get data, one request for all indices
+        histories = history_store.get_histories(list(indices), "5d")
+
         result = {}
         for symbol, name in indices.items():
             try:
-                ticker = yf.Ticker(symbol)
-                # Use a longer period to ensure we get data
-                data = ticker.history(period="5d")
+                data = histories.get(symbol, pd.DataFrame())
 
                 if not data.empty:
                     current_price = data.iloc[-1]["Close"]
@@ -208,7 +213,7 @@ def get_stock_indices():
 
 async def get_stock_indices_async():
     """Async version of get_stock_indices"""
-    return await asyncio.to_thread(get_stock_indices)
+    return await run_in("http", get_stock_indices)
 
 
 @with_retry
@@ -589,8 +594,7 @@ async def get_gold_price_alpha_vantage_async():
 def get_currency_rates():
     """Get USD/INR exchange rate"""
     try:
-        ticker = yf.Ticker("INR=X")
-        data = ticker.history(period="5d")
+        data = history_store.get_history("INR=X", "5d")
 
         if not data.empty:
             current_rate = data.iloc[-1]["Close"]
@@ -640,7 +644,7 @@ def get_currency_rates():
 
 async def get_currency_rates_async():
     """Async version of get_currency_rates"""
-    return await asyncio.to_thread(get_currency_rates)
+    return await run_in("http", get_currency_rates)
 
 
 def get_bond_yields():
@@ -648,8 +652,7 @@ def get_bond_yields():
     try:
         # For India bonds, we could use symbol "^TNX" for US 10Y as placeholder
         # In production, you would need a specialized API for Indian govt bonds
-        ticker = yf.Ticker("^TNX")
-        data = ticker.history(period="5d")
+        data = history_store.get_history("^TNX", "5d")
 
         if not data.empty:
             current_yield = data.iloc[-1]["Close"]
@@ -702,7 +705,7 @@ def get_bond_yields():
 
 async def get_bond_yields_async():
     """Async version of get_bond_yields"""
-    return await asyncio.to_thread(get_bond_yields)
+    return await run_in("http", get_bond_yields)
 
 
 def generate_indicators_insights(indicators):
@@ -751,9 +754,7 @@ def generate_indicators_insights(indicators):
 
         # Generate insights using Gemini
         try:
-            model = genai.GenerativeModel("gemini-2.0-flash")
-            response = model.generate_content(prompt)
-            insight_text = response.text.strip()
+            insight_text = generate_insight_text("indicators", prompt).strip()
 
             # Split by lines and clean up each bullet point
             lines = insight_text.split("\n")
@@ -783,7 +784,7 @@ def generate_indicators_insights(indicators):
 
 async def generate_indicators_insights_async(indicators):
     """Async version of generate_indicators_insights"""
-    return await asyncio.to_thread(generate_indicators_insights, indicators)
+    return await run_in("llm", generate_indicators_insights, indicators)
 
 
 def fetch_all_financial_indicators():
@@ -11,6 +11,8 @@ from fastapi import FastAPI, HTTPException
 from fastapi.responses import JSONResponse
 import logging
 
+from data.insight_batch import generate_insight_text
+
 # Configure logging - Updated to use market_api.log for consistency
 logging.basicConfig(
     level=logging.INFO,
@@ -266,8 +268,7 @@ class MarketAnalysisGenerator:
             """
 
             # Call Gemini model
-            response = self.model.generate_content(prompt)
-            analysis_text = response.text.strip()
+            analysis_text = generate_insight_text("market_analysis", prompt).strip()
 
             # Process the response to ensure proper bullet point formatting
             lines = analysis_text.split("\n")
@@ -326,8 +327,7 @@ class MarketAnalysisGenerator:
             """
 
             # Call Gemini model
-            response = self.model.generate_content(prompt)
-            summary_text = response.text.strip()
+            summary_text = generate_insight_text("market_summary", prompt).strip()
 
             # Process the response to ensure proper bullet point formatting
             lines = summary_text.split("\n")
@@ -394,8 +394,7 @@ class MarketAnalysisGenerator:
             """
 
             # Call Gemini model
-            response = self.model.generate_content(prompt)
-            prediction_text = response.text.strip()
+            prediction_text = generate_insight_text("market_predictions", prompt).strip()
 
             # Process the response to ensure proper bullet point formatting
             lines = prediction_text.split("\n")
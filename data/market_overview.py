@@ -7,7 +7,11 @@ import google.generativeai as genai
 from dotenv import load_dotenv
 import json
 import time
-import asyncio
+
+from data.executors import run_in
+from data.history_store import history_store
+from data.insight_batch import generate_insight_text
+from data.symbol_resolver import SymbolResolver
 
 # Load environment variables
 load_dotenv()
@@ -58,9 +62,166 @@ index_names = {
 }
 
 
+# Periods tried for each symbol, shortest first
+MARKET_DATA_PERIODS = ["2d", "5d", "1wk"]
+
+# Period used for the single batched request covering every primary symbol.
+# 5d is long enough to contain two sessions across weekends and holidays.
+BATCH_PERIOD = "5d"
+
+# Remembers which symbol/period worked for each index across restarts
+symbol_resolver = SymbolResolver()
+
+
+def _summarize_history(history):
+    """Build the market data entry from a price history, or None if too short"""
+    if history is None or history.empty or "Close" not in history.columns:
+        return None
+    history = history.dropna(subset=["Close"])
+    if len(history) < 2:
+        return None
+
+    prev_close = history.iloc[-2]["Close"]
+    current = history.iloc[-1]
+
+    # Calculate change
+    change = current["Close"] - prev_close
+    change_percent = (change / prev_close) * 100
+
+    return {
+        "Open": round(current["Open"], 2),
+        "High": round(current["High"], 2),
+        "Low": round(current["Low"], 2),
+        "Close": round(current["Close"], 2),
+        "Change": round(change, 2),
+        "Change%": round(change_percent, 2),
+        "PrevClose": round(prev_close, 2),
+    }
+
+
+def _download_batch(symbols, period):
+    """
+    Get the history of several symbols, served from the local history store
+    which downloads only missing bars, batched into one yf.download call.
+    Returns a dictionary of symbol -> DataFrame for the symbols that returned rows.
+    """
+    if not symbols:
+        return {}
+
+    logger.info(f"Loading {len(symbols)} symbols with period {period}")
+    return history_store.get_histories(symbols, period)
+
+
 def fetch_market_data():
     """
-    Fetch market data for all indices with retry and fallback mechanisms
+    Fetch market data for all indices with retry and fallback mechanisms.
+
+    All indices are requested in one batched download, each with the
+    symbol/period that last worked for it (see symbol_resolver). Only the
+    indices that fail are retried, in rounds that batch the next
+    symbol/period candidate of every remaining index together.
+    """
+    market_data = {}
+
+    # Add metadata
+    now = datetime.now()
+    market_data["_meta"] = {
+        "date": now.strftime("%Y-%m-%d"),
+        "timestamp": now.strftime("%H:%M:%S"),
+    }
+
+    # Remaining (symbol, period) candidates for every primary symbol, in the
+    # same order the sequential fetch would try them
+    candidates = {
+        primary_symbol: [
+            (symbol, period)
+            for period in MARKET_DATA_PERIODS
+            for symbol in [primary_symbol] + alternative_symbols
+        ]
+        for primary_symbol, alternative_symbols in index_mapping
+    }
+
+    # First round: every index starts with its last known-good symbol/period,
+    # or with the primary symbol when nothing is known yet. Indices resolved
+    # to an alternative periodically try their primary symbol first again.
+    next_round = {}
+    for primary_symbol in primary_symbols:
+        first_candidates = [(primary_symbol, BATCH_PERIOD)]
+        known = symbol_resolver.lookup(primary_symbol)
+        if known:
+            if symbol_resolver.should_reprobe(primary_symbol):
+                logger.info(f"Re-probing primary symbol {primary_symbol}")
+                symbol_resolver.mark_probed(primary_symbol)
+                first_candidates.append(known)
+            else:
+                first_candidates = [known]
+
+        remaining = candidates[primary_symbol]
+        candidates[primary_symbol] = first_candidates + [
+            candidate for candidate in remaining if candidate not in first_candidates
+        ]
+        next_round[primary_symbol] = candidates[primary_symbol].pop(0)
+
+    while next_round:
+        # Group this round's candidates by period, one batched request per period
+        symbols_by_period = {}
+        for symbol, period in next_round.values():
+            symbols_by_period.setdefault(period, [])
+            if symbol not in symbols_by_period[period]:
+                symbols_by_period[period].append(symbol)
+
+        histories = {}
+        for period, symbols in symbols_by_period.items():
+            try:
+                histories[period] = _download_batch(symbols, period)
+            except Exception as e:
+                logger.warning(
+                    f"Batch download failed for {symbols} with period {period}: {str(e)}"
+                )
+                histories[period] = {}
+
+        for primary_symbol, (symbol, period) in next_round.items():
+            summary = _summarize_history(histories[period].get(symbol))
+            if summary:
+                # Store under the primary symbol regardless of which alternative worked
+                summary["FetchedFrom"] = symbol  # Track which symbol actually worked
+                market_data[primary_symbol] = summary
+                symbol_resolver.record(primary_symbol, symbol, period)
+                logger.info(
+                    f"Successfully fetched data for {primary_symbol} using {symbol} ({period})"
+                )
+            else:
+                logger.info(f"No usable data for {symbol} with period {period}")
+
+        # Advance every still-missing index to its next candidate
+        next_round = {
+            primary_symbol: candidates[primary_symbol].pop(0)
+            for primary_symbol in primary_symbols
+            if primary_symbol not in market_data and candidates[primary_symbol]
+        }
+        if next_round:
+            # Add delay to avoid rate limiting between retry rounds
+            time.sleep(0.5)
+
+    # Mark indices where every option failed and keep the index_mapping order
+    ordered_data = {"_meta": market_data["_meta"]}
+    for primary_symbol in primary_symbols:
+        if primary_symbol not in market_data:
+            logger.warning(
+                f"Could not fetch data for {primary_symbol} or any of its alternatives"
+            )
+            market_data[primary_symbol] = {"Error": "Data unavailable"}
+            symbol_resolver.forget(primary_symbol)
+        ordered_data[primary_symbol] = market_data[primary_symbol]
+
+    symbol_resolver.save()
+    return ordered_data
+
+
+def fetch_market_data_sequential():
+    """
+    Fetch market data one symbol at a time (the original strategy).
+    Kept as a reference for benchmarks against the batched fetch_market_data.
     """
     market_data = {}
 
@@ -76,7 +237,7 @@ def fetch_market_data():
         logger.info(f"Attempting to fetch data for {primary_symbol}")
 
         # Try all possible periods for better chances of success
-        for period in ["2d", "5d", "1wk"]:
+        for period in MARKET_DATA_PERIODS:
             # First try with the primary symbol
             all_symbols_to_try = [primary_symbol] + alternative_symbols
 
@@ -89,25 +250,10 @@ def fetch_market_data():
                     data = yf.Ticker(symbol)
                     history = data.history(period=period)
 
-                    if len(history) >= 2:
-                        prev_close = history.iloc[-2]["Close"]
-                        current = history.iloc[-1]
-
-                        # Calculate change
-                        change = current["Close"] - prev_close
-                        change_percent = (change / prev_close) * 100
-
-                        # Store under the primary symbol regardless of which alternative worked
-                        market_data[primary_symbol] = {
-                            "Open": round(current["Open"], 2),
-                            "High": round(current["High"], 2),
-                            "Low": round(current["Low"], 2),
-                            "Close": round(current["Close"], 2),
-                            "Change": round(change, 2),
-                            "Change%": round(change_percent, 2),
-                            "PrevClose": round(prev_close, 2),
-                            "FetchedFrom": symbol,  # Track which symbol actually worked
-                        }
+                    summary = _summarize_history(history)
+                    if summary:
+                        summary["FetchedFrom"] = symbol
+                        market_data[primary_symbol] = summary
                         logger.info(
                             f"Successfully fetched data for {primary_symbol} using {symbol}"
                         )
@@ -137,7 +283,7 @@ async def fetch_market_data_async():
     """
     Async version of fetch_market_data
     """
-    return await asyncio.to_thread(fetch_market_data)
+    return await run_in("http", fetch_market_data)
 
 
 def generate_concise_insights(market_data, sentence_count=6):
@@ -179,12 +325,8 @@ Your analysis should cover:
 """
 
     try:
-        # Initialize Gemini model
-        model = genai.GenerativeModel("gemini-2.0-flash")
-
         # Generate response
-        response = model.generate_content(prompt)
-        insights_text = response.text.strip()
+        insights_text = generate_insight_text("market_overview", prompt).strip()
 
         return insights_text
 
@@ -197,8 +339,8 @@ async def generate_concise_insights_async(market_data, sentence_count=6):
     """
     Async version of generate_concise_insights
     """
-    return await asyncio.to_thread(
-        generate_concise_insights, market_data, sentence_count
+    return await run_in(
+        "llm", generate_concise_insights, market_data, sentence_count
     )
 
 
@@ -0,0 +1,299 @@
+import asyncio
+import logging
+from typing import Any, Dict, List, Optional
+
+from data.executors import run_in
+from data.snapshot_cache import Snapshot, snapshot_cache
+from data.section_graph import NodeResult, SectionNode, run_graph
+from data.section_refresher import SectionRefresher
+from data.market_overview import generate_report_async, index_names
+from data.sector_scraper import SectorDataScraper, generate_sector_insights_async
+from data.fii_scraper import FIIDataScraper, generate_institutional_insights_async
+from data.top_performers import TopPerformersScraper
+from data.technical_snapshot import get_market_technical_snapshot_async
+from data.macro import fetch_all_financial_indicators_async
+from data.news_highlights import NewsHighlightsGenerator
+from data.market_analysis import MarketAnalysisGenerator
+
+logger = logging.getLogger(__name__)
+
+# Sections that feed the combined analysis, in report order
+ANALYSIS_INPUT_SECTIONS = [
+    "market_overview",
+    "sector",
+    "fii",
+    "top_performers",
+    "technical",
+    "indicators",
+    "news",
+]
+
+
+# --------------------
+# Formatting helpers shared by the JSON and PDF routers
+# --------------------
+def format_indices(market_data: Dict[str, Any]) -> list:
+    """Convert fetch_market_data output into the indices list used by reports"""
+    return [
+        {
+            "name": index_names.get(symbol, symbol),
+            "ltp": str(data["Close"]),
+            "day_change_percent": f"{data['Change%']}%",
+            "day_change": str(data["Change"]),
+            "num_companies": "N/A",
+        }
+        for symbol, data in market_data.items()
+        if symbol != "_meta" and isinstance(data, dict) and "Close" in data
+    ]
+
+
+def serialize_indicators(indicators: Dict[str, Any]) -> Dict[str, Any]:
+    """Convert IndicatorData objects to dictionaries for JSON serialization"""
+    return {
+        name: (value.dict() if hasattr(value, "dict") else value)
+        for name, value in indicators.items()
+    }
+
+
+def build_combined_data(sections: Dict[str, Any]) -> Dict[str, Any]:
+    """
+    Build the comprehensive report structure from raw section values.
+    Missing sections are represented by empty dictionaries.
+    """
+    combined = {}
+
+    report = sections.get("market_overview")
+    combined["market_overview"] = (
+        {
+            "indices": format_indices(report.get("market_data", {})),
+            "insights": report.get("insights", ""),
+        }
+        if report
+        else {}
+    )
+
+    sector = sections.get("sector")
+    combined["sector_movement"] = (
+        {"data": sector["data"], "insights": sector["insights"]} if sector else {}
+    )
+
+    fii = sections.get("fii")
+    combined["institutional_activity"] = (
+        {"data": fii["data"], "insights": fii["insights"]} if fii else {}
+    )
+
+    performers = sections.get("top_performers")
+    combined["top_performers"] = (
+        {
+            "top_gainers": performers.get("top_gainers", []),
+            "top_losers": performers.get("top_losers", []),
+            "insights": performers.get("insights", ""),
+        }
+        if performers
+        else {}
+    )
+
+    combined["technical_snapshot"] = sections.get("technical") or {}
+
+    indicators = sections.get("indicators")
+    combined["financial_indicators"] = (
+        serialize_indicators(indicators) if indicators else {}
+    )
+
+    combined["news_highlights"] = sections.get("news") or {}
+    return combined
+
+
+# --------------------
+# Section loaders
+# --------------------
+async def load_market_overview() -> Dict[str, Any]:
+    report = await generate_report_async()
+    market_data = report.get("market_data", {})
+    if not format_indices(market_data):
+        raise RuntimeError("Market overview data unavailable for all indices")
+    return report
+
+
+async def load_sector() -> Dict[str, Any]:
+    scraper = SectorDataScraper()
+    sector_data = await scraper.scrape_sector_data_async()
+    logger.debug(f"Received sector data for {len(sector_data)} sectors")
+    insights = await generate_sector_insights_async(sector_data)
+    return {"data": sector_data, "insights": insights}
+
+
+async def load_fii() -> Dict[str, Any]:
+    loaded: Dict[str, Any] = {}
+
+    async def on_reconciled(reconciled: Dict[str, Any]) -> None:
+        # Hedged mode: awaited on the event loop once every source finished
+        await store_reconciled_fii(loaded, reconciled)
+
+    scraper = FIIDataScraper()
+    institutional_data = await scraper.scrape_institutional_data_async(on_reconciled)
+    loaded["data"] = institutional_data
+    insights = await generate_institutional_insights_async(institutional_data)
+    return {"data": institutional_data, "insights": insights}
+
+
+async def store_reconciled_fii(loaded: Dict[str, Any], reconciled: Dict[str, Any]) -> None:
+    """
+    Replace the cached FII/DII section, built from the first source of a
+    hedged scrape, with the average over every source and insights
+    generated from that average
+    """
+    try:
+        insights = await generate_institutional_insights_async(reconciled)
+        # The load that returned the first source stores its snapshot first
+        load = snapshot_cache.in_flight("fii")
+        if load is not None:
+            await asyncio.gather(load, return_exceptions=True)
+        current = snapshot_cache.peek("fii")
+        if current is None or current.value["data"] is not loaded.get("data"):
+            logger.info("FII/DII section was replaced meanwhile, dropping reconciled data")
+            return
+        snapshot_cache.put("fii", {"data": reconciled, "insights": insights})
+        logger.info(f"Stored FII/DII section reconciled from {reconciled['source']}")
+    except Exception as e:
+        logger.error(f"Could not store reconciled FII/DII data: {str(e)}")
+
+
+async def load_top_performers() -> Dict[str, Any]:
+    scraper = TopPerformersScraper()
+    market_data = await run_in("browser", scraper.run_full_scrape)
+    if "error" in market_data:
+        raise RuntimeError(f"Top performers scrape failed: {market_data['error']}")
+    return market_data
+
+
+async def load_technical() -> Dict[str, Any]:
+    # Refreshed from the latest prices while the persisted history fetch is recent
+    return await get_market_technical_snapshot_async()
+
+
+async def load_indicators() -> Dict[str, Any]:
+    return await fetch_all_financial_indicators_async()
+
+
+async def load_news() -> Dict[str, Any]:
+    generator = NewsHighlightsGenerator()
+    news_data = await generator.get_news_highlights_async()
+    if not news_data or news_data.get("status") == "error":
+        raise RuntimeError("News highlights unavailable")
+    if "market_impact" in news_data:
+        news_data["news_impact"] = news_data.pop("market_impact")
+    return news_data
+
+
+async def collect_analysis_inputs() -> Dict[str, Any]:
+    """Fetch every analysis input section concurrently, tolerating individual failures"""
+
+    async def collect(section: str) -> Any:
+        try:
+            return (await get_section(section)).value
+        except Exception as e:
+            logger.error(f"Section '{section}' unavailable for analysis: {str(e)}")
+            return None
+
+    values = await asyncio.gather(*(collect(s) for s in ANALYSIS_INPUT_SECTIONS))
+    return dict(zip(ANALYSIS_INPUT_SECTIONS, values))
+
+
+async def load_analysis(inputs: Optional[Dict[str, Any]] = None) -> Dict[str, Any]:
+    """
+    Market analysis, then the summary and predictions built from it (which
+    do not depend on each other and run concurrently). `inputs` are the
+    section values to analyse, collected here when not given.
+    """
+    if inputs is None:
+        inputs = await collect_analysis_inputs()
+    combined_data = build_combined_data(inputs)
+    market_analyzer = MarketAnalysisGenerator()
+    market_analysis = await run_in(
+        "llm", market_analyzer.generate_market_analysis, combined_data
+    )
+    market_summary, market_predictions = await asyncio.gather(
+        run_in(
+            "llm",
+            market_analyzer.generate_market_summary,
+            combined_data,
+            market_analysis,
+        ),
+        run_in(
+            "llm",
+            market_analyzer.generate_market_prediction,
+            combined_data,
+            market_analysis,
+        ),
+    )
+    return {
+        "market_analysis": market_analysis,
+        "market_summary": market_summary,
+        "market_predictions": market_predictions,
+    }
+
+
+SECTION_LOADERS = {
+    "market_overview": load_market_overview,
+    "sector": load_sector,
+    "fii": load_fii,
+    "top_performers": load_top_performers,
+    "technical": load_technical,
+    "indicators": load_indicators,
+    "news": load_news,
+    "analysis": load_analysis,
+}
+
+
+# Background scheduler that keeps every section warm, started from main.py
+section_refresher = SectionRefresher(snapshot_cache, SECTION_LOADERS)
+
+
+async def get_section(section: str) -> Snapshot:
+    """
+    Return the cached snapshot for a section. Stale snapshots are returned
+    immediately while a refresh runs in the background.
+    """
+    if section not in SECTION_LOADERS:
+        raise KeyError(f"Unknown market section: {section}")
+    return await snapshot_cache.get_or_load(section, SECTION_LOADERS[section])
+
+
+async def get_analysis(inputs: Optional[Dict[str, Any]] = None) -> Snapshot:
+    """
+    Same as get_section("analysis"), but a load it starts is built from the
+    given, already collected, input section values
+    """
+    return await snapshot_cache.get_or_load("analysis", lambda: load_analysis(inputs))
+
+
+def comprehensive_graph() -> List[SectionNode]:
+    """
+    The comprehensive report as a dependency graph: the input sections run
+    concurrently, the analysis (and its summary and predictions) starts once
+    all of them have finished, from the values they produced. Every node's
+    value is the section snapshot.
+    """
+
+    def section_node(section: str) -> SectionNode:
+        return SectionNode(section, lambda inputs: get_section(section))
+
+    async def analysis(inputs: Dict[str, Optional[Snapshot]]) -> Snapshot:
+        return await get_analysis(
+            {name: snap.value if snap else None for name, snap in inputs.items()}
+        )
+
+    return [section_node(section) for section in ANALYSIS_INPUT_SECTIONS] + [
+        SectionNode("analysis", analysis, depends_on=ANALYSIS_INPUT_SECTIONS)
+    ]
+
+
+async def collect_comprehensive() -> Dict[str, NodeResult]:
+    """Run the comprehensive graph to completion, results by section"""
+    return {result.name: result async for result in run_graph(comprehensive_graph())}
+
+
+def snapshot_age(snapshot: Snapshot) -> float:
+    """Snapshot age in seconds, rounded for API responses"""
+    return round(snapshot.age, 1)
@@ -0,0 +1,199 @@
+import json
+import base64
+import logging
+from typing import Any, Dict, List, Optional, Tuple
+
+from bs4 import BeautifulSoup
+
+logger = logging.getLogger(__name__)
+
+# Keys under which JSON table payloads commonly keep their column names and rows
+HEADER_KEYS = ["tableHeaders", "headers", "columns", "column_names", "fields"]
+ROW_KEYS = ["tableData", "data", "rows", "results", "records"]
+
+# Keys tried, in order, when a table cell is an object rather than a plain value
+CELL_VALUE_KEYS = ["name", "title", "text", "display", "value", "label"]
+
+
+class CapturedTable:
+    """
+    Column headers plus rows (lists of cell text), decoded from a JSON response
+    or read from a page's table. `titles` optionally holds the full name shown
+    in the first cell of each row.
+    """
+
+    def __init__(
+        self,
+        url: str,
+        headers: List[str],
+        rows: List[List[str]],
+        titles: Optional[List[str]] = None,
+    ):
+        self.url = url
+        self.headers = headers
+        self.rows = rows
+        self.titles = titles
+
+    def records(self) -> List[Dict[str, str]]:
+        return [dict(zip(self.headers, row)) for row in self.rows]
+
+
+def _column_index(headers: List[str], aliases: Tuple[str, ...], used: set) -> Optional[int]:
+    """Index of the first unused header equal to an alias, else containing one"""
+    names = [header.strip().lower() for header in headers]
+    for alias in aliases:
+        for i, name in enumerate(names):
+            if i not in used and name == alias:
+                return i
+    for alias in aliases:
+        for i, name in enumerate(names):
+            if i not in used and alias in name:
+                return i
+    return None
+
+
+def align_columns(
+    table: CapturedTable, columns: List[Optional[Tuple[str, ...]]]
+) -> Optional[CapturedTable]:
+    """
+    Reorder a captured table's cells by header name into the positional
+    layout a DOM table parser expects. `columns` lists, per position, the
+    lower-case header names accepted there (None for a column the parser
+    ignores). Returns None when any named column has no matching header.
+    """
+    used: set = set()
+    indices: List[Optional[int]] = []
+    for aliases in columns:
+        if aliases is None:
+            indices.append(None)
+            continue
+        index = _column_index(table.headers, aliases, used)
+        if index is None:
+            logger.info(
+                f"Captured table from {table.url} has no {aliases[0]!r} column "
+                f"(headers {table.headers})"
+            )
+            return None
+        used.add(index)
+        indices.append(index)
+
+    rows = [
+        [row[i] if i is not None and i < len(row) else "" for i in indices]
+        for row in table.rows
+    ]
+    headers = [table.headers[i] if i is not None else "" for i in indices]
+    return CapturedTable(table.url, headers, rows, titles=table.titles)
+
+
+def drain_performance_log(driver) -> List[Dict]:
+    """Read (and clear) the DevTools events Chrome recorded for this driver"""
+    events = []
+    for entry in driver.get_log("performance"):
+        try:
+            events.append(json.loads(entry["message"])["message"])
+        except (KeyError, ValueError):
+            continue
+    return events
+
+
+def cell_text(value: Any) -> str:
+    """Plain text of a JSON table cell, which may hold HTML or a nested object"""
+    if value is None:
+        return ""
+    if isinstance(value, dict):
+        for key in CELL_VALUE_KEYS:
+            if key in value:
+                return cell_text(value[key])
+        return ""
+    if isinstance(value, str):
+        if "<" in value and ">" in value:
+            return BeautifulSoup(value, "html.parser").get_text(" ", strip=True)
+        return value.strip()
+    return str(value)
+
+
+def _header_name(header: Any) -> str:
+    if isinstance(header, dict):
+        return cell_text(header)
+    return str(header).strip()
+
+
+def find_tables(payload: Any, min_rows: int = 1) -> List[Tuple[List[str], List[List[str]]]]:
+    """
+    Find tabular data anywhere in a decoded JSON payload. Recognised shapes are
+    a list of objects sharing the same keys, and an object holding a header
+    list next to a list of row lists.
+    """
+    tables = []
+    if isinstance(payload, list):
+        if len(payload) >= min_rows and all(isinstance(row, dict) for row in payload):
+            headers = list(payload[0].keys())
+            if headers and all(set(row.keys()) == set(headers) for row in payload):
+                tables.append(
+                    (headers, [[cell_text(row[h]) for h in headers] for row in payload])
+                )
+                return tables
+        for item in payload:
+            tables.extend(find_tables(item, min_rows))
+    elif isinstance(payload, dict):
+        header_key = next((k for k in HEADER_KEYS if isinstance(payload.get(k), list)), None)
+        row_key = next((k for k in ROW_KEYS if isinstance(payload.get(k), list)), None)
+        if header_key and row_key:
+            headers = [_header_name(h) for h in payload[header_key]]
+            rows = [row for row in payload[row_key] if isinstance(row, list)]
+            if len(rows) >= min_rows and all(len(row) >= len(headers) for row in rows):
+                tables.append((headers, [[cell_text(c) for c in row] for row in rows]))
+                return tables
+        for value in payload.values():
+            tables.extend(find_tables(value, min_rows))
+    return tables
+
+
+class ResponseCollector:
+    """Accumulates the JSON responses a page loads, from DevTools network events"""
+
+    def __init__(self, url_filter: str):
+        self.url_filter = url_filter
+        self._responses: Dict[str, str] = {}  # requestId -> url
+        self._finished: List[str] = []
+        self._read = set()
+
+    def poll(self, driver) -> List[Tuple[str, Any]]:
+        """Return the JSON bodies of responses that finished since the last poll"""
+        for event in drain_performance_log(driver):
+            params = event.get("params", {})
+            if event.get("method") == "Network.responseReceived":
+                response = params.get("response", {})
+                url = response.get("url", "")
+                if "json" in response.get("mimeType", "") and self.url_filter in url:
+                    self._responses[params["requestId"]] = response["url"]
+            elif event.get("method") == "Network.loadingFinished":
+                self._finished.append(params.get("requestId"))
+
+        payloads = []
+        for request_id in self._finished:
+            if request_id not in self._responses or request_id in self._read:
+                continue
+            self._read.add(request_id)
+            try:
+                body = driver.execute_cdp_cmd(
+                    "Network.getResponseBody", {"requestId": request_id}
+                )
+                text = body["body"]
+                if body.get("base64Encoded"):
+                    text = base64.b64decode(text).decode("utf-8", errors="replace")
+                payloads.append((self._responses[request_id], json.loads(text)))
+            except Exception as e:
+                logger.debug(
+                    f"Could not read response body for {self._responses[request_id]}: {str(e)}"
+                )
+        return payloads
+
+    def find_table(self, driver, min_rows: int) -> Optional[CapturedTable]:
+        """The largest table found in the responses received so far"""
+        best = None
+        for url, payload in self.poll(driver):
+            for headers, rows in find_tables(payload, min_rows):
+                if best is None or len(rows) > len(best.rows):
+                    best = CapturedTable(url, headers, rows)
+        return best
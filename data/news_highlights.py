@@ -7,9 +7,6 @@ import os
 import asyncio
 import aiohttp
 from datetime import datetime
-from selenium import webdriver
-from selenium.webdriver.chrome.service import Service
-from selenium.webdriver.chrome.options import Options
 from selenium.webdriver.common.by import By
 from selenium.webdriver.support.ui import WebDriverWait
 from selenium.webdriver.support import expected_conditions as EC
@@ -19,7 +16,6 @@ from selenium.common.exceptions import (
     StaleElementReferenceException,
     WebDriverException,
 )
-from webdriver_manager.chrome import ChromeDriverManager
 import requests
 from bs4 import BeautifulSoup
 from typing import Dict, List, Optional
@@ -31,11 +27,28 @@ from urllib3.util.retry import Retry
 import google.generativeai as genai
 from dotenv import load_dotenv
 
+from data.article_cache import article_cache
+from data.article_fetcher import (
+    COMMON_CONTENT_SELECTORS,
+    MIN_CONTENT_CHARS,
+    article_fetcher,
+    article_text,
+)
+from data.browser_pool import browser_pool
+from data.executors import run_in
+from data.insight_batch import generate_insight_text
+from data.page_readiness import wait_until_ready
+
 # Load environment variables
 load_dotenv()
 
 # Setup Gemini API key
 GEMINI_API_KEY = os.getenv("GEMINI_API_KEY")
+
+# Opt-in: also read the body of every listed headline, fetching only articles
+# not seen before (the rest come from the article cache). Off by default, the
+# generator then lists headlines only, without any article download.
+NEWS_INCREMENTAL = os.getenv("NEWS_INCREMENTAL", "false").lower() in ("1", "true", "yes")
 # Set up logging with simpler format
 logging.basicConfig(
     level=logging.INFO,
@@ -52,9 +65,12 @@ logger = logging.getLogger(__name__)
 
 class FinancialNewsScraper:
     def __init__(self, headless=True, timeout=30):
-        """Initialize the scraper with browser options."""
+        """
+        Initialize the scraper. Browsers come from the shared pool, which is
+        always headless and applies its own page load timeout.
+        """
         self.timeout = timeout
-        self.setup_driver(headless)
+        self.driver = None  # Set while a pooled browser is leased
         self.site_selectors = {
             "cnbc": {
                 "container": "div.Card-standardBreakerCard, div.Card, div.SearchResult-searchResult",
@@ -79,103 +95,6 @@ class FinancialNewsScraper:
             },
         }
 
-    def setup_driver(self, headless):
-        """Set up the Chrome WebDriver with appropriate options."""
-        chrome_options = Options()
-        if headless:
-            chrome_options.add_argument("--headless=new")
-
-        # Optimize GPU and rendering settings
-        chrome_options.add_argument(
-            "--disable-gpu"
-        )  # Disable GPU hardware acceleration
-        chrome_options.add_argument(
-            "--disable-software-rasterizer"
-        )  # Disable software rasterizer
-        chrome_options.add_argument(
-            "--disable-dev-shm-usage"
-        )  # Overcome limited resource problems
-        chrome_options.add_argument("--no-sandbox")  # Bypass OS security model
-        chrome_options.add_argument("--disable-web-security")  # Disable web security
-        chrome_options.add_argument(
-            "--disable-features=IsolateOrigins,site-per-process"
-        )  # Disable site isolation
-        chrome_options.add_argument(
-            "--disable-site-isolation-trials"
-        )  # Disable site isolation trials
-        chrome_options.add_argument("--disable-webgl")  # Disable WebGL
-        chrome_options.add_argument("--disable-webgl2")  # Disable WebGL 2.0
-        chrome_options.add_argument("--disable-gpu-sandbox")  # Disable GPU sandbox
-        chrome_options.add_argument(
-            "--disable-software-rasterizer"
-        )  # Disable software rasterizer
-        chrome_options.add_argument(
-            "--disable-dev-shm-usage"
-        )  # Overcome limited resource problems
-        chrome_options.add_argument("--no-first-run")  # Skip first run tasks
-        chrome_options.add_argument(
-            "--no-default-browser-check"
-        )  # Skip default browser check
-        chrome_options.add_argument(
-            "--disable-background-networking"
-        )  # Disable background networking
-        chrome_options.add_argument(
-            "--disable-background-timer-throttling"
-        )  # Disable background timer throttling
-        chrome_options.add_argument(
-            "--disable-backgrounding-occluded-windows"
-        )  # Disable backgrounding of occluded windows
-        chrome_options.add_argument("--disable-breakpad")  # Disable crash reporting
-        chrome_options.add_argument(
-            "--disable-component-extensions-with-background-pages"
-        )  # Disable component extensions with background pages
-        chrome_options.add_argument("--disable-extensions")  # Disable extensions
-        chrome_options.add_argument(
-            "--disable-features=TranslateUI"
-        )  # Disable translate UI
-        chrome_options.add_argument(
-            "--disable-ipc-flooding-protection"
-        )  # Disable IPC flooding protection
-        chrome_options.add_argument(
-            "--disable-renderer-backgrounding"
-        )  # Disable renderer backgrounding
-        chrome_options.add_argument(
-            "--enable-features=NetworkService,NetworkServiceInProcess"
-        )  # Enable network service
-        chrome_options.add_argument("--force-color-profile=srgb")  # Force color profile
-        chrome_options.add_argument("--metrics-recording-only")  # Only record metrics
-        chrome_options.add_argument("--mute-audio")  # Mute audio
-        chrome_options.add_argument("--window-size=1920,1080")  # Set window size
-        chrome_options.add_argument("--disable-notifications")  # Disable notifications
-        chrome_options.add_argument(
-            "--disable-popup-blocking"
-        )  # Disable popup blocking
-        chrome_options.add_argument(
-            "--ignore-certificate-errors"
-        )  # Ignore certificate errors
-        chrome_options.add_argument(
-            "--allow-running-insecure-content"
-        )  # Allow running insecure content
-        chrome_options.add_argument(
-            "--disable-blink-features=AutomationControlled"
-        )  # Disable automation control
-        chrome_options.add_argument("--disable-shared-images")  # Disable shared images
-        chrome_options.add_argument(
-            "--user-agent=Mozilla/5.0 (Windows NT 10.0; Win64; x64) AppleWebKit/537.36 (KHTML, like Gecko) Chrome/120.0.0.0 Safari/537.36"
-        )
-
-        try:
-            # Use ChromeDriverManager with specific version
-            service = Service(ChromeDriverManager().install())
-            self.driver = webdriver.Chrome(service=service, options=chrome_options)
-            self.driver.set_page_load_timeout(self.timeout)
-            self.driver.set_script_timeout(self.timeout)
-            logger.info("WebDriver initiated successfully")
-        except Exception as e:
-            logger.error(f"Error setting up WebDriver: {e}")
-            logger.error(traceback.format_exc())
-            raise
-
     def get_site_config(self, url):
         """Determine which site configuration to use based on URL."""
         if "cnbc.com" in url:
@@ -316,6 +235,15 @@ class FinancialNewsScraper:
         """
         Scrape titles from the listing page, then visit each article to extract content.
         """
+        with browser_pool.lease() as driver:
+            self.driver = driver
+            try:
+                return self._scrape_articles(url, num_articles)
+            finally:
+                self.driver = None
+
+    def _scrape_articles(self, url, num_articles):
+        """Scrape articles using the currently leased browser."""
         articles = []
         site_config = self.get_site_config(url)
         site_name = self.get_source_name_from_url(url)
@@ -344,43 +272,23 @@ class FinancialNewsScraper:
 
             logger.info(f"Found {len(article_data)} article links on {site_name}")
 
-            # Now visit each article to get the full content
-            for data in article_data:
-                try:
-                    # Visit the article page
-                    self.driver.get(data["link"])
-                    logger.info(f"Visiting article: {data['title'][:30]}...")
-
-                    # Wait for content to load (up to 10 seconds)
-                    time.sleep(2)
+            summaries = self.article_summaries(article_data)
 
-                    # Extract the full article content
-                    content = self.extract_article_content(site_config)
-
-                    # Generate a meaningful summary from the content
-                    summary = self.generate_content_summary(content)
-
-                    if summary and summary != "No content available":
-                        # We'll replace the title with our content summary
-                        # This maintains compatibility with the existing code structure
-                        articles.append(
-                            {
-                                "title": summary,  # Use the content summary as the title
-                                "source": site_name,
-                            }
-                        )
-                    else:
-                        # Fallback to using the original title
-                        articles.append({"title": data["title"], "source": site_name})
-
-                except Exception as e:
-                    logger.error(f"Error processing article {data['title'][:30]}: {e}")
-                    # Add with original title if content extraction failed
+            for data in article_data:
+                summary = summaries.get(data["link"])
+                if summary and summary != "No content available":
+                    # We'll replace the title with our content summary
+                    # This maintains compatibility with the existing code structure
+                    articles.append(
+                        {
+                            "title": summary,  # Use the content summary as the title
+                            "source": site_name,
+                        }
+                    )
+                else:
+                    # Fallback to using the original title
                     articles.append({"title": data["title"], "source": site_name})
 
-                # Brief pause between article visits
-                time.sleep(1)
-
             logger.info(
                 f"Successfully processed {len(articles)} articles from {site_name}"
             )
@@ -391,9 +299,67 @@ class FinancialNewsScraper:
             logger.error(traceback.format_exc())
             return articles
 
+    def article_summaries(self, article_data, use_browser=True):
+        """
+        Content summary of each article link, None where none could be made.
+
+        Articles read before come from the article cache; the others are
+        downloaded concurrently and read from their static HTML. With
+        `use_browser` (while a pooled browser is leased), the ones that do
+        not parse are opened in the browser.
+        """
+        summaries = {}
+        unseen = []
+        for data in article_data:
+            entry = article_cache.get(data["link"])
+            if entry is None:
+                unseen.append(data)
+            else:
+                summaries[data["link"]] = entry["summary"]
+
+        logger.info(
+            f"{len(summaries)} articles from cache, fetching {len(unseen)} unseen"
+        )
+
+        # Download the article pages concurrently and read them from the
+        # static HTML; only the ones that do not parse are opened in the browser
+        pages = article_fetcher.fetch_pages([data["link"] for data in unseen])
+
+        for data in unseen:
+            try:
+                site_config = self.get_site_config(data["link"])
+                html = pages.get(data["link"])
+                content = article_text(html, site_config) if html else None
+                article_fetcher.record_parse(content is not None)
+                if content is None and use_browser:
+                    content = self.fetch_article_content_with_browser(
+                        data, site_config
+                    )
+                if not content or content == "No content available":
+                    continue
+
+                # Generate a meaningful summary from the content
+                summary = self.generate_content_summary(content)
+                article_cache.put(data["link"], content, summary)
+                summaries[data["link"]] = summary
+            except Exception as e:
+                logger.error(f"Error processing article {data['title'][:30]}: {e}")
+
+        article_cache.save()
+        return summaries
+
+    def fetch_article_content_with_browser(self, data, site_config):
+        """Open an article in the leased browser and extract its content."""
+        self.driver.get(data["link"])
+        logger.info(f"Visiting article in browser: {data['title'][:30]}...")
+
+        # Wait for the article body to load (up to 10 seconds)
+        wait_until_ready(self.driver, self.get_readiness_site(data["link"]))
+        return self.extract_article_content(site_config)
+
     async def scrape_articles_async(self, url, num_articles=15):
         """Async version of scrape_articles"""
-        return await asyncio.to_thread(self.scrape_articles, url, num_articles)
+        return await run_in("browser", self.scrape_articles, url, num_articles)
 
     def extract_article_content(self, site_config):
         """Extract the full content text from an article page."""
@@ -407,28 +373,17 @@ class FinancialNewsScraper:
                         By.CSS_SELECTOR, selector
                     )
                     content = content_element.text
-                    if content and len(content) > 200:  # We got substantial content
+                    if content and len(content) > MIN_CONTENT_CHARS:
                         return content
                 except:
                     continue
 
             # Try common content selectors if site-specific ones failed
-            common_selectors = [
-                "article",
-                "main",
-                "div.article-body",
-                "div.content",
-                "div.article-content",
-                "div.story-body",
-                ".post-content",
-                "div[itemprop='articleBody']",
-            ]
-
-            for selector in common_selectors:
+            for selector in COMMON_CONTENT_SELECTORS:
                 try:
                     element = self.driver.find_element(By.CSS_SELECTOR, selector)
                     content = element.text
-                    if content and len(content) > 200:
+                    if content and len(content) > MIN_CONTENT_CHARS:
                         return content
                 except:
                     continue
@@ -517,6 +472,15 @@ class FinancialNewsScraper:
             logger.error(f"Error generating content summary: {e}")
             return None
 
+    def get_readiness_site(self, url):
+        """Readiness spec name for an article page."""
+        if "cnbc.com" in url:
+            return "cnbc_article"
+        elif "financialexpress.com" in url:
+            return "financial_express_article"
+        else:
+            return "default_article"
+
     def get_source_name_from_url(self, url):
         """Extract a readable source name from URL."""
         if "cnbc.com" in url:
@@ -527,13 +491,8 @@ class FinancialNewsScraper:
             return "Unknown Source"
 
     def close(self):
-        """Close the WebDriver session."""
-        if hasattr(self, "driver"):
-            try:
-                self.driver.quit()
-                logger.info("WebDriver session closed")
-            except Exception as e:
-                logger.error(f"Error closing WebDriver: {e}")
+        """Nothing to close, pooled browsers are returned after every scrape."""
+        self.driver = None
 
 
 class SimpleNewsClassifier:
@@ -661,12 +620,17 @@ class SimpleNewsClassifier:
 
     async def categorize_news_async(self, articles):
         """Async version of categorize_news"""
-        return await asyncio.to_thread(self.categorize_news, articles)
+        return await run_in("http", self.categorize_news, articles)
 
 
 class NewsHighlightsGenerator:
-    def __init__(self):
-        """Initialize the news highlights generator."""
+    def __init__(self, incremental=NEWS_INCREMENTAL):
+        """
+        Initialize the news highlights generator. In incremental mode each
+        headline is annotated with a summary of its article, downloading only
+        the articles that are not in the article cache yet.
+        """
+        self.incremental = incremental
         self.scraper = FinancialNewsScraper(headless=True, timeout=45)
         self.classifier = SimpleNewsClassifier()
 
@@ -722,7 +686,9 @@ class NewsHighlightsGenerator:
             # Format articles for the prompt
             articles_text = "\n".join(
                 [
-                    f"- {article['title']} (Source: {article['source']})"
+                    f"- {article['title']}"
+                    + (f": {article['summary']}" if article.get("summary") else "")
+                    + f" (Source: {article['source']})"
                     for article in articles
                 ]
             )
@@ -754,8 +720,7 @@ class NewsHighlightsGenerator:
             [6-7 bullet points about global news]
             """
 
-            response = self.gemini_model.generate_content(prompt)
-            analysis = response.text.strip()
+            analysis = generate_insight_text("news", prompt).strip()
 
             # Parse the response into sections
             sections = {"news_impact": [], "india_news": [], "global_news": []}
@@ -783,7 +748,22 @@ class NewsHighlightsGenerator:
 
     async def analyze_news_with_gemini_async(self, articles):
         """Async version of analyze_news_with_gemini"""
-        return await asyncio.to_thread(self.analyze_news_with_gemini, articles)
+        return await run_in("llm", self.analyze_news_with_gemini, articles)
+
+    def add_article_summaries(self, articles):
+        """Annotate headlines with their article summaries in incremental mode."""
+        if not self.incremental or not articles:
+            return articles
+        summaries = self.scraper.article_summaries(articles, use_browser=False)
+        for article in articles:
+            summary = summaries.get(article["link"])
+            if summary:
+                article["summary"] = summary
+        return articles
+
+    async def add_article_summaries_async(self, articles):
+        """Async version of add_article_summaries"""
+        return await run_in("http", self.add_article_summaries, articles)
 
     def get_news_highlights(self) -> Dict:
         """Get news highlights from multiple sources with Gemini-powered analysis."""
@@ -794,6 +774,7 @@ class NewsHighlightsGenerator:
 
             # Combine all articles
             all_articles = cnbc_articles + financial_express_articles
+            self.add_article_summaries(all_articles)
 
             # Get Gemini analysis
             analysis = self.analyze_news_with_gemini(all_articles)
@@ -848,6 +829,7 @@ class NewsHighlightsGenerator:
 
             # Combine all articles
             all_articles = cnbc_articles + financial_express_articles
+            await self.add_article_summaries_async(all_articles)
 
             # Get Gemini analysis asynchronously
             analysis = await self.analyze_news_with_gemini_async(all_articles)
@@ -924,7 +906,7 @@ class NewsHighlightsGenerator:
 
     async def scrape_cnbc_async(self) -> List[Dict]:
         """Async version of scrape_cnbc"""
-        return await asyncio.to_thread(self.scrape_cnbc)
+        return await run_in("http", self.scrape_cnbc)
 
     def scrape_financial_express(self) -> List[Dict]:
         """Scrape Financial Express for market news with improved error handling"""
@@ -1007,7 +989,7 @@ class NewsHighlightsGenerator:
 
     async def scrape_financial_express_async(self) -> List[Dict]:
         """Async version of scrape_financial_express"""
-        return await asyncio.to_thread(self.scrape_financial_express)
+        return await run_in("http", self.scrape_financial_express)
 
     def _get_with_retry(
         self, url: str, max_retries: int = 3
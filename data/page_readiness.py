@@ -0,0 +1,105 @@
+import os
+import time
+import logging
+import threading
+from collections import deque
+from typing import Dict
+
+from selenium.common.exceptions import TimeoutException
+from selenium.webdriver.common.by import By
+from selenium.webdriver.support.ui import WebDriverWait
+
+logger = logging.getLogger(__name__)
+
+# Number of recent time-to-ready samples kept per site
+READINESS_SAMPLES = 200
+
+
+class ReadinessSpec:
+    """When a page counts as loaded: `min_count` matches of `selector`, or `timeout` seconds"""
+
+    def __init__(self, selector: str, min_count: int = 1, timeout: float = 15):
+        self.selector = selector
+        self.min_count = min_count
+        self.timeout = timeout
+
+
+# Readiness per scraped page. Each timeout can be overridden with
+# READINESS_TIMEOUT_<SITE>, e.g. READINESS_TIMEOUT_TRENDLYNE_SECTOR=10
+READINESS_SPECS = {
+    "trendlyne_sector": ReadinessSpec("table tbody tr", min_count=5, timeout=20),
+    "moneycontrol_fii": ReadinessSpec(
+        ".mctable1 tr, table.mctable tr, #fii-dii-table tr, .data-table tr",
+        min_count=3,
+        timeout=20,
+    ),
+    "trendlyne_fii": ReadinessSpec("table tbody tr", min_count=1, timeout=20),
+    "trendlyne_top_performers": ReadinessSpec(
+        "table.table tbody tr", min_count=5, timeout=25
+    ),
+    "cnbc_article": ReadinessSpec(
+        "div.ArticleBody-articleBody, div.group, div.ArticleBody-wrapper", timeout=10
+    ),
+    "financial_express_article": ReadinessSpec(
+        "div.main-cont-left, div.article-content, div.custom-post-content", timeout=10
+    ),
+    "default_article": ReadinessSpec(
+        "article, div.article-body, div.content, div.article-content, div.story-content",
+        timeout=10,
+    ),
+}
+
+for _site, _spec in READINESS_SPECS.items():
+    _spec.timeout = float(os.getenv(f"READINESS_TIMEOUT_{_site.upper()}", _spec.timeout))
+
+_lock = threading.Lock()
+_samples: Dict[str, deque] = {}
+_timeouts: Dict[str, int] = {}
+
+
+def wait_until_ready(driver, site: str) -> bool:
+    """
+    Block until the page loaded in `driver` matches the readiness spec of
+    `site`, and record how long that took. Returns False when the spec was
+    not met within its timeout; the caller still parses whatever loaded.
+    """
+    spec = READINESS_SPECS[site]
+    start = time.monotonic()
+    try:
+        WebDriverWait(driver, spec.timeout, poll_frequency=0.2).until(
+            lambda d: len(d.find_elements(By.CSS_SELECTOR, spec.selector))
+            >= spec.min_count
+        )
+        ready = True
+    except TimeoutException:
+        ready = False
+        logger.warning(
+            f"Page for '{site}' not ready after {spec.timeout:.0f}s "
+            f"(waiting for {spec.min_count} x '{spec.selector}')"
+        )
+    elapsed = time.monotonic() - start
+
+    with _lock:
+        _samples.setdefault(site, deque(maxlen=READINESS_SAMPLES)).append(elapsed)
+        if not ready:
+            _timeouts[site] = _timeouts.get(site, 0) + 1
+    logger.debug(f"Page for '{site}' ready in {elapsed:.2f}s")
+    return ready
+
+
+def readiness_stats() -> Dict[str, Dict]:
+    """Observed time-to-ready per site, for tuning the timeouts"""
+    with _lock:
+        stats = {}
+        for site, samples in _samples.items():
+            ordered = sorted(samples)
+            stats[site] = {
+                "samples": len(ordered),
+                "timeouts": _timeouts.get(site, 0),
+                "timeout_seconds": READINESS_SPECS[site].timeout,
+                "min_seconds": round(ordered[0], 2),
+                "median_seconds": round(ordered[len(ordered) // 2], 2),
+                "p95_seconds": round(ordered[int(0.95 * (len(ordered) - 1))], 2),
+                "max_seconds": round(ordered[-1], 2),
+            }
+        return stats
@@ -0,0 +1,207 @@
+import os
+import json
+import logging
+import threading
+from typing import Dict, List
+from urllib.parse import urlparse
+
+logger = logging.getLogger(__name__)
+
+# Set RESOURCE_BLOCKING_ENABLED=false to load pages with every subresource
+RESOURCE_BLOCKING_ENABLED = os.getenv(
+    "RESOURCE_BLOCKING_ENABLED", "true"
+).lower() not in ("0", "false", "no")
+
+# Ad, analytics and tracking hosts the finance portals pull in. Replace the
+# list with BLOCKED_DOMAINS (comma separated), or extend it with
+# EXTRA_BLOCKED_DOMAINS
+DEFAULT_BLOCKED_DOMAINS = [
+    "doubleclick.net",
+    "googlesyndication.com",
+    "googleadservices.com",
+    "google-analytics.com",
+    "googletagmanager.com",
+    "googletagservices.com",
+    "adservice.google.com",
+    "amazon-adsystem.com",
+    "facebook.net",
+    "facebook.com",
+    "connect.facebook.net",
+    "twitter.com",
+    "platform.twitter.com",
+    "scorecardresearch.com",
+    "quantserve.com",
+    "taboola.com",
+    "outbrain.com",
+    "criteo.com",
+    "criteo.net",
+    "pubmatic.com",
+    "rubiconproject.com",
+    "adnxs.com",
+    "moatads.com",
+    "chartbeat.com",
+    "hotjar.com",
+    "clarity.ms",
+    "izooto.com",
+    "onesignal.com",
+    "vdo.ai",
+]
+
+
+def _domain_list(value: str) -> List[str]:
+    return [domain.strip() for domain in value.split(",") if domain.strip()]
+
+
+BLOCKED_DOMAINS = _domain_list(
+    os.getenv("BLOCKED_DOMAINS", ",".join(DEFAULT_BLOCKED_DOMAINS))
+) + _domain_list(os.getenv("EXTRA_BLOCKED_DOMAINS", ""))
+
+# File types never read by the scrapers: images, fonts and stylesheets
+BLOCKED_EXTENSIONS = [
+    "png",
+    "jpg",
+    "jpeg",
+    "gif",
+    "webp",
+    "avif",
+    "svg",
+    "ico",
+    "woff",
+    "woff2",
+    "ttf",
+    "otf",
+    "eot",
+    "css",
+    "mp4",
+    "webm",
+]
+
+# Chrome content settings: 2 = block. Images blocked this way are never
+# requested, so they do not show up in the blocked request counts below
+BLOCKING_PREFS = {
+    "profile.managed_default_content_settings.images": 2,
+    "profile.managed_default_content_settings.stylesheets": 2,
+    "profile.managed_default_content_settings.media_stream": 2,
+    "profile.default_content_setting_values.notifications": 2,
+    "profile.default_content_setting_values.geolocation": 2,
+    "profile.default_content_setting_values.popups": 2,
+}
+
+# Typical transfer size per blocked resource type, in KB, used to estimate
+# the bytes a blocked request would have cost
+RESOURCE_SIZE_ESTIMATES_KB = {
+    "Image": 40,
+    "Font": 35,
+    "Stylesheet": 25,
+    "Script": 60,
+    "Media": 200,
+    "XHR": 5,
+    "Fetch": 5,
+    "Other": 10,
+}
+
+
+def blocked_url_patterns() -> List[str]:
+    """URL patterns for the DevTools Network.setBlockedURLs command"""
+    patterns = [f"*.{extension}" for extension in BLOCKED_EXTENSIONS]
+    patterns += [f"*.{extension}?*" for extension in BLOCKED_EXTENSIONS]
+    patterns += [f"*{domain}/*" for domain in BLOCKED_DOMAINS]
+    return patterns
+
+
+def apply_blocking_prefs(chrome_options) -> None:
+    """Add the content-setting prefs that stop Chrome from loading images and the like"""
+    if RESOURCE_BLOCKING_ENABLED:
+        chrome_options.add_experimental_option("prefs", BLOCKING_PREFS)
+
+
+def enable_url_blocking(driver) -> None:
+    """Block images, fonts, stylesheets and tracker hosts for every page `driver` loads"""
+    if not RESOURCE_BLOCKING_ENABLED:
+        return
+    try:
+        driver.execute_cdp_cmd("Network.enable", {})
+        driver.execute_cdp_cmd("Network.setBlockedURLs", {"urls": blocked_url_patterns()})
+    except Exception as e:
+        logger.warning(f"Could not enable URL blocking: {str(e)}")
+
+
+class PageTraffic:
+    """Requests loaded and blocked during one page load, from DevTools network events"""
+
+    def __init__(self, url: str):
+        self.host = urlparse(url).netloc or url
+        self.requests = 0
+        self.blocked = 0
+        self.bytes_loaded = 0
+        self.estimated_bytes_saved = 0
+
+    def observe(self, entries: List[Dict]) -> None:
+        """Count the events in raw performance log entries"""
+        for entry in entries:
+            try:
+                event = json.loads(entry["message"])["message"]
+            except (KeyError, ValueError):
+                continue
+            method = event.get("method")
+            params = event.get("params", {})
+            if method == "Network.requestWillBeSent":
+                self.requests += 1
+            elif method == "Network.loadingFinished":
+                self.bytes_loaded += int(params.get("encodedDataLength", 0))
+            elif method == "Network.loadingFailed" and params.get("blockedReason"):
+                self.blocked += 1
+                size_kb = RESOURCE_SIZE_ESTIMATES_KB.get(
+                    params.get("type", "Other"), RESOURCE_SIZE_ESTIMATES_KB["Other"]
+                )
+                self.estimated_bytes_saved += size_kb * 1024
+
+
+_lock = threading.Lock()
+_totals: Dict[str, Dict[str, int]] = {}
+
+
+def record_page(traffic: PageTraffic) -> None:
+    """Add a finished page load to the per-host totals"""
+    with _lock:
+        totals = _totals.setdefault(
+            traffic.host,
+            {
+                "pages": 0,
+                "requests": 0,
+                "blocked": 0,
+                "bytes_loaded": 0,
+                "estimated_bytes_saved": 0,
+            },
+        )
+        totals["pages"] += 1
+        totals["requests"] += traffic.requests
+        totals["blocked"] += traffic.blocked
+        totals["bytes_loaded"] += traffic.bytes_loaded
+        totals["estimated_bytes_saved"] += traffic.estimated_bytes_saved
+    logger.debug(
+        f"Page on {traffic.host}: {traffic.requests} requests, {traffic.blocked} blocked, "
+        f"{traffic.bytes_loaded / 1024:.0f} KB loaded, "
+        f"~{traffic.estimated_bytes_saved / 1024:.0f} KB saved"
+    )
+
+
+def blocking_stats() -> Dict:
+    """Per-host averages of requests and bytes loaded and saved per page load"""
+    with _lock:
+        hosts = {}
+        for host, totals in _totals.items():
+            pages = totals["pages"]
+            hosts[host] = {
+                **totals,
+                "blocked_per_page": round(totals["blocked"] / pages, 1),
+                "kb_loaded_per_page": round(totals["bytes_loaded"] / pages / 1024, 1),
+                "estimated_kb_saved_per_page": round(
+                    totals["estimated_bytes_saved"] / pages / 1024, 1
+                ),
+            }
+    return {
+        "enabled": RESOURCE_BLOCKING_ENABLED,
+        "blocked_domains": len(BLOCKED_DOMAINS),
+        "hosts": hosts,
+    }
@@ -0,0 +1,321 @@
+import os
+import time
+import logging
+import threading
+from typing import Any, Callable, Dict, List, Optional, Tuple
+
+from data.network_capture import CapturedTable, align_columns
+from data.tiered_fetcher import BROWSER_TIER, FetchResult, tiered_fetcher
+
+logger = logging.getLogger(__name__)
+
+# A scraped page is fetched at most once per cycle; everything that asks for
+# it within the cycle gets the rows parsed from that one fetch
+SCRAPE_CYCLE_SECONDS = float(os.getenv("SCRAPE_CYCLE_SECONDS", 300))
+
+# A fetch that parsed no rows is only shared this long, so one transient
+# failure does not blank the data for a whole cycle
+SCRAPE_EMPTY_RETRY_SECONDS = float(os.getenv("SCRAPE_EMPTY_RETRY_SECONDS", 30))
+
+STANDARD_SECTORS = [
+    "Information Technology",
+    "Banking & Financial Services",
+    "Pharmaceuticals & Healthcare",
+    "Energy",
+    "FMCG",
+    "Automobiles",
+    "Realty",
+    "Infrastructure",
+    "Metals and Mining",
+    "Telecom",
+    "Agriculture and Chemicals",
+]
+
+
+def map_to_standard_sector(sector_name: str) -> str:
+    """Map scraped sector names to standard sector names"""
+    sector_name = sector_name.lower()
+    if any(term in sector_name for term in ["it", "software", "tech", "information"]):
+        return "Information Technology"
+    elif any(term in sector_name for term in ["bank", "finance", "financial", "nbfc"]):
+        return "Banking & Financial Services"
+    elif any(term in sector_name for term in ["pharma", "health", "medical", "drug"]):
+        return "Pharmaceuticals & Healthcare"
+    elif any(
+        term in sector_name for term in ["energy", "oil", "gas", "petrol", "power"]
+    ):
+        return "Energy"
+    elif any(term in sector_name for term in ["fmcg", "consumer goods"]):
+        return "FMCG"
+    elif any(term in sector_name for term in ["auto", "automobile", "vehicle"]):
+        return "Automobiles"
+    elif any(term in sector_name for term in ["real estate", "realty", "property"]):
+        return "Realty"
+    elif any(term in sector_name for term in ["infra", "construction", "cement"]):
+        return "Infrastructure"
+    elif any(term in sector_name for term in ["metal", "steel", "mining", "mineral"]):
+        return "Metals and Mining"
+    elif any(term in sector_name for term in ["telecom", "communication"]):
+        return "Telecom"
+    elif any(term in sector_name for term in ["agri", "chemical", "fertilizer"]):
+        return "Agriculture and Chemicals"
+    # If no mapping found, return the original name
+    return sector_name.title()
+
+
+# --------------------
+# Row parsers. Each gets the page's candidate tables in order of preference
+# (a table captured from the page's JSON first, then the tables matching the
+# site's selectors) and returns the parsed data, or an empty value.
+# --------------------
+# Header names of the Trendlyne sector columns, in the order
+# parse_trendlyne_sectors reads them
+TRENDLYNE_SECTOR_COLUMNS = [
+    ("sector", "sector name", "name"),
+    ("day change %", "change %", "day change", "change"),
+    None,
+    ("advances", "advance"),
+    ("declines", "decline"),
+]
+
+
+def parse_trendlyne_sectors(tables: List[CapturedTable]) -> List[Dict[str, Any]]:
+    """Sector rows: name, change %, (unused), advances, declines"""
+    for table in tables:
+        sector_dict = {}
+        for cells in table.rows:
+            if len(cells) < 5:
+                continue
+            try:
+                mapped_sector = map_to_standard_sector(cells[0].strip())
+                change_pct = float(cells[1].strip().replace("%", ""))
+                advances = int(cells[3].strip())
+                declines = int(cells[4].strip())
+            except Exception as e:
+                logger.error(f"Error parsing Trendlyne row: {str(e)}")
+                continue
+            sector_dict[mapped_sector] = {
+                "sector_name": mapped_sector,
+                "num_companies": advances + declines,
+                "advances": advances,
+                "declines": declines,
+                "change_percentage": change_pct,
+                "source": "Trendlyne",
+            }
+        if sector_dict:
+            return list(sector_dict.values())
+    return []
+
+
+def _numeric_cells(cells: List[str]) -> List[float]:
+    values = []
+    for cell in cells:
+        text = cell.replace(",", "").replace("INR", "")
+        try:
+            values.append(float(text))
+        except ValueError:
+            pass
+    return values
+
+
+def _institutional_entry(values: List[float], source: str) -> Dict[str, Any]:
+    """FII buy/sell/net followed by DII buy/sell/net"""
+    return {
+        "fii": {"buy_value": values[0], "sell_value": values[1], "net_value": values[2]},
+        "dii": {"buy_value": values[3], "sell_value": values[4], "net_value": values[5]},
+        "source": source,
+    }
+
+
+def parse_moneycontrol_institutional(tables: List[CapturedTable]) -> Optional[Dict]:
+    """Latest FII/DII day from the first or second row after the header"""
+    for table in tables:
+        for cells in table.rows[1:3]:
+            if len(cells) < 6:
+                continue
+            values = _numeric_cells(cells)
+            if len(values) >= 6:
+                return _institutional_entry(values, "MoneyControl")
+    return None
+
+
+def parse_trendlyne_institutional(tables: List[CapturedTable]) -> Optional[Dict]:
+    """Latest FII/DII day from the first data row (second row when there are several)"""
+    for table in tables:
+        if not table.rows:
+            continue
+        target_row = table.rows[1] if len(table.rows) > 1 else table.rows[0]
+        values = _numeric_cells(target_row)
+        if len(values) >= 6:
+            return _institutional_entry(values, "Trendlyne")
+    return None
+
+
+class TableSite:
+    """
+    A scraped page: its URL, the candidate tables to read (most specific
+    selector first) and the parser turning their rows into data. The page
+    counts as loaded per READINESS_SPECS[name].
+
+    The parsers read cells by position, so a JSON response captured with
+    `url_filter` is only used when its headers map onto `columns` (see
+    data.network_capture.align_columns); otherwise the page's table is read.
+    """
+
+    def __init__(
+        self,
+        name: str,
+        url: str,
+        selectors: List[str],
+        parse: Callable[[List[CapturedTable]], Any],
+        body_rows: bool = True,
+        with_titles: bool = False,
+        url_filter: Optional[str] = None,
+        columns: Optional[List[Optional[Tuple[str, ...]]]] = None,
+    ):
+        if url_filter is not None and columns is None:
+            raise ValueError(f"Site '{name}' captures JSON but declares no columns")
+        self.name = name
+        self.url = url
+        self.selectors = selectors
+        self.parse = parse
+        self.body_rows = body_rows
+        self.with_titles = with_titles
+        self.url_filter = url_filter
+        self.columns = columns
+
+    def align_captured(self, table: CapturedTable) -> Optional[CapturedTable]:
+        """A captured table in the parser's column order, or None when its headers do not match"""
+        return align_columns(table, self.columns)
+
+    def candidate_tables(self, result: FetchResult) -> List[CapturedTable]:
+        tables = [result.table] if result.table is not None else []
+        tables += [result.tables[s] for s in self.selectors if s in result.tables]
+        return tables
+
+
+# Every page the table scrapers read
+SITES = [
+    TableSite(
+        "trendlyne_sector",
+        "https://trendlyne.com/equity/sector-industry-analysis/sector/day/",
+        [
+            ".table-responsive table",
+            ".dataTables_wrapper table",
+            ".table",
+            "#sectors-table",
+        ],
+        parse_trendlyne_sectors,
+        url_filter="trendlyne.com",
+        columns=TRENDLYNE_SECTOR_COLUMNS,
+    ),
+    TableSite(
+        "moneycontrol_fii",
+        "https://www.moneycontrol.com/stocks/marketstats/fii_dii_activity/index.php",
+        [".mctable1", "table.mctable", "#fii-dii-table", ".data-table"],
+        parse_moneycontrol_institutional,
+        body_rows=False,  # Header row included, the data rows follow it
+    ),
+    TableSite(
+        "trendlyne_fii",
+        "https://trendlyne.com/macro-data/fii-dii/latest/cash-pastmonth/",
+        [".table", ".data-table", "#fii-dii-data", ".table-responsive table"],
+        parse_trendlyne_institutional,
+    ),
+]
+
+
+class ScrapeEngine:
+    """
+    Fetches and parses the registered sites. A page is fetched at most once
+    per `cycle` seconds (`empty_retry` seconds when it parsed no rows);
+    concurrent callers wait for the fetch in progress and every caller
+    within the cycle shares its parsed rows.
+    """
+
+    def __init__(
+        self,
+        sites: List[TableSite],
+        cycle: float = SCRAPE_CYCLE_SECONDS,
+        empty_retry: float = SCRAPE_EMPTY_RETRY_SECONDS,
+    ):
+        self.sites = {site.name: site for site in sites}
+        self.cycle = cycle
+        self.empty_retry = empty_retry
+        self._lock = threading.Lock()
+        self._site_locks = {name: threading.Lock() for name in self.sites}
+        self._pages: Dict[str, Dict[str, Any]] = {}
+        self._stats = {
+            name: {"fetches": 0, "shared": 0, "empty": 0, "errors": 0} for name in self.sites
+        }
+
+    def _fetch(self, site: TableSite) -> Dict[str, Any]:
+        start = time.monotonic()
+        result = tiered_fetcher.fetch_tables(
+            site.url,
+            site.name,
+            site.selectors,
+            body_rows=site.body_rows,
+            with_titles=site.with_titles,
+            url_filter=site.url_filter,
+            accept=site.align_captured if site.url_filter else None,
+        )
+        value = site.parse(site.candidate_tables(result))
+        if not value and result.table is not None:
+            logger.warning(f"Captured JSON for '{site.name}' did not parse, reading the page")
+            result = FetchResult(
+                BROWSER_TIER,
+                tables=tiered_fetcher.fetch_browser_tables(
+                    site.url, site.name, site.selectors, site.body_rows, site.with_titles
+                ),
+            )
+            value = site.parse(site.candidate_tables(result))
+        if not value:
+            logger.warning(f"No rows parsed from '{site.name}' ({site.url})")
+        return {
+            "value": value,
+            "tier": result.tier,
+            "fetched_at": time.time(),
+            "seconds": round(time.monotonic() - start, 2),
+        }
+
+    def rows(self, name: str) -> Any:
+        """Parsed rows of a site, from this cycle's fetch of its page"""
+        site = self.sites[name]
+        with self._site_locks[name]:
+            page = self._pages.get(name)
+            max_age = self.cycle if page and page["value"] else self.empty_retry
+            if page is not None and time.time() - page["fetched_at"] < max_age:
+                with self._lock:
+                    self._stats[name]["shared"] += 1
+                return page["value"]
+            try:
+                page = self._fetch(site)
+            except Exception:
+                with self._lock:
+                    self._stats[name]["errors"] += 1
+                raise
+            with self._lock:
+                self._pages[name] = page
+                self._stats[name]["fetches"] += 1
+                if not page["value"]:
+                    self._stats[name]["empty"] += 1
+            return page["value"]
+
+    def stats(self) -> Dict[str, Dict]:
+        with self._lock:
+            stats = {}
+            for name, counters in self._stats.items():
+                page = self._pages.get(name)
+                stats[name] = {**counters}
+                if page is not None:
+                    stats[name].update(
+                        tier=page["tier"],
+                        last_seconds=page["seconds"],
+                        age_seconds=round(time.time() - page["fetched_at"], 1),
+                    )
+            return stats
+
+
+# Shared engine behind the sector and institutional scrapers
+scrape_engine = ScrapeEngine(SITES)
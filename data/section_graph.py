@@ -0,0 +1,121 @@
+import os
+import time
+import asyncio
+import logging
+from typing import Any, AsyncIterator, Awaitable, Callable, Dict, Iterable, Optional
+
+logger = logging.getLogger(__name__)
+
+# Longest a single section may take inside a streamed or combined report
+SECTION_TIMEOUT = float(os.getenv("SECTION_TIMEOUT", 180))
+
+
+class SectionNode:
+    """
+    One stage of a report: `run` gets the values of the stages it depends
+    on (None for a dependency that failed) and returns this stage's value.
+    """
+
+    def __init__(
+        self,
+        name: str,
+        run: Callable[[Dict[str, Any]], Awaitable[Any]],
+        depends_on: Iterable[str] = (),
+        timeout: float = SECTION_TIMEOUT,
+    ):
+        self.name = name
+        self.run = run
+        self.depends_on = list(depends_on)
+        self.timeout = timeout
+
+
+class NodeResult:
+    """Outcome of a stage: its value or error, and when it ran"""
+
+    def __init__(
+        self,
+        name: str,
+        value: Any = None,
+        error: Optional[str] = None,
+        timing: Optional[Dict[str, float]] = None,
+    ):
+        self.name = name
+        self.value = value
+        self.error = error
+        self.timing = timing or {}
+
+    @property
+    def ok(self) -> bool:
+        return self.error is None
+
+
+async def _run_node(node: SectionNode, inputs: Dict[str, Any], origin: float) -> NodeResult:
+    started = time.monotonic()
+    value, error = None, None
+    try:
+        value = await asyncio.wait_for(node.run(inputs), node.timeout)
+    except asyncio.TimeoutError:
+        error = f"Timed out after {node.timeout:g}s"
+        logger.error(f"Section '{node.name}' timed out after {node.timeout:g}s")
+    except Exception as e:
+        error = str(e)
+        logger.error(f"Section '{node.name}' failed: {error}", exc_info=True)
+    finished = time.monotonic()
+    return NodeResult(
+        node.name,
+        value,
+        error,
+        {
+            "started_at": round(started - origin, 3),
+            "seconds": round(finished - started, 3),
+            "finished_at": round(finished - origin, 3),
+        },
+    )
+
+
+async def run_graph(nodes: Iterable[SectionNode]) -> AsyncIterator[NodeResult]:
+    """
+    Run every node as soon as all of its dependencies have finished,
+    independent nodes concurrently, and yield the results in completion
+    order. A failed or timed-out dependency does not stop its dependents;
+    they get None for it. Closing the iterator cancels the nodes still
+    running.
+    """
+    pending = {node.name: node for node in nodes}
+    for node in pending.values():
+        unknown = [dep for dep in node.depends_on if dep not in pending]
+        if unknown:
+            raise ValueError(f"Section '{node.name}' depends on unknown {unknown}")
+
+    origin = time.monotonic()
+    results: Dict[str, NodeResult] = {}
+    running: Dict[asyncio.Future, str] = {}
+
+    def start_ready() -> None:
+        for name, node in list(pending.items()):
+            if all(dep in results for dep in node.depends_on):
+                del pending[name]
+                inputs = {dep: results[dep].value for dep in node.depends_on}
+                running[asyncio.ensure_future(_run_node(node, inputs, origin))] = name
+
+    try:
+        start_ready()
+        if pending and not running:
+            raise ValueError(f"Dependency cycle between sections {list(pending)}")
+        while running:
+            done, _ = await asyncio.wait(running, return_when=asyncio.FIRST_COMPLETED)
+            finished = []
+            for task in done:
+                running.pop(task)
+                result = task.result()
+                results[result.name] = result
+                finished.append(result)
+            # Start the dependents before handing the results to the caller
+            start_ready()
+            if pending and not running:
+                raise ValueError(f"Dependency cycle between sections {list(pending)}")
+            for result in sorted(finished, key=lambda r: r.timing["finished_at"]):
+                yield result
+    finally:
+        for task in running:
+            task.cancel()
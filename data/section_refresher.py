@@ -0,0 +1,107 @@
+import os
+import asyncio
+import logging
+from typing import Any, Awaitable, Callable, Dict, Optional
+
+from data.snapshot_cache import SnapshotCache
+
+logger = logging.getLogger(__name__)
+
+# Refresh slightly before a section's TTL runs out so requests rarely see stale data
+DEFAULT_REFRESH_FRACTION = 0.8
+
+# Wait this long before retrying a section whose refresh failed
+DEFAULT_RETRY_DELAY = 60
+
+# Delay between the first refresh of consecutive sections at startup, so the
+# service does not launch every browser and Gemini call at the same moment
+DEFAULT_STARTUP_STAGGER = 5
+
+
+class SectionRefresher:
+    """
+    Keeps every snapshot section warm by reloading it on its own cadence.
+
+    Each section gets a refresh interval from REFRESH_INTERVAL_<SECTION>
+    (seconds), defaulting to a fraction of the section TTL.
+    """
+
+    def __init__(
+        self,
+        cache: SnapshotCache,
+        loaders: Dict[str, Callable[[], Awaitable[Any]]],
+        intervals: Optional[Dict[str, float]] = None,
+        retry_delay: float = DEFAULT_RETRY_DELAY,
+        startup_stagger: float = DEFAULT_STARTUP_STAGGER,
+    ):
+        self.cache = cache
+        self.loaders = loaders
+        self.intervals = intervals if intervals is not None else self._load_intervals()
+        self.retry_delay = retry_delay
+        self.startup_stagger = startup_stagger
+        self._tasks: Dict[str, asyncio.Task] = {}
+
+    def _load_intervals(self) -> Dict[str, float]:
+        intervals = {}
+        for section in self.loaders:
+            default_interval = self.cache.ttl_for(section) * DEFAULT_REFRESH_FRACTION
+            env_key = f"REFRESH_INTERVAL_{section.upper()}"
+            try:
+                intervals[section] = float(os.getenv(env_key, default_interval))
+            except ValueError:
+                logger.warning(
+                    f"Invalid value for {env_key}, using default of {default_interval} seconds"
+                )
+                intervals[section] = default_interval
+        return intervals
+
+    @property
+    def running(self) -> bool:
+        return bool(self._tasks)
+
+    def start(self) -> None:
+        """Start one refresh loop per section on the running event loop"""
+        if self.running:
+            return
+        for position, section in enumerate(self.loaders):
+            self._tasks[section] = asyncio.ensure_future(
+                self._refresh_loop(section, position * self.startup_stagger)
+            )
+        logger.info(f"Started background refresh for {len(self._tasks)} sections")
+
+    async def stop(self) -> None:
+        """Cancel all refresh loops and wait for them to finish"""
+        tasks = list(self._tasks.values())
+        self._tasks.clear()
+        for task in tasks:
+            task.cancel()
+        await asyncio.gather(*tasks, return_exceptions=True)
+        logger.info("Stopped background refresh")
+
+    async def _refresh_loop(self, section: str, initial_delay: float) -> None:
+        interval = self.intervals[section]
+        await asyncio.sleep(initial_delay)
+
+        while True:
+            snapshot = self.cache.peek(section)
+            # Skip the reload if a request already refreshed the section recently
+            if snapshot is None or snapshot.age >= interval:
+                try:
+                    logger.info(f"Background refresh of '{section}'")
+                    # Shielded so stopping the refresher never cancels a load
+                    # that request handlers may be waiting on
+                    await asyncio.shield(
+                        self.cache.refresh(section, self.loaders[section])
+                    )
+                except asyncio.CancelledError:
+                    raise
+                except Exception as e:
+                    logger.error(
+                        f"Background refresh of '{section}' failed: {str(e)}"
+                    )
+                    await asyncio.sleep(self.retry_delay)
+                    continue
+
+            snapshot = self.cache.peek(section)
+            wait = interval - snapshot.age if snapshot else self.retry_delay
+            await asyncio.sleep(max(wait, 1))
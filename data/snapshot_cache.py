@@ -0,0 +1,217 @@
+import os
+import time
+import asyncio
+import logging
+import threading
+from datetime import datetime
+from typing import Any, Awaitable, Callable, Dict, Optional
+
+logger = logging.getLogger(__name__)
+
+# Default time-to-live (in seconds) for every cached market section.
+# Each value can be overridden with an environment variable named
+# SNAPSHOT_TTL_<SECTION>, e.g. SNAPSHOT_TTL_SECTOR=600
+DEFAULT_SECTION_TTLS = {
+    "market_overview": 300,
+    "sector": 900,
+    "fii": 1800,
+    "top_performers": 600,
+    "technical": 900,
+    "indicators": 900,
+    "news": 1800,
+    "analysis": 1800,
+}
+
+
+def load_section_ttls() -> Dict[str, float]:
+    """Read per-section TTLs from the environment, falling back to the defaults"""
+    ttls = {}
+    for section, default_ttl in DEFAULT_SECTION_TTLS.items():
+        env_key = f"SNAPSHOT_TTL_{section.upper()}"
+        try:
+            ttls[section] = float(os.getenv(env_key, default_ttl))
+        except ValueError:
+            logger.warning(
+                f"Invalid value for {env_key}, using default of {default_ttl} seconds"
+            )
+            ttls[section] = float(default_ttl)
+    return ttls
+
+
+def _consume_task_exception(task: asyncio.Task) -> None:
+    """Mark a load failure as retrieved even when every waiter went away"""
+    if not task.cancelled():
+        task.exception()
+
+
+class Snapshot:
+    """A cached section value together with the time it was produced"""
+
+    def __init__(self, section: str, value: Any, created_at: Optional[float] = None):
+        self.section = section
+        self.value = value
+        self.created_at = created_at if created_at is not None else time.time()
+
+    @property
+    def age(self) -> float:
+        """Seconds elapsed since the snapshot was taken"""
+        return max(0.0, time.time() - self.created_at)
+
+    @property
+    def created_at_iso(self) -> str:
+        return datetime.fromtimestamp(self.created_at).isoformat()
+
+
+class SnapshotCache:
+    """In-process, section-keyed store of the latest market data snapshots"""
+
+    def __init__(self, ttls: Optional[Dict[str, float]] = None):
+        self.ttls = ttls if ttls is not None else load_section_ttls()
+        self._snapshots: Dict[str, Snapshot] = {}
+        self._lock = threading.Lock()
+        # Loads currently running, keyed by section, so concurrent callers share them
+        self._inflight: Dict[str, asyncio.Task] = {}
+        self._stats = {
+            section: {
+                "hits": 0,
+                "stale_served": 0,
+                "misses": 0,
+                "loads": 0,
+                "coalesced": 0,
+                "errors": 0,
+            }
+            for section in self.ttls
+        }
+
+    def ttl_for(self, section: str) -> float:
+        if section not in self.ttls:
+            raise KeyError(f"Unknown snapshot section: {section}")
+        return self.ttls[section]
+
+    def is_fresh(self, snapshot: Optional[Snapshot]) -> bool:
+        return snapshot is not None and snapshot.age < self.ttl_for(snapshot.section)
+
+    def peek(self, section: str) -> Optional[Snapshot]:
+        """Return the stored snapshot for a section, fresh or not"""
+        with self._lock:
+            return self._snapshots.get(section)
+
+    def get(self, section: str) -> Optional[Snapshot]:
+        """Return the stored snapshot for a section only if it is still fresh"""
+        snapshot = self.peek(section)
+        return snapshot if self.is_fresh(snapshot) else None
+
+    def put(self, section: str, value: Any) -> Snapshot:
+        self.ttl_for(section)  # Reject unknown sections early
+        snapshot = Snapshot(section, value)
+        with self._lock:
+            self._snapshots[section] = snapshot
+        logger.debug(f"Stored new snapshot for section '{section}'")
+        return snapshot
+
+    def in_flight(self, section: str) -> Optional[asyncio.Task]:
+        """The load currently running for a section, if any"""
+        return self._inflight.get(section)
+
+    def invalidate(self, section: Optional[str] = None) -> None:
+        """Drop one section, or every section when none is given"""
+        with self._lock:
+            if section is None:
+                self._snapshots.clear()
+            else:
+                self._snapshots.pop(section, None)
+
+    def _count(self, section: str, counter: str) -> None:
+        with self._lock:
+            self._stats[section][counter] += 1
+
+    def stats(self) -> Dict[str, Dict[str, Any]]:
+        """Per-section counters plus the age of the stored snapshot"""
+        with self._lock:
+            result = {}
+            for section, counters in self._stats.items():
+                snapshot = self._snapshots.get(section)
+                result[section] = {
+                    **counters,
+                    "in_flight": section in self._inflight,
+                    "ttl_seconds": self.ttls[section],
+                    "age_seconds": round(snapshot.age, 1) if snapshot else None,
+                }
+            return result
+
+    async def _run_load(
+        self, section: str, loader: Callable[[], Awaitable[Any]]
+    ) -> Snapshot:
+        try:
+            self._count(section, "loads")
+            value = await loader()
+            return self.put(section, value)
+        except Exception:
+            self._count(section, "errors")
+            raise
+        finally:
+            self._inflight.pop(section, None)
+
+    def refresh(
+        self, section: str, loader: Callable[[], Awaitable[Any]]
+    ) -> asyncio.Task:
+        """
+        Start a load for a section in the background, or return the load that
+        is already in flight. Only one load per section ever runs at a time.
+        """
+        task = self._inflight.get(section)
+        if task is None:
+            task = asyncio.ensure_future(self._run_load(section, loader))
+            task.add_done_callback(_consume_task_exception)
+            self._inflight[section] = task
+        return task
+
+    async def get_or_load(
+        self, section: str, loader: Callable[[], Awaitable[Any]]
+    ) -> Snapshot:
+        """
+        Return the snapshot for a section using stale-while-revalidate:
+
+        - a fresh snapshot is returned as is
+        - a stale snapshot is returned immediately while a background load
+          replaces it
+        - with no snapshot at all the caller waits for the load
+
+        Callers arriving while a load is in flight join that load instead of
+        starting their own. Loader errors propagate to every waiting caller
+        and never replace the last good snapshot.
+        """
+        snapshot = self.peek(section)
+        if self.is_fresh(snapshot):
+            self._count(section, "hits")
+            logger.debug(
+                f"Snapshot hit for '{section}' (age {snapshot.age:.1f}s)"
+            )
+            return snapshot
+
+        if snapshot is not None:
+            self._count(section, "stale_served")
+            if section in self._inflight:
+                self._count(section, "coalesced")
+            else:
+                logger.info(
+                    f"Serving stale '{section}' (age {snapshot.age:.1f}s), refreshing in background"
+                )
+            self.refresh(section, loader)
+            return snapshot
+
+        self._count(section, "misses")
+        if section in self._inflight:
+            self._count(section, "coalesced")
+            logger.info(f"Joining in-flight load for '{section}'")
+        else:
+            logger.info(f"Snapshot miss for '{section}', loading fresh data")
+        task = self.refresh(section, loader)
+
+        # Shield the shared load so one disconnecting client does not cancel it
+        # for everybody else waiting on the same section
+        return await asyncio.shield(task)
+
+
+# Shared instance used by the JSON and PDF routers
+snapshot_cache = SnapshotCache()
@@ -0,0 +1,99 @@
+import os
+import json
+import time
+import logging
+import threading
+from typing import Dict, Optional, Tuple
+
+from data.cache_dir import cache_path
+
+logger = logging.getLogger(__name__)
+
+# How long a resolved symbol/period is trusted before the full cascade runs again
+RESOLUTION_TTL = float(os.getenv("RESOLVED_SYMBOL_TTL", 7 * 24 * 3600))
+
+# How often an index resolved to an alternative symbol re-tries its primary symbol
+PRIMARY_REPROBE_INTERVAL = float(os.getenv("PRIMARY_REPROBE_INTERVAL", 6 * 3600))
+
+
+class SymbolResolver:
+    """
+    Persistent map of primary index symbol -> the symbol and period that last
+    returned usable data, so later fetches can skip the failure cascade.
+
+    Entries expire after RESOLUTION_TTL. Entries that point at an alternative
+    symbol periodically re-probe the primary symbol in case it recovered.
+    """
+
+    def __init__(
+        self,
+        path: Optional[str] = None,
+        ttl: float = RESOLUTION_TTL,
+        reprobe_interval: float = PRIMARY_REPROBE_INTERVAL,
+    ):
+        self.path = path or cache_path("resolved_symbols.json")
+        self.ttl = ttl
+        self.reprobe_interval = reprobe_interval
+        self._lock = threading.Lock()
+        self._entries: Dict[str, Dict] = self._load()
+
+    def _load(self) -> Dict[str, Dict]:
+        if not os.path.exists(self.path):
+            return {}
+        try:
+            with open(self.path, "r") as f:
+                return json.load(f)
+        except Exception as e:
+            logger.warning(f"Could not read resolved symbol map {self.path}: {str(e)}")
+            return {}
+
+    def save(self) -> None:
+        with self._lock:
+            entries = dict(self._entries)
+        try:
+            tmp_path = f"{self.path}.tmp"
+            with open(tmp_path, "w") as f:
+                json.dump(entries, f, indent=2)
+            os.replace(tmp_path, self.path)
+        except Exception as e:
+            logger.warning(f"Could not save resolved symbol map {self.path}: {str(e)}")
+
+    def lookup(self, primary_symbol: str) -> Optional[Tuple[str, str]]:
+        """Return the known-good (symbol, period) for a primary symbol, if not expired"""
+        with self._lock:
+            entry = self._entries.get(primary_symbol)
+        if not entry or time.time() - entry["resolved_at"] > self.ttl:
+            return None
+        return entry["symbol"], entry["period"]
+
+    def should_reprobe(self, primary_symbol: str) -> bool:
+        """True when an index resolved to an alternative is due to re-try its primary"""
+        with self._lock:
+            entry = self._entries.get(primary_symbol)
+        if not entry or entry["symbol"] == primary_symbol:
+            return False
+        return time.time() - entry.get("last_probe", 0) > self.reprobe_interval
+
+    def mark_probed(self, primary_symbol: str) -> None:
+        with self._lock:
+            if primary_symbol in self._entries:
+                self._entries[primary_symbol]["last_probe"] = time.time()
+
+    def record(self, primary_symbol: str, symbol: str, period: str) -> None:
+        now = time.time()
+        with self._lock:
+            previous = self._entries.get(primary_symbol, {})
+            if (previous.get("symbol"), previous.get("period")) != (symbol, period):
+                logger.info(
+                    f"Resolved {primary_symbol} to {symbol} with period {period}"
+                )
+            self._entries[primary_symbol] = {
+                "symbol": symbol,
+                "period": period,
+                "resolved_at": now,
+                "last_probe": previous.get("last_probe", now),
+            }
+
+    def forget(self, primary_symbol: str) -> None:
+        with self._lock:
+            self._entries.pop(primary_symbol, None)
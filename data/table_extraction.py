@@ -0,0 +1,141 @@
+import logging
+from typing import Dict, List, Optional
+
+from bs4 import BeautifulSoup, SoupStrainer
+
+from data.network_capture import CapturedTable
+
+logger = logging.getLogger(__name__)
+
+# Reads the rows of the first table matching each selector inside the page,
+# so only cell text crosses the WebDriver connection instead of page_source.
+# Mirrors tables_from_soup below.
+TABLE_ROWS_SCRIPT = """
+const [selectors, bodyRows, withTitles] = arguments;
+const text = (el) => el.textContent.trim();
+const strippedText = (el) => {
+    const parts = [];
+    const walker = document.createTreeWalker(el, NodeFilter.SHOW_TEXT);
+    while (walker.nextNode()) {
+        const part = walker.currentNode.nodeValue.trim();
+        if (part) parts.push(part);
+    }
+    return parts.join("");
+};
+const firstCellTitle = (row) => {
+    const cell = row.querySelector("td");
+    if (!cell) return null;
+    const link = cell.querySelector("a");
+    if (link) {
+        for (const attr of ["data-title", "data-original-title", "title"]) {
+            if (link.hasAttribute(attr)) return link.getAttribute(attr).trim();
+        }
+    }
+    const span = cell.querySelector("span");
+    if (span && span.hasAttribute("title")) return span.getAttribute("title").trim();
+    return strippedText(cell);
+};
+const tables = {};
+for (const selector of selectors) {
+    const table = document.querySelector(selector);
+    if (!table) continue;
+    const rows = Array.from(
+        bodyRows && table.querySelector("tbody")
+            ? table.querySelectorAll("tbody tr")
+            : table.querySelectorAll("tr")
+    );
+    const headRow = table.querySelector("thead tr");
+    tables[selector] = {
+        headers: headRow ? Array.from(headRow.querySelectorAll("th"), text) : [],
+        rows: rows.map((row) => Array.from(row.querySelectorAll("td"), text)),
+        titles: withTitles ? rows.map(firstCellTitle) : null,
+    };
+}
+return tables;
+"""
+
+
+def extract_tables(
+    driver,
+    selectors: List[str],
+    body_rows: bool = True,
+    with_titles: bool = False,
+) -> Dict[str, CapturedTable]:
+    """
+    Rows of the first table matching each selector, read in the browser with a
+    single execute_script call.
+
+    Rows are the table's `tbody tr` elements when `body_rows` is set and the
+    table has a tbody, otherwise all of its `tr` elements; each row is the text
+    of its `td` cells. With `with_titles`, each table also carries the full
+    name held by the first cell of every row (link or span title).
+    """
+    found = driver.execute_script(TABLE_ROWS_SCRIPT, selectors, body_rows, with_titles)
+    url = driver.current_url
+    return {
+        selector: CapturedTable(
+            url, table["headers"], table["rows"], titles=table.get("titles")
+        )
+        for selector, table in (found or {}).items()
+    }
+
+
+def _is_table_selector(selector: str) -> bool:
+    # Only tables survive the strainer, so a selector naming an ancestor
+    # (".table-responsive table") cannot be resolved against table_soup.
+    # Shortening it to its last compound would match any table on the page.
+    return not any(c in selector.strip() for c in " >+~")
+
+
+def table_soup(html: str) -> BeautifulSoup:
+    """Parse only the <table> elements of a page, with lxml"""
+    return BeautifulSoup(html, "lxml", parse_only=SoupStrainer("table"))
+
+
+def _first_cell_title(row) -> Optional[str]:
+    first_col = row.find("td")
+    if not first_col:
+        return None
+    link = first_col.find("a")
+    if link:
+        for attr in ("data-title", "data-original-title", "title"):
+            if link.has_attr(attr):
+                return link[attr].strip()
+    span = first_col.find("span")
+    if span and span.has_attr("title"):
+        return span["title"].strip()
+    return first_col.get_text(strip=True)
+
+
+def tables_from_soup(
+    soup: BeautifulSoup,
+    selectors: List[str],
+    body_rows: bool = True,
+    with_titles: bool = False,
+    url: str = "",
+) -> Dict[str, CapturedTable]:
+    """
+    Same as extract_tables, for a page parsed with table_soup. Selectors
+    that go through an ancestor of the table are skipped; the page's other
+    candidate selectors, or the browser tier, cover them.
+    """
+    tables = {}
+    for selector in selectors:
+        if not _is_table_selector(selector):
+            continue
+        table = soup.select_one(selector)
+        if not table:
+            continue
+        rows = (
+            table.select("tbody tr")
+            if body_rows and table.select_one("tbody")
+            else table.select("tr")
+        )
+        head_row = table.select_one("thead tr")
+        tables[selector] = CapturedTable(
+            url,
+            [th.text.strip() for th in head_row.select("th")] if head_row else [],
+            [[td.text.strip() for td in row.select("td")] for row in rows],
+            titles=[_first_cell_title(row) for row in rows] if with_titles else None,
+        )
+    return tables
@@ -1,14 +1,18 @@
 import os
+import copy
 import json
 import yfinance as yf
-import ta
 import google.generativeai as genai
 from dotenv import load_dotenv
 from datetime import datetime, timedelta
-import time
 from yfinance.exceptions import YFRateLimitError
 import logging
-import asyncio
+
+from data.executors import run_in
+from data.history_store import history_store
+from data.indicators import compute_latest_for_histories
+from data.indicator_state import IndicatorStateStore
+from data.insight_batch import generate_insight_text
 
 # Set up logging with simpler format
 logging.basicConfig(
@@ -48,6 +52,14 @@ INDICES = {
     "Nifty FMCG": "^CNXFMCG",
 }
 
+# Full 6-month history is re-downloaded at most this often (seconds). In between,
+# snapshots are refreshed from the latest price using the streaming indicator state.
+HISTORY_REFRESH_SECONDS = float(os.getenv("TECHNICAL_HISTORY_REFRESH", 6 * 3600))
+
+# Streaming RSI/MACD state per index, re-seeded by every full history fetch
+# and persisted with the result of that fetch
+indicator_states = IndicatorStateStore()
+
 
 # --- Utility Functions ---
 def get_previous_trading_day():
@@ -61,45 +73,147 @@ def get_previous_trading_day():
 def fetch_technical_snapshot():
     """Fetch technical data for Indian indices."""
     logger.info("Fetching technical snapshot for indices")
-    snapshot = {}
+    # One batched request covers every index, only missing bars are downloaded
+    try:
+        logger.info(f"Loading 6-month history for {len(INDICES)} indices")
+        symbol_histories = history_store.get_histories(list(INDICES.values()), "6mo")
+    except YFRateLimitError:
+        logger.error("Yahoo Finance rate limit reached")
+        raise RuntimeError(
+            "Too Many Requests to Yahoo Finance. Please try again later."
+        )
+
+    histories = {}
     for name, symbol in INDICES.items():
         logger.info(f"Processing {name} ({symbol})")
-        ticker = yf.Ticker(symbol)
-        try:
-            logger.info(f"Fetching 6-month history for {symbol}")
-            hist = ticker.history(period="6mo", interval="1d")
-        except YFRateLimitError:
-            logger.error("Yahoo Finance rate limit reached")
-            raise RuntimeError(
-                "Too Many Requests to Yahoo Finance. Please try again later."
-            )
-        if hist.empty or len(hist) < 50:
+        hist = symbol_histories.get(symbol)
+        if hist is None or hist.empty or len(hist) < 50:
             logger.warning(f"Insufficient data for {symbol}, skipping")
             continue
+        histories[name] = hist
 
-        close = hist["Close"]
+    # Compute every indicator for all indices in one vectorized pass
+    latest = compute_latest_for_histories(histories)
+
+    # Re-seed the streaming state used by intraday refreshes
+    for name, hist in histories.items():
+        indicator_states.seed(name, hist)
+    indicator_states.save()
+
+    snapshot = {}
+    for name, values in latest.items():
         snapshot[name] = {
-            "close": round(close.iloc[-1], 2),
-            "support": round(close.tail(20).min(), 2),
-            "rsi": round(ta.momentum.RSIIndicator(close=close).rsi().iloc[-1], 2),
+            "close": round(values["close"], 2),
+            "support": round(values["support"], 2),
+            "resistance": round(values["resistance"], 2),
+            "rsi": round(values["rsi"], 2),
             "macd": {
-                "line": round(ta.trend.MACD(close=close).macd().iloc[-1], 2),
-                "signal": round(ta.trend.MACD(close=close).macd_signal().iloc[-1], 2),
+                "line": round(values["macd_line"], 2),
+                "signal": round(values["macd_signal"], 2),
+                "histogram": round(values["macd_histogram"], 2),
             },
+            "sma_20": round(values["sma_20"], 2),
+            "sma_50": round(values["sma_50"], 2),
+            "ema_20": round(values["ema_20"], 2),
+            "bollinger": {
+                "upper": round(values["bb_upper"], 2),
+                "lower": round(values["bb_lower"], 2),
+            },
+            "atr": round(values["atr"], 2),
         }
         logger.info(
             f"Successfully processed {name} with close price {snapshot[name]['close']}"
         )
-        time.sleep(1)  # Add a 1-second delay between requests
 
     logger.info(f"Completed technical snapshot with {len(snapshot)} indices")
     return snapshot
 
 
+def fetch_latest_prices():
+    """Fetch the latest 1-minute close of every index in a single request."""
+    symbols = list(INDICES.values())
+    logger.info(f"Fetching latest prices for {len(symbols)} indices")
+    data = yf.download(
+        tickers=symbols,
+        period="1d",
+        interval="1m",
+        group_by="ticker",
+        auto_adjust=True,
+        threads=True,
+        progress=False,
+    )
+    prices = {}
+    if data is None or data.empty:
+        return prices
+
+    for name, symbol in INDICES.items():
+        try:
+            if data.columns.nlevels > 1:
+                if symbol not in data.columns.get_level_values(0):
+                    continue
+                close = data[symbol]["Close"].dropna()
+            else:
+                close = data["Close"].dropna()
+            if close.empty:
+                continue
+            prices[name] = (close.index[-1].strftime("%Y-%m-%d"), float(close.iloc[-1]))
+        except Exception as e:
+            logger.warning(f"Could not read latest price for {symbol}: {str(e)}")
+    return prices
+
+
+def refresh_technical_snapshot(snapshot: dict):
+    """
+    Update close, RSI, MACD and support/resistance of an existing snapshot from
+    the latest prices, without downloading the price history again.
+    Moving averages, Bollinger bands and ATR keep their values from the last
+    full history fetch.
+    """
+    logger.info("Refreshing technical snapshot from streaming indicator state")
+    refreshed = copy.deepcopy(snapshot)
+    for name, (bar_date, close) in fetch_latest_prices().items():
+        values = indicator_states.update(name, bar_date, close)
+        if not values or name not in refreshed:
+            continue
+
+        entry = refreshed[name]
+        for key in ["close", "rsi", "support", "resistance"]:
+            if values[key] is not None:
+                entry[key] = round(values[key], 2)
+        for key in ["line", "signal", "histogram"]:
+            if values[f"macd_{key}"] is not None:
+                entry["macd"][key] = round(values[f"macd_{key}"], 2)
+    indicator_states.save()
+    return refreshed
+
+
+def _incremental_baseline():
+    """
+    The last full-history result persisted with the indicator state, when it
+    is recent enough to be refreshed from ticks (also right after a restart),
+    otherwise None
+    """
+    baseline = indicator_states.baseline()
+    if not baseline or not baseline.get("history_fetched_at"):
+        return None
+    fetched_at = datetime.fromisoformat(baseline["history_fetched_at"])
+    if (datetime.now() - fetched_at).total_seconds() > HISTORY_REFRESH_SECONDS:
+        return None
+    if not all(indicator_states.has(name) for name in baseline.get("snapshot", {})):
+        return None
+    return baseline
+
+
+def _store_baseline(result: dict) -> None:
+    """Persist a full-history result as the base of the following refreshes"""
+    indicator_states.set_baseline(result)
+    indicator_states.save()
+
+
 async def fetch_technical_snapshot_async():
     """Async version of fetch_technical_snapshot."""
     # Use a thread pool to run the synchronous function
-    return await asyncio.to_thread(fetch_technical_snapshot)
+    return await run_in("http", fetch_technical_snapshot)
 
 
 def generate_insights(snapshot_data: dict):
@@ -131,8 +245,7 @@ def generate_insights(snapshot_data: dict):
 
     try:
         logger.info("Sending request to Gemini API")
-        response = gemini_client.generate_content(prompt)
-        insights_text = response.text.strip()
+        insights_text = generate_insight_text("technical", prompt, gemini_client).strip()
         logger.info("Successfully received response from Gemini API")
 
         # Clean and split insights
@@ -151,13 +264,26 @@ def generate_insights(snapshot_data: dict):
 
 async def generate_insights_async(snapshot_data: dict):
     """Async version of generate_insights."""
-    return await asyncio.to_thread(generate_insights, snapshot_data)
+    return await run_in("llm", generate_insights, snapshot_data)
 
 
 def get_market_technical_snapshot():
-    """Main function to get technical snapshot and insights."""
+    """
+    Main function to get technical snapshot and insights.
+
+    While the last full history fetch (persisted with the indicator state) is
+    recent, only the latest prices are fetched and its indicators are updated
+    incrementally; the insights of that fetch are kept.
+    """
     logger.info("Starting market technical snapshot process")
     try:
+        baseline = _incremental_baseline()
+        if baseline:
+            return {
+                **baseline,
+                "snapshot": refresh_technical_snapshot(baseline["snapshot"]),
+            }
+
         snapshot = fetch_technical_snapshot()
         if not snapshot:
             logger.error("No stock data available")
@@ -168,7 +294,9 @@ def get_market_technical_snapshot():
             "date": get_previous_trading_day(),
             "snapshot": snapshot,
             "insights": insights,
+            "history_fetched_at": datetime.now().isoformat(),
         }
+        _store_baseline(result)
         logger.info("Successfully completed market technical snapshot")
         return result
     except Exception as e:
@@ -180,6 +308,13 @@ async def get_market_technical_snapshot_async():
     """Async version of get_market_technical_snapshot."""
     logger.info("Starting async market technical snapshot process")
     try:
+        baseline = _incremental_baseline()
+        if baseline:
+            refreshed = await run_in(
+                "http", refresh_technical_snapshot, baseline["snapshot"]
+            )
+            return {**baseline, "snapshot": refreshed}
+
         snapshot = await fetch_technical_snapshot_async()
         if not snapshot:
             logger.error("No stock data available")
@@ -190,7 +325,9 @@ async def get_market_technical_snapshot_async():
             "date": get_previous_trading_day(),
             "snapshot": snapshot,
             "insights": insights,
+            "history_fetched_at": datetime.now().isoformat(),
         }
+        await run_in("http", _store_baseline, result)
         logger.info("Successfully completed async market technical snapshot")
         return result
     except Exception as e:
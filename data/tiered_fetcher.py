@@ -0,0 +1,270 @@
+import os
+import json
+import time
+import logging
+import threading
+from typing import Callable, Dict, List, Optional
+
+import requests
+from bs4 import BeautifulSoup
+from requests.adapters import HTTPAdapter
+from urllib3.util.retry import Retry
+
+from data.browser_pool import USER_AGENT, browser_pool
+from data.cache_dir import cache_path
+from data.network_capture import (
+    CapturedTable,
+    ResponseCollector,
+    drain_performance_log,
+)
+from data.page_readiness import READINESS_SPECS, wait_until_ready
+from data.table_extraction import extract_tables, table_soup, tables_from_soup
+
+logger = logging.getLogger(__name__)
+
+HTTP_TIMEOUT = float(os.getenv("TIERED_HTTP_TIMEOUT", 10))
+
+# URLs that needed the browser re-try plain HTTP this often, in case the
+# site started rendering its tables server side
+TIER_REPROBE_INTERVAL = float(os.getenv("TIER_REPROBE_INTERVAL", 24 * 3600))
+
+HTTP_TIER = "http"
+CAPTURE_TIER = "capture"
+BROWSER_TIER = "browser"
+
+
+class FetchResult:
+    """
+    Tables read from a fetched page: `tables` maps each requested selector
+    that matched to its rows, `table` is set instead when the page's JSON
+    response was captured.
+    """
+
+    def __init__(
+        self,
+        tier: str,
+        tables: Optional[Dict[str, CapturedTable]] = None,
+        table: Optional[CapturedTable] = None,
+    ):
+        self.tier = tier
+        self.tables = tables or {}
+        self.table = table
+
+
+class TieredFetcher:
+    """
+    Fetch a page with a plain HTTP GET first and fall back to a pooled Chrome
+    only when the response does not contain the content described by the
+    page's readiness spec (for example a table with enough rows).
+
+    The tier that worked is remembered per URL across restarts, so pages that
+    need JavaScript go straight to the browser next time.
+    """
+
+    def __init__(self, path: Optional[str] = None):
+        self.path = path or cache_path("fetch_tiers.json")
+        self._lock = threading.Lock()
+        self._tiers: Dict[str, Dict] = self._load()
+        self._stats = {
+            "http_hits": 0,
+            "http_misses": 0,
+            "captures": 0,
+            "browser_fetches": 0,
+        }
+
+        # Pooled connections with the same retry policy as the news scraper
+        self.session = requests.Session()
+        retry_strategy = Retry(
+            total=2,
+            backoff_factor=0.5,
+            status_forcelist=[500, 502, 503, 504, 429],
+            allowed_methods=["GET"],
+        )
+        adapter = HTTPAdapter(max_retries=retry_strategy, pool_maxsize=10)
+        self.session.mount("http://", adapter)
+        self.session.mount("https://", adapter)
+        self.session.headers.update(
+            {
+                "User-Agent": USER_AGENT,
+                "Accept": "text/html,application/xhtml+xml,application/xml;q=0.9,*/*;q=0.8",
+                "Accept-Language": "en-US,en;q=0.5",
+            }
+        )
+
+    def _load(self) -> Dict[str, Dict]:
+        if not os.path.exists(self.path):
+            return {}
+        try:
+            with open(self.path, "r") as f:
+                return json.load(f)
+        except Exception as e:
+            logger.warning(f"Could not read fetch tiers {self.path}: {str(e)}")
+            return {}
+
+    def _remember(self, url: str, tier: str, elapsed: float) -> None:
+        with self._lock:
+            previous = self._tiers.get(url, {})
+            if previous.get("tier") != tier:
+                logger.info(f"Using {tier} tier for {url}")
+            self._tiers[url] = {
+                "tier": tier,
+                "checked_at": time.time(),
+                "last_seconds": round(elapsed, 2),
+            }
+            tiers = dict(self._tiers)
+        try:
+            tmp_path = f"{self.path}.tmp"
+            with open(tmp_path, "w") as f:
+                json.dump(tiers, f, indent=2)
+            os.replace(tmp_path, self.path)
+        except Exception as e:
+            logger.warning(f"Could not save fetch tiers {self.path}: {str(e)}")
+
+    def _count(self, counter: str) -> None:
+        with self._lock:
+            self._stats[counter] += 1
+
+    def _should_try_http(self, url: str) -> bool:
+        with self._lock:
+            entry = self._tiers.get(url)
+        if not entry or entry["tier"] == HTTP_TIER:
+            return True
+        return time.time() - entry["checked_at"] > TIER_REPROBE_INTERVAL
+
+    @staticmethod
+    def is_complete(soup: BeautifulSoup, site: str) -> bool:
+        """True when the parsed page already holds what the site's scraper needs"""
+        spec = READINESS_SPECS[site]
+        return len(soup.select(spec.selector)) >= spec.min_count
+
+    @staticmethod
+    def is_complete_dom(driver, site: str) -> bool:
+        """True when the page rendered in `driver` matches the site's readiness spec"""
+        spec = READINESS_SPECS[site]
+        try:
+            return len(driver.find_elements("css selector", spec.selector)) >= spec.min_count
+        except Exception:
+            return False
+
+    def fetch_http(self, url: str) -> BeautifulSoup:
+        """GET the page and parse only its tables"""
+        response = self.session.get(url, timeout=HTTP_TIMEOUT)
+        response.raise_for_status()
+        return table_soup(response.text)
+
+    def _try_http(self, url: str, site: str) -> Optional[BeautifulSoup]:
+        if not self._should_try_http(url):
+            return None
+        start = time.monotonic()
+        try:
+            soup = self.fetch_http(url)
+            if self.is_complete(soup, site):
+                self._count("http_hits")
+                self._remember(url, HTTP_TIER, time.monotonic() - start)
+                return soup
+            logger.info(f"HTTP response for '{site}' lacks its table, using the browser")
+        except Exception as e:
+            logger.info(f"HTTP fetch failed for '{site}', using the browser: {str(e)}")
+        self._count("http_misses")
+        return None
+
+    def fetch_browser_tables(
+        self,
+        url: str,
+        site: str,
+        selectors: List[str],
+        body_rows: bool = True,
+        with_titles: bool = False,
+    ) -> Dict[str, CapturedTable]:
+        """Load the page in a pooled browser and read the rows of its tables"""
+        with browser_pool.lease() as driver:
+            driver.get(url)
+            wait_until_ready(driver, site)
+            return extract_tables(driver, selectors, body_rows, with_titles)
+
+    def fetch_tables(
+        self,
+        url: str,
+        site: str,
+        selectors: List[str],
+        body_rows: bool = True,
+        with_titles: bool = False,
+        url_filter: Optional[str] = None,
+        accept: Optional[Callable[[CapturedTable], Optional[CapturedTable]]] = None,
+    ) -> FetchResult:
+        """
+        Return the rows of the first table matching each of `selectors`, from
+        the cheapest tier that has them (see data.table_extraction for the row
+        format). Neither tier builds a parse tree of the whole page: over HTTP
+        only the tables are parsed, and in the browser the rows are read with
+        one script call instead of transferring page_source.
+
+        With `url_filter`, the browser tier first tries to capture the JSON
+        response the page builds its table from (responses whose URL contains
+        `url_filter`) and returns it as `table` as soon as it arrives. `accept`
+        may check or reshape a captured table; when it returns None the table
+        is ignored and the rows are read from the rendered page instead.
+        """
+        soup = self._try_http(url, site)
+        if soup is not None:
+            tables = tables_from_soup(soup, selectors, body_rows, with_titles, url)
+            if tables:
+                return FetchResult(HTTP_TIER, tables=tables)
+            logger.info(f"No HTTP-resolvable selector matched for '{site}', using the browser")
+
+        if url_filter is None:
+            start = time.monotonic()
+            tables = self.fetch_browser_tables(url, site, selectors, body_rows, with_titles)
+            self._count("browser_fetches")
+            self._remember(url, BROWSER_TIER, time.monotonic() - start)
+            return FetchResult(BROWSER_TIER, tables=tables)
+
+        spec = READINESS_SPECS[site]
+        start = time.monotonic()
+        with browser_pool.lease() as driver:
+            drain_performance_log(driver)  # Only events of this page load
+            collector = ResponseCollector(url_filter)
+            driver.get(url)
+
+            def captured_table() -> Optional[CapturedTable]:
+                table = collector.find_table(driver, spec.min_count)
+                if table is not None and accept is not None:
+                    table = accept(table)
+                return table
+
+            table = None
+            rendered = False
+            deadline = time.monotonic() + spec.timeout
+            while time.monotonic() < deadline:
+                table = captured_table()
+                if table is not None:
+                    break
+                rendered = self.is_complete_dom(driver, site)
+                if rendered:
+                    # Rendered without a recognisable JSON payload
+                    table = captured_table()
+                    break
+                time.sleep(0.2)
+
+            if table is not None:
+                self._count("captures")
+                self._remember(url, CAPTURE_TIER, time.monotonic() - start)
+                logger.info(f"Captured {len(table.rows)} rows for '{site}' from {table.url}")
+                return FetchResult(CAPTURE_TIER, table=table)
+
+            if rendered:
+                wait_until_ready(driver, site)  # Returns at once, records the timing
+            else:
+                logger.warning(f"Page for '{site}' not ready after {spec.timeout:.0f}s")
+            tables = extract_tables(driver, selectors, body_rows, with_titles)
+        self._count("browser_fetches")
+        self._remember(url, BROWSER_TIER, time.monotonic() - start)
+        return FetchResult(BROWSER_TIER, tables=tables)
+
+    def stats(self) -> Dict:
+        with self._lock:
+            return {**self._stats, "tiers": dict(self._tiers)}
+
+
+# Shared fetcher used by the table scrapers
+tiered_fetcher = TieredFetcher()
@@ -1,10 +1,9 @@
 import os
-import json
 import logging
 import re
+from concurrent.futures import ThreadPoolExecutor
 from datetime import datetime
-import time
-from typing import Dict, List, Any
+from typing import Dict, List, Any, Optional
 
 # Langchain imports
 from langchain_google_genai import GoogleGenerativeAI
@@ -12,17 +11,11 @@ from langchain.chains import LLMChain
 from langchain.prompts import PromptTemplate
 
 # Third party imports
-from bs4 import BeautifulSoup
 from dotenv import load_dotenv
-from selenium import webdriver
-from selenium.webdriver.chrome.options import Options
-from selenium.webdriver.chrome.service import Service
-from webdriver_manager.chrome import ChromeDriverManager
-from selenium.webdriver.common.by import By
-from selenium.webdriver.support.ui import WebDriverWait
-from selenium.webdriver.support import expected_conditions as EC
 import google.generativeai as genai
 
+from data.tiered_fetcher import tiered_fetcher
+
 # Load environment variables
 load_dotenv()
 
@@ -41,12 +34,26 @@ logging.basicConfig(
 logger = logging.getLogger(__name__)
 
 # Only use Trendlyne URLs for gainers and losers
-TRENDLYNE_GAINERS_URL = (
-    "https://trendlyne.com/stock-screeners/price-based/top-gainers/today/"
-)
-TRENDLYNE_LOSERS_URL = (
-    "https://trendlyne.com/stock-screeners/price-based/top-losers/today/"
+TRENDLYNE_MOVERS_URL = (
+    "https://trendlyne.com/stock-screeners/price-based/top-{kind}/{timeframe}/"
 )
+TRENDLYNE_GAINERS_URL = TRENDLYNE_MOVERS_URL.format(kind="gainers", timeframe="today")
+TRENDLYNE_LOSERS_URL = TRENDLYNE_MOVERS_URL.format(kind="losers", timeframe="today")
+
+# Stocks kept per list
+TOP_PERFORMERS_COUNT = int(os.getenv("TOP_PERFORMERS_COUNT", 10))
+
+# Extra gainer/loser pages scraped alongside today's, e.g.
+# TOP_PERFORMERS_TIMEFRAMES=week,month
+SUPPORTED_TIMEFRAMES = ["week", "month"]
+TOP_PERFORMERS_TIMEFRAMES = [
+    timeframe.strip()
+    for timeframe in os.getenv("TOP_PERFORMERS_TIMEFRAMES", "").split(",")
+    if timeframe.strip() in SUPPORTED_TIMEFRAMES
+]
+
+# The stock table on the screener pages
+STOCK_TABLE_SELECTOR = "table.table"
 
 # Gemini API key
 GEMINI_API_KEY = os.getenv("GEMINI_API_KEY")
@@ -58,8 +65,14 @@ genai.configure(api_key=GEMINI_API_KEY)
 class TopPerformersScraper:
     """Class to scrape market data from Trendlyne and generate insights with Gemini"""
 
-    def __init__(self):
+    def __init__(
+        self, count: Optional[int] = None, timeframes: Optional[List[str]] = None
+    ):
         """Initialize the scraper"""
+        self.count = count or TOP_PERFORMERS_COUNT
+        self.timeframes = (
+            TOP_PERFORMERS_TIMEFRAMES if timeframes is None else timeframes
+        )
         self.gemini_llm = None
         if GEMINI_API_KEY:
             try:
@@ -93,25 +106,6 @@ class TopPerformersScraper:
                 "Gemini API key not found. Insights generation will be skipped."
             )
 
-    def get_chrome_driver(self):
-        """Set up and return a Chrome driver with appropriate options"""
-        chrome_options = Options()
-        chrome_options.add_argument("--headless")
-        chrome_options.add_argument("--no-sandbox")
-        chrome_options.add_argument("--disable-dev-shm-usage")
-        chrome_options.add_argument("--disable-gpu")
-        chrome_options.add_argument("--window-size=1920,1080")
-        chrome_options.add_argument("--disable-notifications")
-        chrome_options.add_argument("--disable-extensions")
-        chrome_options.add_argument("--disable-infobars")
-        chrome_options.add_argument("--enable-unsafe-swiftshader")
-        chrome_options.add_argument(
-            "--user-agent=Mozilla/5.0 (Windows NT 10.0; Win64; x64) AppleWebKit/537.36 (KHTML, like Gecko) Chrome/108.0.0.0 Safari/537.36"
-        )
-
-        service = Service(ChromeDriverManager().install())
-        return webdriver.Chrome(service=service, options=chrome_options)
-
     def _parse_price_change(self, text):
         """Parse price change text that contains value and percentage"""
         try:
@@ -142,156 +136,119 @@ class TopPerformersScraper:
             logger.debug(f"Error parsing percentage '{text}': {str(e)}")
             return 0.0
 
-    def scrape_trendlyne_data(self, url):
-        """Scrape stock data from a Trendlyne URL"""
-        driver = self.get_chrome_driver()
+    def _standardize_row(self, row_data, headers):
+        """Convert one table row ({header: cell text}) to our standardized stock dict"""
+        # Get company name from first column
+        company_name = row_data.get("Name", row_data.get(headers[0], ""))
+
+        # Find current price (LTP or Last Price)
+        price_key = next(
+            (
+                h
+                for h in row_data.keys()
+                if any(term in h for term in ["LTP", "Price", "Last"])
+            ),
+            None,
+        )
+        if not price_key and headers:
+            price_key = headers[1]  # Fallback to second column
 
-        try:
-            # Load the URL
-            logger.info(f"Loading URL: {url}")
-            driver.get(url)
+        price_text = row_data.get(price_key, "0")
+        current_price = float(price_text.replace("INR", "").replace(",", "").strip())
 
-            # Wait for JavaScript to load content
-            time.sleep(8)  # Increased wait time
+        # Find change column
+        change_key = next(
+            (h for h in row_data.keys() if "Change(%)" in h or "Change %" in h),
+            None,
+        )
+        if not change_key:
+            change_key = next((h for h in row_data.keys() if "Change" in h), None)
 
-            # Get the page source
-            page_source = driver.page_source
+        if change_key:
+            change_text = row_data.get(change_key, "0 (0%)")
+            price_change = self._parse_price_change(change_text)
+            percentage_change = self._parse_percentage_change(change_text)
+        else:
+            # Fallback values if we can't find change columns
+            price_change = 0.0
+            percentage_change = 0.0
 
-            # Parse with BeautifulSoup
-            soup = BeautifulSoup(page_source, "html.parser")
+        logger.debug(
+            f"Processed stock: {company_name}, price: {current_price}, change: {price_change}, %: {percentage_change}"
+        )
+        # Add to standardized format - use original complete company name
+        return {
+            "company_name": company_name,
+            "current_price": current_price,
+            "price_change": price_change,
+            "percentage_change": percentage_change,
+        }
+
+    def _standardize_rows(self, rows, headers):
+        """Standardize up to `count` rows, skipping rows that do not parse"""
+        stocks = []
+        for row_data in rows:
+            if len(stocks) >= self.count:
+                break
+            try:
+                stocks.append(self._standardize_row(row_data, headers))
+            except Exception as e:
+                logger.error(f"Error parsing row data: {str(e)}")
+                logger.error(f"Problematic row: {row_data}")
+        return stocks
+
+    def _table_records(self, table):
+        """Rows of the stock table as {header: cell text} dicts"""
+        headers = table.headers
+        records = []
+        for i, cells in enumerate(table.rows):
+            row_data = {
+                headers[j]: cell for j, cell in enumerate(cells) if j < len(headers)
+            }
 
-            # Find the table with stock data
-            table = soup.find("table", class_="table")
+            # Full company name from the first cell's link or span title, if any
+            company_name = table.titles[i] if table.titles else None
+            if company_name:
+                # Try to get the company name key from headers - usually first column
+                company_key = headers[0] if headers else "Name"
+                row_data[company_key] = company_name
 
-            if not table:
-                logger.error("Could not find table with stock data")
-                return []
+            # Debug: log raw row data
+            logger.debug(f"Raw row data: {row_data}")
+            records.append(row_data)
+        return records
 
-            # Extract headers
-            headers = []
-            header_row = table.find("thead").find("tr")
-            for th in header_row.find_all("th"):
-                headers.append(th.text.strip())
+    def scrape_trendlyne_data(self, url):
+        """Scrape stock data from a Trendlyne URL"""
+        site = "trendlyne_top_performers"
+        selectors = [STOCK_TABLE_SELECTOR]
+        try:
+            # Plain HTTP first; in the browser, take the table from the JSON
+            # response the page is built from before reading its rows
+            logger.info(f"Loading URL: {url}")
+            result = tiered_fetcher.fetch_tables(
+                url, site, selectors, with_titles=True, url_filter="trendlyne.com"
+            )
 
-            # Extract data rows (limited to top 10)
             stocks = []
-            tbody = table.find("tbody")
-            if tbody:
-                count = 0
-                for tr in tbody.find_all("tr"):
-                    if count >= 10:  # Limit to top 10
-                        break
-
-                    row_data = {}
-
-                    # First get all the data using standard method
-                    for i, td in enumerate(tr.find_all("td")):
-                        if i < len(headers):
-                            header_name = headers[i]
-                            row_data[header_name] = td.text.strip()
-
-                    # Now, specifically for company name, try to get full version if available
-                    first_col = tr.find("td")
-                    if first_col:
-                        # First, try to get from data attributes which often have the full name
-                        company_name = None
-
-                        # Try link with full title
-                        link = first_col.find("a")
-                        if link:
-                            if link.has_attr("data-title"):
-                                company_name = link["data-title"].strip()
-                            elif link.has_attr("data-original-title"):
-                                company_name = link["data-original-title"].strip()
-                            elif link.has_attr("title"):
-                                company_name = link["title"].strip()
-
-                        # If still no name, try getting from the span
-                        if not company_name:
-                            span = first_col.find("span")
-                            if span and span.has_attr("title"):
-                                company_name = span["title"].strip()
-
-                        # If no luck with attributes, get the direct text
-                        if not company_name:
-                            company_name = first_col.get_text(strip=True)
-
-                        # Save the full company name to the row data
-                        if company_name:
-                            # Try to get the company name key from headers - usually first column
-                            company_key = headers[0] if headers else "Name"
-                            row_data[company_key] = company_name
-
-                    # Debug: log raw row data
-                    logger.debug(f"Raw row data: {row_data}")
-
-                    # Convert data to our standardized format
-                    try:
-                        # Get company name from first column
-                        company_name = row_data.get(
-                            "Name", row_data.get(headers[0], "")
-                        )
-
-                        # Find current price (LTP or Last Price)
-                        price_key = next(
-                            (
-                                h
-                                for h in row_data.keys()
-                                if any(term in h for term in ["LTP", "Price", "Last"])
-                            ),
-                            None,
-                        )
-                        if not price_key and headers:
-                            price_key = headers[1]  # Fallback to second column
-
-                        price_text = row_data.get(price_key, "0")
-                        current_price = float(
-                            price_text.replace("INR", "").replace(",", "").strip()
-                        )
-
-                        # Find change column
-                        change_key = next(
-                            (
-                                h
-                                for h in row_data.keys()
-                                if "Change(%)" in h or "Change %" in h
-                            ),
-                            None,
-                        )
-                        if not change_key:
-                            change_key = next(
-                                (h for h in row_data.keys() if "Change" in h), None
-                            )
-
-                        if change_key:
-                            change_text = row_data.get(change_key, "0 (0%)")
-                            price_change = self._parse_price_change(change_text)
-                            percentage_change = self._parse_percentage_change(
-                                change_text
-                            )
-                        else:
-                            # Fallback values if we can't find change columns
-                            price_change = 0.0
-                            percentage_change = 0.0
-
-                        # Add to standardized format - use original complete company name
-                        stocks.append(
-                            {
-                                "company_name": company_name,
-                                "current_price": current_price,
-                                "price_change": price_change,
-                                "percentage_change": percentage_change,
-                            }
-                        )
-                        count += 1
-                        logger.debug(
-                            f"Processed stock: {company_name}, price: {current_price}, change: {price_change}, %: {percentage_change}"
-                        )
-
-                    except Exception as e:
-                        logger.error(f"Error parsing row data: {str(e)}")
-                        logger.error(f"Problematic row: {row_data}")
-                        continue
+            if result.table is not None:
+                stocks = self._standardize_rows(
+                    result.table.records(), result.table.headers
+                )
+                if not stocks:
+                    logger.warning("Captured JSON table did not decode, reading the page")
+                    result.tables = tiered_fetcher.fetch_browser_tables(
+                        url, site, selectors, with_titles=True
+                    )
+
+            if not stocks:
+                table = result.tables.get(STOCK_TABLE_SELECTOR)
+                if not table:
+                    logger.error("Could not find table with stock data")
+                    return []
+
+                # Extract data rows (limited to the top `count`)
+                stocks = self._standardize_rows(self._table_records(table), table.headers)
 
             logger.info(f"Successfully scraped {len(stocks)} stocks from {url}")
             return stocks
@@ -300,31 +257,58 @@ class TopPerformersScraper:
             logger.error(f"Error in scrape_trendlyne_data: {str(e)}")
             return []
 
-        finally:
-            driver.quit()
-
-    def scrape_top_gainers_losers(self) -> Dict[str, List[Dict[str, Any]]]:
-        """Scrape top gainers and losers from Trendlyne"""
+    def scrape_top_gainers_losers(self) -> Dict[str, Any]:
+        """
+        Scrape top gainers and losers from Trendlyne. Today's lists and those
+        of every extra timeframe are fetched concurrently, so extra timeframes
+        add little wall time; they are returned under "timeframes".
+        """
         logger.info("Starting to scrape top gainers and losers from Trendlyne")
 
-        # Get top gainers
-        top_gainers = self.scrape_trendlyne_data(TRENDLYNE_GAINERS_URL)
-
-        # Get top losers
-        top_losers = self.scrape_trendlyne_data(TRENDLYNE_LOSERS_URL)
+        pages = [
+            (timeframe, kind)
+            for timeframe in ["today"] + list(self.timeframes)
+            for kind in ("gainers", "losers")
+        ]
+        # The browser pool bounds how many pages actually load at once
+        with ThreadPoolExecutor(
+            max_workers=len(pages), thread_name_prefix="top-performers"
+        ) as executor:
+            futures = {
+                page: executor.submit(
+                    self.scrape_trendlyne_data,
+                    TRENDLYNE_MOVERS_URL.format(kind=page[1], timeframe=page[0]),
+                )
+                for page in pages
+            }
+        lists = {page: future.result() for page, future in futures.items()}
 
         # Make sure losers have negative changes
-        for loser in top_losers:
-            if loser["price_change"] > 0:
-                loser["price_change"] = -loser["price_change"]
-            if loser["percentage_change"] > 0:
-                loser["percentage_change"] = -loser["percentage_change"]
+        for (timeframe, kind), stocks in lists.items():
+            if kind != "losers":
+                continue
+            for loser in stocks:
+                if loser["price_change"] > 0:
+                    loser["price_change"] = -loser["price_change"]
+                if loser["percentage_change"] > 0:
+                    loser["percentage_change"] = -loser["percentage_change"]
 
         # Return combined results
+        top_gainers = lists[("today", "gainers")]
+        top_losers = lists[("today", "losers")]
         result = {"gainers": top_gainers, "losers": top_losers}
+        if self.timeframes:
+            result["timeframes"] = {
+                timeframe: {
+                    "gainers": lists[(timeframe, "gainers")],
+                    "losers": lists[(timeframe, "losers")],
+                }
+                for timeframe in self.timeframes
+            }
 
         logger.info(
             f"Completed scraping: {len(top_gainers)} gainers, {len(top_losers)} losers"
+            + (f", timeframes {', '.join(self.timeframes)}" if self.timeframes else "")
         )
         return result
 
@@ -391,14 +375,15 @@ class TopPerformersScraper:
                 else "No data available"
             )
 
-            # Create chain
-            chain = LLMChain(llm=self.gemini_llm, prompt=prompt_template)
-
-            # Run chain
             current_date = datetime.now().strftime("%Y-%m-%d")
-            raw_insights = chain.run(
-                {"gainers": gainers_text, "losers": losers_text, "date": current_date}
-            )
+            inputs = {
+                "gainers": gainers_text,
+                "losers": losers_text,
+                "date": current_date,
+            }
+            # Create and run chain (its own model settings, so never batched)
+            chain = LLMChain(llm=self.gemini_llm, prompt=prompt_template)
+            raw_insights = chain.run(inputs)
 
             # Process the insights to ensure proper bullet point format
             lines = raw_insights.split("\n")
@@ -448,6 +433,8 @@ class TopPerformersScraper:
                 "top_gainers": market_movers["gainers"],
                 "top_losers": market_movers["losers"],
             }
+            if "timeframes" in market_movers:
+                market_data["timeframes"] = market_movers["timeframes"]
 
             # Generate insights if Gemini is configured
             insights_message = "No insights generated"
@@ -1,7 +1,12 @@
 import sys
 import os
+import asyncio
 
-from data.news_highlights import NewsHighlightsGenerator
+from data.market_sections import section_refresher
+from data.browser_pool import browser_pool
+from data.driver_registry import driver_registry
+from data.executors import shutdown_executors
+from data.loop_monitor import loop_monitor
 
 sys.path.append(os.path.dirname(os.path.abspath(__file__)))
 
@@ -50,25 +55,70 @@ app.include_router(pdf_router)
 
 
 @app.on_event("startup")
-async def initialize_news_cache():
-    """Pre-warm the NewsHighlightsGenerator cache on application startup."""
+async def start_background_refresh():
+    """
+    Keep every market section warm in the snapshot cache so requests are
+    answered from the last good value instead of scraping in the request path.
+    Set BACKGROUND_REFRESH_ENABLED=false to disable.
+    """
+    if os.getenv("BACKGROUND_REFRESH_ENABLED", "true").lower() in ("0", "false", "no"):
+        logger.info("Background refresh disabled, sections load on first request")
+        return
     try:
-        logger.info("Pre-warming news cache during application startup")
-        news_generator = NewsHighlightsGenerator()
-
-        # Force cache initialization - this call will populate the cache
-        news_data = news_generator.get_news_highlights()
-
-        # Log success with data counts to verify it worked
-        logger.info(
-            f"Successfully pre-warmed news cache with "
-            f"{len(news_data.get('india_news', []))} India news and "
-            f"{len(news_data.get('global_news', []))} global news items"
-        )
+        logger.info("Starting background refresh of market sections")
+        section_refresher.start()
     except Exception as e:
-        logger.error(f"Failed to pre-warm news cache during startup: {str(e)}")
+        logger.error(f"Failed to start background refresh: {str(e)}")
         # Don't raise the exception - we want the app to start even if this fails
-        # The first user request will still try to initialize the cache
+        # The first user request will still load the sections on demand
+
+
+@app.on_event("startup")
+async def resolve_chromedriver():
+    """
+    Resolve the chromedriver binary once at startup, so launching the pooled
+    browsers never waits for webdriver-manager.
+    """
+    try:
+        await asyncio.to_thread(driver_registry.resolve)
+    except Exception as e:
+        logger.error(f"Failed to resolve chromedriver: {str(e)}")
+        # Scrapers retry the resolution when they first need a browser
+
+
+@app.on_event("startup")
+async def start_loop_monitor():
+    """
+    Log and count event loop stalls, i.e. blocking code running in an async
+    handler. Set LOOP_MONITOR_ENABLED=false to disable.
+    """
+    if os.getenv("LOOP_MONITOR_ENABLED", "true").lower() in ("0", "false", "no"):
+        return
+    loop_monitor.start()
+
+
+@app.on_event("shutdown")
+async def stop_loop_monitor():
+    """Stop sampling event loop lag."""
+    await loop_monitor.stop()
+
+
+@app.on_event("shutdown")
+async def stop_background_refresh():
+    """Stop the background refresh loops on application shutdown."""
+    await section_refresher.stop()
+
+
+@app.on_event("shutdown")
+async def stop_browser_pool():
+    """Quit the pooled Chrome browsers so no processes outlive the application."""
+    await asyncio.to_thread(browser_pool.shutdown)
+
+
+@app.on_event("shutdown")
+async def stop_executors():
+    """Stop the named worker executors, dropping jobs that have not started."""
+    shutdown_executors()
 
 
 if __name__ == "__main__":
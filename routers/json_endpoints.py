@@ -4,32 +4,32 @@ from datetime import datetime
 import logging
 from typing import Dict, Any, List
 from sse_starlette.sse import EventSourceResponse
-import asyncio
 import json
 
 
 # Local imports
-from data.news_highlights import NewsHighlightsGenerator
-from data.macro import (
-    fetch_all_financial_indicators,
-    FinancialDashboard,
-    fetch_all_financial_indicators_async,
+from data.macro import FinancialDashboard
+from data.snapshot_cache import snapshot_cache
+from data.browser_pool import browser_pool
+from data.driver_registry import driver_registry
+from data.page_readiness import readiness_stats
+from data.tiered_fetcher import tiered_fetcher
+from data.resource_blocking import blocking_stats
+from data.scrape_engine import scrape_engine
+from data.fii_scraper import institutional_source_stats
+from data.article_fetcher import article_fetcher
+from data.article_cache import article_cache
+from data.executors import executor_stats
+from data.loop_monitor import loop_monitor
+from data.insight_batch import insight_batcher
+from data.section_graph import run_graph
+from data.market_sections import (
+    comprehensive_graph,
+    get_section,
+    snapshot_age,
+    format_indices,
+    serialize_indicators,
 )
-from data.technical_snapshot import (
-    get_market_technical_snapshot,
-    get_market_technical_snapshot_async,
-)
-from data.market_overview import (
-    fetch_market_data,
-    generate_concise_insights,
-    generate_report,
-    index_names,
-    fetch_market_data_async,
-)
-from data.top_performers import TopPerformersScraper
-from data.market_analysis import MarketAnalysisGenerator
-from data.sector_scraper import SectorDataScraper, generate_sector_insights
-from data.fii_scraper import FIIDataScraper, generate_institutional_insights
 
 # Set up logging with proper formatting
 logging.basicConfig(
@@ -86,7 +86,8 @@ async def get_market_overview():
     log_api_call("market-overview")
     try:
         logger.debug("Generating market report...")
-        report = generate_report()
+        snapshot = await get_section("market_overview")
+        report = {**snapshot.value, "snapshot_age_seconds": snapshot_age(snapshot)}
         log_api_success(
             "market-overview",
             f"Generated report with {len(report.get('market_data', {}))} market items",
@@ -110,21 +111,19 @@ async def get_market_overview():
 async def get_sector_performance():
     log_api_call("sector-performance")
     try:
-        logger.debug("Creating SectorDataScraper instance")
-        scraper = SectorDataScraper()
-        logger.debug("Scraping sector data")
-        sector_data = await scraper.scrape_sector_data_async()
+        logger.debug("Fetching sector snapshot")
+        snapshot = await get_section("sector")
+        sector_data = snapshot.value["data"]
         logger.debug(
-            f"Successfully scraped sector data with {len(sector_data)} sectors"
+            f"Successfully retrieved sector data with {len(sector_data)} sectors"
         )
-        logger.debug("Generating sector insights")
-        sector_insights = generate_sector_insights(sector_data)
         output_data = {
             "sector_movement": {
                 "data": sector_data,
-                "insight": sector_insights,
+                "insight": snapshot.value["insights"],
             },
-            "timestamp": datetime.now().isoformat(),
+            "timestamp": snapshot.created_at_iso,
+            "snapshot_age_seconds": snapshot_age(snapshot),
         }
         log_api_success(
             "sector-performance", f"Generated data for {len(sector_data)} sectors"
@@ -147,18 +146,15 @@ async def get_sector_performance():
 async def get_fii_activity():
     log_api_call("fii-activity")
     try:
-        logger.debug("Creating FIIDataScraper instance")
-        scraper = FIIDataScraper()
-        logger.debug("Scraping FII/DII data")
-        institutional_data = await scraper.scrape_institutional_data_async()
-        logger.debug("Generating institutional insights")
-        institutional_insights = generate_institutional_insights(institutional_data)
+        logger.debug("Fetching FII/DII snapshot")
+        snapshot = await get_section("fii")
         output_data = {
             "institutional_activity": {
-                "data": institutional_data,
-                "insight": institutional_insights,
+                "data": snapshot.value["data"],
+                "insight": snapshot.value["insights"],
             },
-            "timestamp": datetime.now().isoformat(),
+            "timestamp": snapshot.created_at_iso,
+            "snapshot_age_seconds": snapshot_age(snapshot),
         }
         log_api_success("fii-activity", "Generated FII/DII data")
         return JSONResponse(content=output_data)
@@ -176,14 +172,12 @@ async def get_fii_activity():
 async def get_news_highlights():
     log_api_call("news-highlights")
     try:
-        logger.debug("Initializing NewsHighlightsGenerator")
-        generator = NewsHighlightsGenerator()
-        logger.debug("Fetching news highlights")
-        news_highlights = await generator.get_news_highlights()
-        # Rename market_impact to news_impact in the response
-        if "market_impact" in news_highlights:
-            logger.debug("Renaming market_impact to news_impact in response")
-            news_highlights["news_impact"] = news_highlights.pop("market_impact")
+        logger.debug("Fetching news highlights snapshot")
+        snapshot = await get_section("news")
+        news_highlights = {
+            **snapshot.value,
+            "snapshot_age_seconds": snapshot_age(snapshot),
+        }
         log_api_success(
             "news-highlights",
             f"Retrieved {len(news_highlights.get('india_news', []))} India news and "
@@ -212,13 +206,17 @@ async def get_all_indicators():
     log_api_call("indicators")
     try:
         logger.debug("Fetching all financial indicators")
-        indicators = await fetch_all_financial_indicators()
+        snapshot = await get_section("indicators")
+        indicators = snapshot.value
         log_api_success(
             "indicators", f"Retrieved {len(indicators)} financial indicators"
         )
         return FinancialDashboard(
-            last_updated=datetime.now().strftime("%Y-%m-%d %H:%M:%S"),
+            last_updated=datetime.fromtimestamp(snapshot.created_at).strftime(
+                "%Y-%m-%d %H:%M:%S"
+            ),
             indicators=indicators,
+            snapshot_age_seconds=snapshot_age(snapshot),
         )
     except Exception as e:
         logger.error(f"Error fetching financial indicators: {str(e)}", exc_info=True)
@@ -238,7 +236,8 @@ async def technical_snapshot():
     log_api_call("technical-snapshot")
     try:
         logger.debug("Generating technical snapshot")
-        data = await get_market_technical_snapshot()
+        snapshot = await get_section("technical")
+        data = {**snapshot.value, "snapshot_age_seconds": snapshot_age(snapshot)}
         log_api_success(
             "technical-snapshot",
             f"Generated snapshot with {len(data.get('snapshot', {}))} market indices",
@@ -261,17 +260,20 @@ async def technical_snapshot():
 async def get_market_report():
     log_api_call("top-performers")
     try:
-        logger.debug("Initializing TopPerformersScraper")
-        scraper = TopPerformersScraper()
-        logger.info("Scraping market data for top performers...")
-        market_data = await scraper.run_full_scrape()
+        logger.info("Fetching top performers snapshot...")
+        snapshot = await get_section("top_performers")
+        market_data = snapshot.value
         output_data = {
             "top_performers": {
                 "top_gainers": market_data.get("top_gainers", []),
                 "top_losers": market_data.get("top_losers", []),
                 "insight": market_data.get("insights", "No insights available"),
-            }
+            },
+            "snapshot_age_seconds": snapshot_age(snapshot),
         }
+        if "timeframes" in market_data:
+            # Week/month lists, when TOP_PERFORMERS_TIMEFRAMES is set
+            output_data["top_performers"]["timeframes"] = market_data["timeframes"]
         log_api_success(
             "top-performers",
             f"Retrieved {len(market_data.get('top_gainers', []))} gainers and "
@@ -283,27 +285,113 @@ async def get_market_report():
         return {"status": "error", "message": str(e)}
 
 
+# --------------------
+# Snapshot Cache Statistics Endpoint
+# --------------------
+@router.get("/snapshot-stats")
+async def get_snapshot_stats():
+    """
+    Get cache, scraper, executor and event loop statistics for monitoring.
+
+    "sections" holds the snapshot cache counters of every section (hits,
+    stale serves, loads coalesced onto one in flight). Every other key holds
+    one component's stats(): browser pool, chromedriver,
+    page readiness, fetch tiers, scraped pages, FII/DII sources, resource
+    blocking, article fetcher and cache, worker executors, event loop monitor
+    and insight batcher.
+    """
+    log_api_call("snapshot-stats")
+    sections = snapshot_cache.stats()
+    return {
+        "timestamp": datetime.now().isoformat(),
+        "sections": sections,
+        "total_coalesced": sum(s["coalesced"] for s in sections.values()),
+        "browser_pool": browser_pool.stats(),
+        "chromedriver": driver_registry.stats(),
+        "page_readiness": readiness_stats(),
+        "fetch_tiers": tiered_fetcher.stats(),
+        "scraped_pages": scrape_engine.stats(),
+        "institutional_sources": institutional_source_stats(),
+        "resource_blocking": blocking_stats(),
+        "article_fetch": article_fetcher.stats(),
+        "article_cache": article_cache.stats(),
+        "executors": executor_stats(),
+        "event_loop": loop_monitor.stats(),
+        "insight_batch": insight_batcher.stats(),
+    }
+
+
 # --------------------
 # Comprehensive Market Data Endpoint
 # --------------------
+def _market_overview_events(report):
+    return [
+        (
+            "market_overview",
+            {
+                "indices": format_indices(report["market_data"]),
+                "insights": report["insights"],
+            },
+        )
+    ]
+
+
+def _analysis_events(analysis):
+    return [
+        (key, analysis[key])
+        for key in ("market_analysis", "market_summary", "market_predictions")
+    ]
+
+
+# Event name and payload builder of every section in the stream; each builder
+# returns the (event, payload) pairs made from the section's snapshot value
+STREAM_EVENTS = {
+    "market_overview": ("market_overview", _market_overview_events),
+    "sector": (
+        "sector_movement",
+        lambda v: [("sector_movement", {"data": v["data"], "insights": v["insights"]})],
+    ),
+    "fii": (
+        "institutional_activity",
+        lambda v: [
+            ("institutional_activity", {"data": v["data"], "insights": v["insights"]})
+        ],
+    ),
+    "top_performers": (
+        "top_performers",
+        lambda v: [
+            (
+                "top_performers",
+                {
+                    "top_gainers": v.get("top_gainers", []),
+                    "top_losers": v.get("top_losers", []),
+                    "insights": v.get("insights", ""),
+                },
+            )
+        ],
+    ),
+    "technical": ("technical_snapshot", lambda v: [("technical_snapshot", v)]),
+    "indicators": (
+        "financial_indicators",
+        lambda v: [("financial_indicators", serialize_indicators(v))],
+    ),
+    "news": ("news_highlights", lambda v: [("news_highlights", v)]),
+    "analysis": ("market_analysis", _analysis_events),
+}
+
+
 @router.get("/comprehensive-market-data")
 async def get_combined_market_data_stream(request: Request):
     """
     Server-side events endpoint that streams market data as it becomes available.
-    Each section is sent to the client immediately after it's processed.
+    Independent sections are collected concurrently and each one is sent as
+    soon as it completes, with its stage timing; the market analysis follows
+    once its input sections are in.
     """
     log_api_call("comprehensive-market-data-stream")
 
     async def event_generator():
-        market_overview = {}
-        sector_movement = {}
-        institutional_activity = {}
-        top_performers = {}
-        technical_data = {}
-        financial_indicators = {}
-        news_data = {}
-        market_analysis = {}
-
+        timings = {}
         try:
             # Initial message to let client know we've started
             yield {
@@ -313,288 +401,57 @@ async def get_combined_market_data_stream(request: Request):
                 ),
             }
 
-            # 1. Market Overview Data
-            try:
-                logger.debug("Fetching market overview data")
-                market_overview_data = await fetch_market_data_async()
-                logger.debug(
-                    f"Received market overview data for {len([k for k in market_overview_data if k != '_meta'])} indices"
-                )
-                # Format indices
-                indices = [
-                    {
-                        "name": index_names.get(symbol, symbol),
-                        "ltp": str(data["Close"]),
-                        "day_change_percent": f"{data['Change%']}%",
-                        "day_change": str(data["Change"]),
-                        "num_companies": "N/A",
+            async for result in run_graph(comprehensive_graph()):
+                error_section, build_events = STREAM_EVENTS[result.name]
+                timings[result.name] = result.timing
+                try:
+                    if not result.ok:
+                        raise RuntimeError(result.error)
+                    snapshot = result.value
+                    age = snapshot_age(snapshot)
+                    for event_name, payload in build_events(snapshot.value):
+                        yield {
+                            "event": event_name,
+                            "data": json.dumps(
+                                {
+                                    event_name: payload,
+                                    "snapshot_age_seconds": age,
+                                    "timing": result.timing,
+                                }
+                            ),
+                        }
+                except Exception as e:
+                    logger.error(
+                        f"Error collecting {error_section}: {str(e)}", exc_info=result.ok
+                    )
+                    yield {
+                        "event": "error",
+                        "data": json.dumps(
+                            {
+                                "section": error_section,
+                                "error": str(e),
+                                "timing": result.timing,
+                            }
+                        ),
                     }
-                    for symbol, data in market_overview_data.items()
-                    if symbol != "_meta" and isinstance(data, dict) and "Close" in data
-                ]
-
-                market_overview = {
-                    "indices": indices,
-                    "insights": generate_concise_insights(market_overview_data),
-                }
-
-                yield {
-                    "event": "market_overview",
-                    "data": json.dumps({"market_overview": market_overview}),
-                }
-            except Exception as e:
-                logger.error(
-                    f"Error collecting market overview data: {str(e)}", exc_info=True
-                )
-                yield {
-                    "event": "error",
-                    "data": json.dumps({"section": "market_overview", "error": str(e)}),
-                }
-
-            # 2. Sector Data
-            try:
-                logger.debug("Scraping sector data")
-                sector_scraper = SectorDataScraper()
-                sector_data = await sector_scraper.scrape_sector_data_async()
-                logger.debug(f"Received sector data for {len(sector_data)} sectors")
-
-                sector_movement = {
-                    "data": sector_data,
-                    "insights": generate_sector_insights(sector_data),
-                }
-
-                yield {
-                    "event": "sector_movement",
-                    "data": json.dumps({"sector_movement": sector_movement}),
-                }
-            except Exception as e:
-                logger.error(f"Error collecting sector data: {str(e)}", exc_info=True)
-                yield {
-                    "event": "error",
-                    "data": json.dumps({"section": "sector_movement", "error": str(e)}),
-                }
-
-            # 3. Institutional Data
-            try:
-                logger.debug("Scraping institutional data")
-                fii_scraper = FIIDataScraper()
-                institutional_data = await fii_scraper.scrape_institutional_data_async()
-
-                institutional_activity = {
-                    "data": institutional_data,
-                    "insights": generate_institutional_insights(institutional_data),
-                }
-
-                yield {
-                    "event": "institutional_activity",
-                    "data": json.dumps(
-                        {"institutional_activity": institutional_activity}
-                    ),
-                }
-            except Exception as e:
-                logger.error(
-                    f"Error collecting institutional data: {str(e)}", exc_info=True
-                )
-                yield {
-                    "event": "error",
-                    "data": json.dumps(
-                        {"section": "institutional_activity", "error": str(e)}
-                    ),
-                }
-
-            # 4. Top Performers Data
-            try:
-                logger.debug("Fetching top performers data")
-                top_performers_scraper = TopPerformersScraper()
-                top_performers_data = await asyncio.to_thread(top_performers_scraper.run_full_scrape)
-                logger.debug(
-                    f"Received data for {len(top_performers_data.get('top_gainers', []))} gainers and "
-                    f"{len(top_performers_data.get('top_losers', []))} losers"
-                )
-
-                top_performers = {
-                    "top_gainers": top_performers_data.get("top_gainers", []),
-                    "top_losers": top_performers_data.get("top_losers", []),
-                    "insights": top_performers_data.get("insights", ""),
-                }
-
-                yield {
-                    "event": "top_performers",
-                    "data": json.dumps({"top_performers": top_performers}),
-                }
-            except Exception as e:
-                logger.error(
-                    f"Error collecting top performers data: {str(e)}", exc_info=True
-                )
-                yield {
-                    "event": "error",
-                    "data": json.dumps({"section": "top_performers", "error": str(e)}),
-                }
-
-            # 5. Technical Snapshot
-            try:
-                logger.debug("Generating technical snapshot")
-                technical_data = await get_market_technical_snapshot_async()
-
-                yield {
-                    "event": "technical_snapshot",
-                    "data": json.dumps({"technical_snapshot": technical_data}),
-                }
-            except Exception as e:
-                logger.error(
-                    f"Error generating technical snapshot: {str(e)}", exc_info=True
-                )
-                yield {
-                    "event": "error",
-                    "data": json.dumps(
-                        {"section": "technical_snapshot", "error": str(e)}
-                    ),
-                }
-
-            # 6. Financial Indicators
-            try:
-                logger.debug("Fetching financial indicators")
-                financial_indicators = await fetch_all_financial_indicators_async()
-                logger.debug(
-                    f"Received {len(financial_indicators)} financial indicators"
-                )
-
-                # Convert IndicatorData objects to dictionaries for JSON serialization
-                financial_indicators_dict = {k: v.dict() for k, v in financial_indicators.items()}
-
-                yield {
-                    "event": "financial_indicators",
-                    "data": json.dumps({"financial_indicators": financial_indicators_dict}),
-                }
-            except Exception as e:
-                logger.error(
-                    f"Error collecting financial indicators: {str(e)}", exc_info=True
-                )
-                yield {
-                    "event": "error",
-                    "data": json.dumps(
-                        {"section": "financial_indicators", "error": str(e)}
-                    ),
-                }
-
-            # 7. News Highlights
-            try:
-                logger.debug("Generating news highlights")
-                news_generator = NewsHighlightsGenerator()
-                news_data = await news_generator.get_news_highlights_async()
-
-                if not news_data:
-                    logger.warning("No news data available")
-                    news_data = {
-                        "india_news": [],
-                        "global_news": [],
-                        "impact_news": "No news data available",
-                    }
-
-                yield {
-                    "event": "news_highlights",
-                    "data": json.dumps({"news_highlights": news_data}),
-                }
-            except Exception as e:
-                logger.error(
-                    f"Error generating news highlights: {str(e)}", exc_info=True
-                )
-                yield {
-                    "event": "error",
-                    "data": json.dumps({"section": "news_highlights", "error": str(e)}),
-                }
-
-            # Collect all the data for analysis
-            initial_data = {
-                "market_overview": (
-                    market_overview if "market_overview" in locals() else {}
-                ),
-                "sector_movement": (
-                    sector_movement if "sector_movement" in locals() else {}
-                ),
-                "institutional_activity": (
-                    institutional_activity
-                    if "institutional_activity" in locals()
-                    else {}
-                ),
-                "top_performers": (
-                    top_performers if "top_performers" in locals() else {}
-                ),
-                "technical_snapshot": (
-                    technical_data if "technical_data" in locals() else {}
-                ),
-                "financial_indicators": (
-                    financial_indicators if "financial_indicators" in locals() else {}
-                ),
-                "news_highlights": news_data if "news_data" in locals() else {},
-            }
 
-            # 8. Market Analysis - needs most of the data to be meaningful
-            try:
-                logger.debug("Generating market analysis based on collected data")
-                market_analyzer = MarketAnalysisGenerator()
-                market_analysis = await asyncio.to_thread(market_analyzer.generate_market_analysis, initial_data)
-
-                yield {
-                    "event": "market_analysis",
-                    "data": json.dumps({"market_analysis": market_analysis}),
-                }
-            except Exception as e:
-                logger.error(
-                    f"Error generating market analysis: {str(e)}", exc_info=True
-                )
-                yield {
-                    "event": "error",
-                    "data": json.dumps({"section": "market_analysis", "error": str(e)}),
-                }
-
-            # 9. Market Summary
-            try:
-                logger.debug("Generating market summary")
-                market_summary = await asyncio.to_thread(market_analyzer.generate_market_summary, initial_data, market_analysis)
-
-                yield {
-                    "event": "market_summary",
-                    "data": json.dumps({"market_summary": market_summary}),
-                }
-            except Exception as e:
-                logger.error(
-                    f"Error generating market summary: {str(e)}", exc_info=True
-                )
-                yield {
-                    "event": "error",
-                    "data": json.dumps({"section": "market_summary", "error": str(e)}),
-                }
-
-            # 10. Market Predictions
-            try:
-                logger.debug("Generating market prediction")
-                market_prediction = await asyncio.to_thread(market_analyzer.generate_market_prediction, initial_data, market_analysis)
-
-                yield {
-                    "event": "market_predictions",
-                    "data": json.dumps({"market_predictions": market_prediction}),
-                }
-            except Exception as e:
-                logger.error(
-                    f"Error generating market prediction: {str(e)}", exc_info=True
-                )
-                yield {
-                    "event": "error",
-                    "data": json.dumps(
-                        {"section": "market_predictions", "error": str(e)}
-                    ),
-                }
+                # Check if client disconnected
+                if await request.is_disconnected():
+                    logger.debug("Client disconnected from SSE stream")
+                    return
 
             # Final complete message
             yield {
                 "event": "complete",
-                "data": json.dumps({"message": "Market data collection complete"}),
+                "data": json.dumps(
+                    {"message": "Market data collection complete", "timings": timings}
+                ),
             }
 
             log_api_success(
                 "comprehensive-market-data-stream",
-                "Successfully streamed comprehensive market report",
+                "Successfully streamed comprehensive market report in "
+                f"{max((t['finished_at'] for t in timings.values()), default=0):.1f}s",
             )
 
         except Exception as e:
@@ -604,9 +461,4 @@ async def get_combined_market_data_stream(request: Request):
                 "data": json.dumps({"section": "global", "error": str(e)}),
             }
 
-        # Check if client disconnected
-        if await request.is_disconnected():
-            logger.debug("Client disconnected from SSE stream")
-            return
-
     return EventSourceResponse(event_generator())
@@ -11,23 +11,14 @@ from pydantic import Json
 from pdf_generator.financial_indicator import generate_financial_indicators_pdf
 from pdf_generator.technical_snapshot import generate_technical_snapshot_pdf
 from pdf_generator.top_performers import generate_top_performers_pdf
-from data.sector_fii_scraper import (
-    MarketDataScraper,
-    generate_sector_insights,
-    generate_institutional_insights,
+from data.executors import run_in
+from data.market_sections import (
+    ANALYSIS_INPUT_SECTIONS,
+    build_combined_data,
+    collect_comprehensive,
+    get_section,
+    snapshot_age,
 )
-from data.news_highlights import NewsHighlightsGenerator
-from data.top_performers import TopPerformersScraper
-from data.market_overview import (
-    fetch_market_data,
-    generate_concise_insights,
-    index_names,
-)
-from data.technical_snapshot import get_market_technical_snapshot
-from data.macro import fetch_all_financial_indicators
-from data.market_analysis import MarketAnalysisGenerator
-
-from data.market_overview import generate_report
 from pdf_generator.market_overview import MarketOverviewPDFGenerator
 from pdf_generator.sector_fii import generate_sector_fii_pdf
 from pdf_generator.news_highlights import generate_pdf_from_news_highlights
@@ -59,19 +50,10 @@ router = APIRouter(
 
 
 # Helper Functions
-def convert_indicators_to_dict(indicators):
-    """
-    Convert IndicatorData objects to dictionaries for JSON serialization
-    """
-    logger.debug("Converting indicators to dictionary format")
-    if isinstance(indicators, dict):
-        return {
-            k: (convert_indicators_to_dict(v) if hasattr(v, "__dict__") else v)
-            for k, v in indicators.items()
-        }
-    elif hasattr(indicators, "__dict__"):
-        return indicators.__dict__
-    return indicators
+def snapshot_headers(*snapshots):
+    """Response headers reporting the age of the oldest snapshot used in a PDF"""
+    oldest = max(snapshot_age(snapshot) for snapshot in snapshots)
+    return {"X-Snapshot-Age": str(oldest)}
 
 
 def create_temp_pdf_path(prefix="report"):
@@ -126,9 +108,10 @@ def log_pdf_generation_error(endpoint_name, error):
 async def get_market_overview_pdf(background_tasks: BackgroundTasks):
     log_pdf_generation_start("market-overview")
     try:
-        # Generate market report
+        # Get market report
         logger.debug("Fetching market report data")
-        market_report = generate_report()
+        snapshot = await get_section("market_overview")
+        market_report = snapshot.value
 
         # Create temp directory for PDF
         temp_dir, pdf_filename, pdf_path = create_temp_pdf_path("market_overview")
@@ -136,7 +119,7 @@ async def get_market_overview_pdf(background_tasks: BackgroundTasks):
         # Generate PDF
         logger.debug("Generating PDF with MarketOverviewPDFGenerator")
         pdf_generator = MarketOverviewPDFGenerator(market_report)
-        pdf_generator.generate(pdf_path)
+        await run_in("pdf", pdf_generator.generate, pdf_path)
 
         # Verify PDF generation
         if not os.path.exists(pdf_path):
@@ -150,7 +133,10 @@ async def get_market_overview_pdf(background_tasks: BackgroundTasks):
 
         log_pdf_generation_success("market-overview", pdf_path)
         return FileResponse(
-            path=pdf_path, filename=pdf_filename, media_type="application/pdf"
+            path=pdf_path,
+            filename=pdf_filename,
+            media_type="application/pdf",
+            headers=snapshot_headers(snapshot),
         )
 
     except Exception as e:
@@ -167,38 +153,29 @@ async def download_sector_fii_data_pdf(background_tasks: BackgroundTasks):
         # Create temp directory and PDF path
         temp_dir, pdf_filename, pdf_path = create_temp_pdf_path("sector_fii_report")
 
-        # Scrape data
-        logger.debug("Creating MarketDataScraper instance")
-        scraper = MarketDataScraper()
-
-        logger.debug("Scraping sector data")
-        sector_data = scraper.scrape_sector_data()
-        logger.debug(f"Successfully scraped {len(sector_data)} sectors")
-
-        logger.debug("Scraping institutional data")
-        institutional_data = scraper.scrape_institutional_data()
-
-        logger.debug("Generating sector insights")
-        sector_insights = generate_sector_insights(sector_data)
+        # Get data
+        logger.debug("Fetching sector data")
+        sector_snapshot = await get_section("sector")
+        logger.debug(f"Retrieved {len(sector_snapshot.value['data'])} sectors")
 
-        logger.debug("Generating institutional insights")
-        institutional_insights = generate_institutional_insights(institutional_data)
+        logger.debug("Fetching institutional data")
+        fii_snapshot = await get_section("fii")
 
         output_data = {
             "sector_movement": {
-                "data": sector_data,
-                "insight": sector_insights,
+                "data": sector_snapshot.value["data"],
+                "insight": sector_snapshot.value["insights"],
             },
             "institutional_activity": {
-                "data": institutional_data,
-                "insight": institutional_insights,
+                "data": fii_snapshot.value["data"],
+                "insight": fii_snapshot.value["insights"],
             },
             "timestamp": datetime.now().isoformat(),
         }
 
         # Generate the PDF
         logger.debug(f"Generating sector-fii PDF at {pdf_path}")
-        generate_sector_fii_pdf(output_data, pdf_path)
+        await run_in("pdf", generate_sector_fii_pdf, output_data, pdf_path)
 
         if not os.path.exists(pdf_path):
             logger.error("PDF file not found after generation attempt")
@@ -212,6 +189,7 @@ async def download_sector_fii_data_pdf(background_tasks: BackgroundTasks):
             path=pdf_path,
             filename=pdf_filename,
             media_type="application/pdf",
+            headers=snapshot_headers(sector_snapshot, fii_snapshot),
         )
 
     except Exception as e:
@@ -229,24 +207,17 @@ async def generate_news_highlights_pdf(background_tasks: BackgroundTasks):
         )
 
         # Fetch news highlights data
-        logger.debug("Initializing NewsHighlightsGenerator")
-        generator = NewsHighlightsGenerator()
-
         logger.debug("Fetching news highlights")
-        news_highlights = generator.get_news_highlights()
+        snapshot = await get_section("news")
+        news_highlights = snapshot.value
         logger.debug(
             f"Retrieved {len(news_highlights.get('india_news', []))} India news and "
             f"{len(news_highlights.get('global_news', []))} global news items"
         )
 
-        # Rename market_impact to news_impact in the response
-        if "market_impact" in news_highlights:
-            logger.debug("Renaming market_impact to news_impact")
-            news_highlights["news_impact"] = news_highlights.pop("market_impact")
-
         # Generate the PDF
         logger.debug(f"Generating news highlights PDF at {pdf_path}")
-        generate_pdf_from_news_highlights(news_highlights, pdf_path)
+        await run_in("pdf", generate_pdf_from_news_highlights, news_highlights, pdf_path)
 
         if not os.path.exists(pdf_path):
             logger.error("PDF file not found after generation attempt")
@@ -260,6 +231,7 @@ async def generate_news_highlights_pdf(background_tasks: BackgroundTasks):
             path=pdf_path,
             filename=pdf_filename,
             media_type="application/pdf",
+            headers=snapshot_headers(snapshot),
         )
 
     except Exception as e:
@@ -276,17 +248,20 @@ async def download_indicators_pdf(background_tasks: BackgroundTasks):
 
         # Get data
         logger.debug("Fetching financial indicators")
-        indicators = fetch_all_financial_indicators()
+        snapshot = await get_section("indicators")
+        indicators = snapshot.value
         logger.debug(f"Retrieved {len(indicators)} financial indicators")
 
         data = {
-            "last_updated": datetime.now().strftime("%Y-%m-%d %H:%M:%S"),
+            "last_updated": datetime.fromtimestamp(snapshot.created_at).strftime(
+                "%Y-%m-%d %H:%M:%S"
+            ),
             "indicators": indicators,
         }
 
         # Generate PDF
         logger.debug(f"Generating financial indicators PDF at {pdf_path}")
-        generate_financial_indicators_pdf(data, pdf_path)
+        await run_in("pdf", generate_financial_indicators_pdf, data, pdf_path)
 
         if not os.path.exists(pdf_path):
             logger.error("PDF file not found after generation attempt")
@@ -297,7 +272,10 @@ async def download_indicators_pdf(background_tasks: BackgroundTasks):
 
         log_pdf_generation_success("financial-indicators", pdf_path)
         return FileResponse(
-            path=pdf_path, filename=pdf_filename, media_type="application/pdf"
+            path=pdf_path,
+            filename=pdf_filename,
+            media_type="application/pdf",
+            headers=snapshot_headers(snapshot),
         )
 
     except Exception as e:
@@ -314,11 +292,12 @@ async def generate_technical_snapshot_pdf_endpoint(background_tasks: BackgroundT
 
         # Get data
         logger.debug("Fetching technical snapshot data")
-        data = get_market_technical_snapshot()
+        snapshot = await get_section("technical")
+        data = snapshot.value
 
         # Generate PDF
         logger.debug(f"Generating technical snapshot PDF at {pdf_path}")
-        generate_technical_snapshot_pdf(data, pdf_path)
+        await run_in("pdf", generate_technical_snapshot_pdf, data, pdf_path)
 
         if not os.path.exists(pdf_path):
             logger.error("PDF file not found after generation attempt")
@@ -329,7 +308,10 @@ async def generate_technical_snapshot_pdf_endpoint(background_tasks: BackgroundT
 
         log_pdf_generation_success("technical-snapshot", pdf_path)
         return FileResponse(
-            path=pdf_path, filename=pdf_filename, media_type="application/pdf"
+            path=pdf_path,
+            filename=pdf_filename,
+            media_type="application/pdf",
+            headers=snapshot_headers(snapshot),
         )
 
     except Exception as e:
@@ -348,11 +330,9 @@ async def get_top_performers_pdf(background_tasks: BackgroundTasks):
         temp_dir, pdf_filename, pdf_path = create_temp_pdf_path("top_performers")
 
         # Get data
-        logger.debug("Initializing TopPerformersScraper")
-        scraper = TopPerformersScraper()
-
-        logger.debug("Scraping top performers data")
-        performers_data = scraper.run_full_scrape()
+        logger.debug("Fetching top performers data")
+        snapshot = await get_section("top_performers")
+        performers_data = snapshot.value
         logger.debug(
             f"Retrieved {len(performers_data.get('top_gainers', []))} gainers and "
             f"{len(performers_data.get('top_losers', []))} losers"
@@ -362,7 +342,7 @@ async def get_top_performers_pdf(background_tasks: BackgroundTasks):
 
         # Generate PDF
         logger.debug(f"Generating top performers PDF at {pdf_path}")
-        generate_top_performers_pdf(data, pdf_path)
+        await run_in("pdf", generate_top_performers_pdf, data, pdf_path)
 
         if not os.path.exists(pdf_path):
             logger.error("PDF file not found after generation attempt")
@@ -373,7 +353,10 @@ async def get_top_performers_pdf(background_tasks: BackgroundTasks):
 
         log_pdf_generation_success("top-performers", pdf_path)
         return FileResponse(
-            path=pdf_path, filename=pdf_filename, media_type="application/pdf"
+            path=pdf_path,
+            filename=pdf_filename,
+            media_type="application/pdf",
+            headers=snapshot_headers(snapshot),
         )
 
     except Exception as e:
@@ -395,117 +378,51 @@ async def get_comprehensive_market_pdf(background_tasks: BackgroundTasks):
 
         logger.info("Starting data collection for comprehensive market PDF")
 
-        # Initialize data collectors
-        logger.debug("Initializing data collector objects")
-        market_data_scraper = MarketDataScraper()
-        news_generator = NewsHighlightsGenerator()
-        top_performers_scraper = TopPerformersScraper()
-        market_analyzer = MarketAnalysisGenerator()
-
-        # Fetch all required data with detailed logging
-        logger.debug("Fetching market overview data")
-        market_overview_data = fetch_market_data()
-        logger.debug(
-            f"Retrieved market data for {len([k for k in market_overview_data if k != '_meta'])} indices"
+        # Collect every section concurrently; the analysis starts as soon as
+        # the sections it is built from are in
+        results = await collect_comprehensive()
+        analysis_result = results.pop("analysis")
+        if not analysis_result.ok:
+            raise RuntimeError(f"Market analysis unavailable: {analysis_result.error}")
+        analysis_snapshot = analysis_result.value
+
+        snapshots = {}
+        for section in ANALYSIS_INPUT_SECTIONS:
+            result = results[section]
+            if result.ok:
+                snapshots[section] = result.value
+            else:
+                logger.warning(
+                    f"Comprehensive PDF without section '{section}': {result.error}"
+                )
+        logger.info(
+            "Collected comprehensive PDF sections in "
+            f"{analysis_result.timing['finished_at']:.1f}s (slowest input "
+            f"{max(r.timing['seconds'] for r in results.values()):.1f}s)"
         )
 
-        logger.debug("Scraping sector data")
-        sector_data = market_data_scraper.scrape_sector_data()
-        logger.debug(f"Retrieved data for {len(sector_data)} sectors")
-
-        logger.debug("Scraping institutional data")
-        institutional_data = market_data_scraper.scrape_institutional_data()
-
-        logger.debug("Fetching top performers data")
-        top_performers_data = top_performers_scraper.run_full_scrape()
-        logger.debug(
-            f"Retrieved {len(top_performers_data.get('top_gainers', []))} gainers and "
-            f"{len(top_performers_data.get('top_losers', []))} losers"
-        )
-
-        logger.debug("Generating news highlights")
-        news_data = news_generator.get_news_highlights()
-
-        logger.debug("Generating technical snapshot")
-        technical_data = get_market_technical_snapshot()
-
-        logger.debug("Fetching financial indicators")
-        financial_indicators = fetch_all_financial_indicators()
-
-        # Convert indicators to a JSON-serializable format
-        logger.debug("Converting financial indicators to serializable format")
-        serializable_indicators = convert_indicators_to_dict(financial_indicators)
-
-        # Log indicator count for debugging
-        logger.debug(f"Processed {len(serializable_indicators)} financial indicators")
-
-        # Format indices data
-        logger.debug("Formatting indices data")
-        indices = [
-            {
-                "name": index_names.get(symbol, symbol),
-                "ltp": str(data["Close"]),
-                "day_change_percent": f"{data['Change%']}%",
-                "day_change": str(data["Change"]),
-                "num_companies": "N/A",
-            }
-            for symbol, data in market_overview_data.items()
-            if symbol != "_meta" and isinstance(data, dict) and "Close" in data
-        ]
-        logger.debug(f"Formatted {len(indices)} indices")
-
-        # Prepare combined data
+        # Prepare combined data, missing sections are left empty
         logger.debug("Building combined market data structure")
-        combined_data = {
-            "market_overview": {
-                "indices": indices,
-                "insights": generate_concise_insights(market_overview_data),
-            },
-            "sector_movement": {
-                "data": sector_data,
-                "insights": generate_sector_insights(sector_data),
-            },
-            "top_performers": {
-                "top_gainers": top_performers_data.get("top_gainers", []),
-                "top_losers": top_performers_data.get("top_losers", []),
-                "insights": top_performers_data.get("insights", ""),
-            },
-            "news_highlights": news_data,
-            "technical_snapshot": technical_data,
-            "institutional_activity": {
-                "data": institutional_data,
-                "insights": generate_institutional_insights(institutional_data),
-            },
-            "financial_indicators": serializable_indicators,
-        }
-
-        # Generate analysis, summary and predictions
-        logger.debug("Generating market analysis")
-        market_analysis = market_analyzer.generate_market_analysis(combined_data)
-
-        logger.debug("Generating market summary")
-        market_summary = market_analyzer.generate_market_summary(
-            combined_data, market_analysis
+        combined_data = build_combined_data(
+            {section: snapshot.value for section, snapshot in snapshots.items()}
         )
-
-        logger.debug("Generating market predictions")
-        market_predictions = market_analyzer.generate_market_prediction(
-            combined_data, market_analysis
+        logger.debug(
+            f"Formatted {len(combined_data['market_overview'].get('indices', []))} indices"
         )
 
         # Add analysis, summary and predictions
         logger.debug("Combining all data into final structure")
         ordered_data = {
-            "market_analysis": market_analysis,
+            "market_analysis": analysis_snapshot.value["market_analysis"],
             **combined_data,
-            "market_summary": market_summary,
-            "market_predictions": market_predictions,
+            "market_summary": analysis_snapshot.value["market_summary"],
+            "market_predictions": analysis_snapshot.value["market_predictions"],
         }
 
         # Generate PDF
         logger.debug(f"Generating comprehensive market PDF at {pdf_path}")
         pdf_generator = ComprehensiveMarketPDFGenerator(ordered_data)
-        pdf_generator.generate(pdf_path)
+        await run_in("pdf", pdf_generator.generate, pdf_path)
 
         if not os.path.exists(pdf_path):
             logger.error("PDF file not found after generation attempt")
@@ -522,6 +439,7 @@ async def get_comprehensive_market_pdf(background_tasks: BackgroundTasks):
             path=pdf_path,
             filename=pdf_filename,
             media_type="application/pdf",
+            headers=snapshot_headers(*snapshots.values(), analysis_snapshot),
         )
 
     except Exception as e:
@@ -0,0 +1,57 @@
+import threading
+
+import numpy as np
+import pandas as pd
+
+import data.history_store as history_store_module
+from data.history_store import COLUMNS, HistoryStore
+
+
+def _bars(days: int) -> pd.DataFrame:
+    """Daily bars up to today with a tz-naive index, as yf.download returns them"""
+    index = pd.bdate_range(end=pd.Timestamp.today().normalize(), periods=days)
+    values = np.arange(days, dtype=float)
+    return pd.DataFrame({column: values + i for i, column in enumerate(COLUMNS)}, index=index)
+
+
+def test_long_fetch_after_short_fetch_merges(tmp_path, monkeypatch):
+    # The overview asks for 5d of ^NSEI before the technical snapshot asks for 6mo
+    downloads = {"5d": _bars(5), "6mo": _bars(130)}
+    monkeypatch.setattr(
+        history_store_module,
+        "download_histories",
+        lambda symbols, period=None, **kwargs: {symbol: downloads[period] for symbol in symbols},
+    )
+    store = HistoryStore(root=str(tmp_path))
+
+    short = store.get_history("^NSEI", "5d")
+    long = store.get_history("^NSEI", "6mo")
+
+    assert len(short) == 5
+    assert len(long) >= 120
+    assert long.index.is_unique and long.index.is_monotonic_increasing
+    assert long["Close"].iloc[-1] == downloads["6mo"]["Close"].iloc[-1]
+
+
+def test_concurrent_fetches_keep_the_longest_history(tmp_path, monkeypatch):
+    downloads = {"5d": _bars(5), "6mo": _bars(130)}
+    barrier = threading.Barrier(2)
+
+    def download(symbols, period=None, **kwargs):
+        barrier.wait()
+        return {symbol: downloads[period] for symbol in symbols}
+
+    monkeypatch.setattr(history_store_module, "download_histories", download)
+    store = HistoryStore(root=str(tmp_path))
+
+    threads = [
+        threading.Thread(target=store.get_history, args=("^NSEI", period))
+        for period in ("5d", "6mo")
+    ]
+    for thread in threads:
+        thread.start()
+    for thread in threads:
+        thread.join()
+
+    assert len(store.read("^NSEI")) == 130
+    assert not list(tmp_path.rglob("*.tmp*"))